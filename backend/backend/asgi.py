@@ -15,17 +15,37 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 
 django_app = get_asgi_application()
 
+import asyncio
+from contextlib import asynccontextmanager
 from importlib.util import find_spec
 from typing import Union
 
 from fastapi import FastAPI
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from django.conf import settings
 
+from chat.jobs import scheduler
+from chat.startup import warm_up
+from tools.app_model import StaleVersionError
 from .fastapi_router import setup_routers
 
-app = FastAPI(swagger_ui_parameters={"displayRequestDuration": True}, root_path="/api")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serves right away, `/ready` keeps the worker out of rotation until caches are warm
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    warm_up_task.cancel()
+    await scheduler.stop()
+
+
+app = FastAPI(
+    swagger_ui_parameters={"displayRequestDuration": True},
+    root_path="/api",
+    lifespan=lifespan,
+)
 app.mount("/admin", django_app)
 
 origins = ["*"]
@@ -40,3 +60,9 @@ app.add_middleware(
 
 
 setup_routers(app)
+
+
+@app.exception_handler(StaleVersionError)
+async def stale_version_handler(request, exc: StaleVersionError):
+    # Lost an optimistic concurrency race, nothing was written so the client can retry
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
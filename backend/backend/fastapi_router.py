@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from chat.views import router as chat_router
+from tools.views import router as tools_router
 
 
 def setup_routers(app: FastAPI):
     """Routes"""
     app.include_router(chat_router, prefix="/chat")
+    app.include_router(tools_router)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -82,6 +83,14 @@ DATABASES = {
         "PASSWORD": "mypassword",
         "HOST": "db",
         "PORT": "5432",
+        # Connections are checked out of a psycopg pool instead of opened per thread
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            },
+        },
     }
 }
 
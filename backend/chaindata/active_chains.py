@@ -1,10 +1,19 @@
-from typing import List
+from typing import Dict, List, Tuple
 import asyncio
+import os
+import time
 
 from chaindata.constants import ACTIVE_CHAINS, IntChainId
 from chaindata.evm.utils import get_w3
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+# Cached active chains are served as is for this long, then refreshed in the background
+ACTIVE_CHAINS_CACHE_TTL_SECONDS = float(os.getenv("ACTIVE_CHAINS_CACHE_TTL", 60))
+
+# wallet address -> (active chains, fetched at)
+_ACTIVE_CHAINS_BY_WALLET: Dict[str, Tuple[List[str], float]] = {}
+_REFRESH_TASKS: Dict[str, asyncio.Task] = {}
+
 
 async def get_active_chains(wallet_address: str) -> List[str]:
     """Returns the list of active chains for a given wallet address."""
@@ -12,11 +21,34 @@ async def get_active_chains(wallet_address: str) -> List[str]:
     tasks = [get_native_balance(chain_id, wallet_address) for chain_id in ACTIVE_CHAINS]
     balances = await asyncio.gather(*tasks)
 
-    return [
+    active_chains = [
         IntChainId.get_str(chain_id)
         for chain_id, balance in zip(ACTIVE_CHAINS, balances)
         if balance > 0
     ]
+    _ACTIVE_CHAINS_BY_WALLET[wallet_address] = (active_chains, time.monotonic())
+    return active_chains
+
+
+async def get_cached_active_chains(wallet_address: str) -> List[str]:
+    """
+    Last known active chains of the wallet. Stale entries are returned immediately and
+    refreshed in the background, only the first lookup of a wallet waits on RPC.
+    """
+    cached = _ACTIVE_CHAINS_BY_WALLET.get(wallet_address)
+    if cached is None:
+        return await get_active_chains(wallet_address)
+
+    active_chains, fetched_at = cached
+    if (
+        time.monotonic() - fetched_at > ACTIVE_CHAINS_CACHE_TTL_SECONDS
+        and wallet_address not in _REFRESH_TASKS
+    ):
+        task = asyncio.create_task(get_active_chains(wallet_address))
+        _REFRESH_TASKS[wallet_address] = task
+        task.add_done_callback(lambda _: _REFRESH_TASKS.pop(wallet_address, None))
+
+    return active_chains
 
 
 @retry(
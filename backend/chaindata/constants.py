@@ -10,6 +10,7 @@ ODOS_ROUTER_SPENDER_ADDRESS = (
 SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS = "0x0000000000000000000000000000000000000000"
 SILO_ROUTER_V2_ADDRESS = "0x22AacdEc57b13911dE9f188CF69633cC537BdB76"
 WRAPPED_SONIC_ADDRESS = "0x039e2fB66102314Ce7b64Ce5Ce3E5183bc94aD38"
+PERMIT2_ADDRESS = "0x000000000022D473030F116dDEE9F6B43aC78BA3"  # Uniswap Permit2
 ONE_TRILLION = 1_000_000_000_000
 
 
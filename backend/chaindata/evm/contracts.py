@@ -0,0 +1,35 @@
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Tuple, Type
+
+from chaindata.evm.constants import ABI
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+    from web3.contract import AsyncContract
+
+# (w3, abi json) -> contract class with the parsed abi, bound to the provider of `w3`
+_CONTRACT_FACTORIES: Dict[Tuple["AsyncWeb3", str], Type["AsyncContract"]] = {}
+
+
+@lru_cache(maxsize=None)
+def parse_abi(abi: str) -> List[dict]:
+    return json.loads(abi)
+
+
+def get_contract_factory(w3: "AsyncWeb3", abi: str) -> Type["AsyncContract"]:
+    key = (w3, abi)
+    if key not in _CONTRACT_FACTORIES:
+        _CONTRACT_FACTORIES[key] = w3.eth.contract(abi=parse_abi(abi))
+    return _CONTRACT_FACTORIES[key]
+
+
+def get_contract(w3: "AsyncWeb3", address: str, abi: str) -> "AsyncContract":
+    """Same as `w3.eth.contract(address=..., abi=...)` without parsing the abi on every call"""
+    return get_contract_factory(w3, abi)(address)
+
+
+def preload_contract_factories(w3: "AsyncWeb3") -> None:
+    for name, abi in vars(ABI).items():
+        if not name.startswith("_"):
+            get_contract_factory(w3, abi)
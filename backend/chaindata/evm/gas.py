@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from tools.metrics import incr
+
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
+logger = logging.getLogger(__name__)
+
+GAS_LIMIT_BUFFER_PERCENT = int(os.getenv("GAS_LIMIT_BUFFER_PERCENT", 20))
+
+# (contract address, 4 byte selector) -> highest gas estimate seen
+_GAS_PROFILES: Dict[Tuple[str, str], int] = {}
+# endpoint -> (block number, fee data future) so all transactions built in a block share one lookup
+_FEE_DATA_BY_ENDPOINT: Dict[str, Tuple[Optional[int], asyncio.Future]] = {}
+
+
+async def build_transaction(
+    contract_function,
+    transaction: Dict,
+    fallback_gas: Optional[int] = None,
+    after_pending_step: bool = False,
+) -> Dict:
+    """
+    Builds a contract transaction with the gas limit and fee data resolved concurrently,
+    instead of web3's implicit estimate -> priority fee -> base fee round trips in sequence.
+    `after_pending_step` marks transactions that depend on an earlier step of the flow
+    which may not be mined yet, only their reverting estimates fall back.
+    """
+    w3 = contract_function.w3
+    # Contract of just this function, encoding doesn't need the rest of the abi
+    data = w3.eth.contract(abi=[contract_function.abi]).encode_abi(
+        contract_function.abi_element_identifier,
+        args=contract_function.args,
+        kwargs=contract_function.kwargs,
+    )
+    estimate_params = {**transaction, "to": contract_function.address, "data": data}
+
+    gas, fee_data = await asyncio.gather(
+        estimate_gas_limit(w3, estimate_params, fallback_gas, after_pending_step),
+        get_fee_data(w3),
+    )
+
+    return await contract_function.build_transaction(
+        {**transaction, "gas": gas, **fee_data}
+    )
+
+
+async def estimate_gas_limit(
+    w3: "AsyncWeb3",
+    transaction: Dict,
+    fallback_gas: Optional[int] = None,
+    after_pending_step: bool = False,
+) -> int:
+    """
+    Buffered gas estimate. Falls back to the cached profile of the contract method when
+    the estimate can't be made, a revert is only expected after a pending step.
+    """
+    from web3.exceptions import ContractLogicError
+
+    profile_key = (transaction["to"].lower(), transaction["data"][:10])
+
+    try:
+        estimate = await w3.eth.estimate_gas(transaction)
+    except Exception as e:
+        # Estimation reverts when the transaction depends on a step that isn't mined yet,
+        # eg. a deposit built right after its approval was signed. Any other revert means
+        # the transaction would fail on chain too.
+        if isinstance(e, ContractLogicError) and not after_pending_step:
+            incr("gas.reverted")
+            raise
+
+        estimate = _GAS_PROFILES.get(profile_key)
+        if estimate is None:
+            if fallback_gas is None:
+                raise
+            incr("gas.fallback")
+            logger.warning(f"Gas estimation failed, using fallback gas limit: {e}")
+            return fallback_gas
+
+        incr("gas.profile")
+    else:
+        _GAS_PROFILES[profile_key] = max(estimate, _GAS_PROFILES.get(profile_key, 0))
+        incr("gas.estimate")
+
+    return estimate * (100 + GAS_LIMIT_BUFFER_PERCENT) // 100
+
+
+async def get_fee_data(w3: "AsyncWeb3") -> Dict[str, int]:
+    endpoint_uri = w3.provider.endpoint_uri
+    block_number = await w3.provider.get_block_number()
+
+    cached = _FEE_DATA_BY_ENDPOINT.get(endpoint_uri)
+    if cached is not None and block_number is not None and cached[0] == block_number:
+        incr("gas.fee_data_reused")
+        return await asyncio.shield(cached[1])
+
+    future = asyncio.ensure_future(_fetch_fee_data(w3))
+    _FEE_DATA_BY_ENDPOINT[endpoint_uri] = (block_number, future)
+    try:
+        return await future
+    except Exception:
+        _FEE_DATA_BY_ENDPOINT.pop(endpoint_uri, None)
+        raise
+
+
+async def _fetch_fee_data(w3: "AsyncWeb3") -> Dict[str, int]:
+    block, max_priority_fee = await asyncio.gather(
+        w3.eth.get_block("latest"), w3.eth.max_priority_fee
+    )
+    return {
+        "maxPriorityFeePerGas": max_priority_fee,
+        # Same headroom web3 uses by default, survives a few full blocks of base fee growth
+        "maxFeePerGas": max_priority_fee + 2 * block["baseFeePerGas"],
+    }
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from chaindata.constants import IntChainId
+from chaindata.evm.utils import get_rpc_url
+from tools.http import req_post
+from tools.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+RECEIPT_POLL_INTERVAL_SECONDS = float(os.getenv("RECEIPT_POLL_INTERVAL", 1.0))
+# Hashes that don't land within this window are reported with a `None` receipt
+RECEIPT_WATCH_TIMEOUT_SECONDS = float(os.getenv("RECEIPT_WATCH_TIMEOUT", 600))
+# Receipts requested per json rpc batch, providers cap the batch size
+RECEIPT_BATCH_SIZE = int(os.getenv("RECEIPT_BATCH_SIZE", 50))
+
+ReceiptListener = Callable[[IntChainId, str, Optional[dict]], Awaitable[None]]
+
+
+class ReceiptWatcher:
+    """
+    Tracks pending transaction hashes of every conversation in the process with a single
+    polling loop. Each tick fetches all outstanding receipts of a chain in one json rpc batch.
+
+    Listeners run for every resolved hash before its future resolves, so anyone awaiting
+    `watch()` sees the state the listeners persisted. They run in a task per hash, a
+    listener waiting on a busy conversation doesn't hold up polling or the other hashes.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = RECEIPT_POLL_INTERVAL_SECONDS,
+        watch_timeout: float = RECEIPT_WATCH_TIMEOUT_SECONDS,
+    ):
+        self.poll_interval = poll_interval
+        self.watch_timeout = watch_timeout
+        self._pending: Dict[Tuple[IntChainId, str], Tuple[asyncio.Future, float]] = {}
+        self._listeners: List[ReceiptListener] = []
+        self._task: Optional[asyncio.Task] = None
+        # Hashes whose listeners are running, and the tasks running them
+        self._resolving: Dict[Tuple[IntChainId, str], asyncio.Future] = {}
+        self._listener_tasks: Set[asyncio.Task] = set()
+
+    def add_listener(self, listener: ReceiptListener) -> None:
+        self._listeners.append(listener)
+
+    def watch(self, chain_id: IntChainId, tx_hash: str) -> asyncio.Future:
+        """Future resolving to the receipt, or `None` if the hash never landed"""
+        key = (chain_id, tx_hash.lower())
+        if key in self._resolving:
+            return self._resolving[key]
+        if key not in self._pending:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = (future, time.monotonic())
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        return self._pending[key][0]
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll()
+            except Exception:
+                logger.exception("Failed to poll transaction receipts")
+
+    async def _poll(self) -> None:
+        hashes_by_chain = defaultdict(list)
+        for chain_id, tx_hash in list(self._pending):
+            hashes_by_chain[chain_id].append(tx_hash)
+
+        await asyncio.gather(
+            *[
+                self._poll_chain(chain_id, tx_hashes)
+                for chain_id, tx_hashes in hashes_by_chain.items()
+            ]
+        )
+
+    async def _poll_chain(self, chain_id: IntChainId, tx_hashes: List[str]) -> None:
+        receipt_by_hash = {}
+        for start in range(0, len(tx_hashes), RECEIPT_BATCH_SIZE):
+            batch = tx_hashes[start : start + RECEIPT_BATCH_SIZE]
+            try:
+                receipt_by_hash.update(await self._fetch_receipts(chain_id, batch))
+            except Exception:
+                incr("receipt_watcher.poll_failures")
+                logger.exception(
+                    f"Failed to poll transaction receipts on {chain_id.name}"
+                )
+
+        # Expires hashes even while the rpc fails, their flows shouldn't stay stuck
+        now = time.monotonic()
+        for tx_hash in tx_hashes:
+            receipt = receipt_by_hash.get(tx_hash)
+            _, watched_at = self._pending[(chain_id, tx_hash)]
+            if receipt is not None:
+                self._start_resolving(chain_id, tx_hash, receipt)
+            elif now - watched_at > self.watch_timeout:
+                incr("receipt_watcher.timeouts")
+                self._start_resolving(chain_id, tx_hash, None)
+
+    async def _fetch_receipts(
+        self, chain_id: IntChainId, tx_hashes: List[str]
+    ) -> Dict[str, Optional[dict]]:
+        responses = await req_post(
+            get_rpc_url(chain_id),
+            [get_transaction_receipt_req(tx_hash) for tx_hash in tx_hashes],
+        )
+        incr("receipt_watcher.polls")
+        if not isinstance(responses, list):
+            # eg. a single error object for the whole batch
+            raise ValueError(f"Unexpected receipts response {responses!r}")
+        return {
+            resp["id"]: resp.get("result")
+            for resp in responses
+            if isinstance(resp, dict) and "id" in resp
+        }
+
+    def _start_resolving(
+        self, chain_id: IntChainId, tx_hash: str, receipt: Optional[dict]
+    ) -> None:
+        key = (chain_id, tx_hash)
+        future, _ = self._pending.pop(key)
+        self._resolving[key] = future
+        # Referenced until done, the loop only keeps weak references to tasks
+        task = asyncio.create_task(self._resolve(key, receipt))
+        self._listener_tasks.add(task)
+        task.add_done_callback(self._listener_tasks.discard)
+
+    async def _resolve(
+        self, key: Tuple[IntChainId, str], receipt: Optional[dict]
+    ) -> None:
+        chain_id, tx_hash = key
+        try:
+            for listener in self._listeners:
+                try:
+                    await listener(chain_id, tx_hash, receipt)
+                except Exception:
+                    logger.exception(f"Receipt listener failed for {tx_hash}")
+        finally:
+            future = self._resolving.pop(key)
+            if not future.done():
+                future.set_result(receipt)
+
+
+def get_transaction_receipt_req(tx_hash: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "method": "eth_getTransactionReceipt",
+        "params": [tx_hash],
+        "id": tx_hash,
+    }
+
+
+def is_receipt_successful(receipt: Optional[dict]) -> bool:
+    return receipt is not None and int(receipt["status"], 16) == 1
+
+
+receipt_watcher = ReceiptWatcher()
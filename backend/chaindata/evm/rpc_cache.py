@@ -0,0 +1,184 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from eth_utils import function_signature_to_4byte_selector
+from web3 import AsyncHTTPProvider
+
+from chaindata.constants import BaseIntEnum
+from tools.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+RPC_CACHE_MAX_ENTRIES = int(os.getenv("RPC_CACHE_MAX_ENTRIES", 4096))
+# How long we trust our view of the chain head before asking for it again.
+# Sonic produces sub-second blocks so this bounds staleness of per-block entries.
+BLOCK_NUMBER_TTL_SECONDS = float(os.getenv("RPC_CACHE_BLOCK_NUMBER_TTL", 1.0))
+
+LATEST_BLOCK_IDS = {"latest", "safe", "finalized"}
+
+
+class CachePolicy(BaseIntEnum):
+    NO_CACHE = 0
+    PER_BLOCK = 1
+    IMMUTABLE = 2
+
+
+def _selector(signature: str) -> str:
+    return "0x" + function_signature_to_4byte_selector(signature).hex()
+
+
+# Policies for `eth_call` keyed by the 4 byte function selector of the call data
+ETH_CALL_POLICIES = {
+    _selector("asset()"): CachePolicy.IMMUTABLE,
+    _selector("getSilos()"): CachePolicy.IMMUTABLE,
+    _selector("decimals()"): CachePolicy.IMMUTABLE,
+    _selector("allowance(address,address)"): CachePolicy.PER_BLOCK,
+    _selector("balanceOf(address)"): CachePolicy.PER_BLOCK,
+    _selector("maxRedeem(address)"): CachePolicy.PER_BLOCK,
+}
+
+METHOD_POLICIES = {
+    "eth_chainId": CachePolicy.IMMUTABLE,
+    "eth_getBalance": CachePolicy.PER_BLOCK,
+}
+
+
+def get_cache_policy(method: str, params: Any) -> CachePolicy:
+    if method == "eth_call":
+        call = params[0] if params else {}
+        data = call.get("data") or call.get("input") or ""
+        if isinstance(data, bytes):
+            data = "0x" + data.hex()
+        policy = ETH_CALL_POLICIES.get(data[:10].lower(), CachePolicy.NO_CACHE)
+    else:
+        policy = METHOD_POLICIES.get(method, CachePolicy.NO_CACHE)
+
+    if policy == CachePolicy.PER_BLOCK:
+        block_id = params[-1] if len(params) > 1 else "latest"
+        if block_id == "pending":
+            return CachePolicy.NO_CACHE
+        if block_id not in LATEST_BLOCK_IDS:
+            # Reads pinned to a historical block never change
+            return CachePolicy.IMMUTABLE
+
+    return policy
+
+
+class RPCResponseCache:
+    """
+    LRU cache of json rpc responses shared by all providers in the process.
+
+    Per-block entries are keyed by the current head block number, so they naturally
+    stop being hit once the chain moves on and get evicted by newer entries.
+    Concurrent identical reads share a single upstream request.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RPC_CACHE_MAX_ENTRIES,
+        block_number_ttl: float = BLOCK_NUMBER_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.block_number_ttl = block_number_ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._in_flight: dict = {}
+        self._block_numbers: dict[str, Tuple[int, float]] = {}
+
+    async def get_or_fetch(
+        self,
+        endpoint_uri: str,
+        method: str,
+        params: Any,
+        fetch: Callable[[str, Any], Awaitable[dict]],
+    ) -> dict:
+        policy = get_cache_policy(method, params)
+        if policy == CachePolicy.NO_CACHE:
+            return await fetch(method, params)
+
+        block_number = None
+        if policy == CachePolicy.PER_BLOCK:
+            block_number = await self.get_block_number(endpoint_uri, fetch)
+            if block_number is None:
+                # Without the head block the entry could never go stale, don't cache it
+                incr("rpc_cache.no_block_number")
+                return await fetch(method, params)
+
+        key = (
+            endpoint_uri,
+            block_number,
+            method,
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            incr(f"rpc_cache.hit.{method}")
+            return dict(self._entries[key])
+
+        response = await self._dedupe(key, lambda: fetch(method, params))
+        if "error" not in response:
+            self._put(key, response)
+        return dict(response)
+
+    async def get_block_number(
+        self, endpoint_uri: str, fetch: Callable[[str, Any], Awaitable[dict]]
+    ) -> Optional[int]:
+        cached = self._block_numbers.get(endpoint_uri)
+        if cached is not None and time.monotonic() - cached[1] < self.block_number_ttl:
+            return cached[0]
+
+        response = await self._dedupe(
+            (endpoint_uri, "eth_blockNumber"), lambda: fetch("eth_blockNumber", [])
+        )
+        result = response.get("result")
+        if result is None:
+            return None
+
+        block_number = int(result, 16) if isinstance(result, str) else int(result)
+        self._block_numbers[endpoint_uri] = (block_number, time.monotonic())
+        return block_number
+
+    async def _dedupe(self, key, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        if future := self._in_flight.get(key):
+            incr("rpc_cache.collapsed")
+            return await asyncio.shield(future)
+
+        incr("rpc_cache.miss")
+        future = asyncio.ensure_future(fetch())
+        self._in_flight[key] = future
+        try:
+            return await future
+        finally:
+            self._in_flight.pop(key, None)
+
+    def _put(self, key, response: dict) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._block_numbers.clear()
+
+
+rpc_response_cache = RPCResponseCache()
+
+
+class CachedAsyncHTTPProvider(AsyncHTTPProvider):
+    """Http provider that serves `eth_call` / `eth_getBalance` reads via `rpc_response_cache`"""
+
+    async def make_request(self, method, params):
+        return await rpc_response_cache.get_or_fetch(
+            self.endpoint_uri, method, params, super().make_request
+        )
+
+    async def get_block_number(self) -> Optional[int]:
+        return await rpc_response_cache.get_block_number(
+            self.endpoint_uri, super().make_request
+        )
@@ -0,0 +1,285 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+from web3.exceptions import ContractLogicError
+
+from chaindata.constants import IntChainId
+from chaindata.evm.gas import estimate_gas_limit
+from chaindata.evm.permit2 import (
+    build_permit_transfer_typed_data,
+    recover_typed_data_signer,
+)
+from chaindata.evm.receipt_watcher import ReceiptWatcher
+from chaindata.evm.rpc_cache import (
+    CachePolicy,
+    RPCResponseCache,
+    _selector,
+    get_cache_policy,
+)
+
+USER = "0x0000000000000000000000000000000000000001"
+TOKEN = "0x0000000000000000000000000000000000000002"
+ENDPOINT = "https://rpc.test"
+
+
+def eth_call(signature: str, *block_id) -> list:
+    return [{"to": TOKEN, "data": _selector(signature) + "00" * 32}, *block_id]
+
+
+class FakeRPC:
+    """Upstream of the cache, counts requests per method"""
+
+    def __init__(self, block_number="0x10"):
+        self.block_number = block_number
+        self.calls = []
+
+    async def fetch(self, method, params):
+        self.calls.append(method)
+        await asyncio.sleep(0)
+        if method == "eth_blockNumber":
+            if self.block_number is None:
+                return {"error": {"code": -32000, "message": "unavailable"}}
+            return {"result": self.block_number}
+        return {"result": f"{method}:{len(self.calls)}"}
+
+    def count(self, method):
+        return self.calls.count(method)
+
+
+class GetCachePolicyTests(SimpleTestCase):
+    def test_eth_call_policy_by_selector(self):
+        self.assertEqual(
+            get_cache_policy("eth_call", eth_call("decimals()")), CachePolicy.IMMUTABLE
+        )
+        self.assertEqual(
+            get_cache_policy("eth_call", eth_call("allowance(address,address)")),
+            CachePolicy.PER_BLOCK,
+        )
+        self.assertEqual(
+            get_cache_policy("eth_call", eth_call("transfer(address,uint256)")),
+            CachePolicy.NO_CACHE,
+        )
+
+    def test_block_id_of_per_block_reads(self):
+        signature = "balanceOf(address)"
+        self.assertEqual(
+            get_cache_policy("eth_call", eth_call(signature, "latest")),
+            CachePolicy.PER_BLOCK,
+        )
+        self.assertEqual(
+            get_cache_policy("eth_call", eth_call(signature, "pending")),
+            CachePolicy.NO_CACHE,
+        )
+        self.assertEqual(
+            get_cache_policy("eth_call", eth_call(signature, "0x10")),
+            CachePolicy.IMMUTABLE,
+        )
+
+    def test_methods(self):
+        self.assertEqual(get_cache_policy("eth_chainId", []), CachePolicy.IMMUTABLE)
+        self.assertEqual(
+            get_cache_policy("eth_getBalance", [USER, "latest"]),
+            CachePolicy.PER_BLOCK,
+        )
+        self.assertEqual(
+            get_cache_policy("eth_sendRawTransaction", ["0x"]), CachePolicy.NO_CACHE
+        )
+
+
+class RPCResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.rpc = FakeRPC()
+        self.cache = RPCResponseCache(block_number_ttl=0)
+
+    async def get_balance(self):
+        return await self.cache.get_or_fetch(
+            ENDPOINT, "eth_getBalance", [USER, "latest"], self.rpc.fetch
+        )
+
+    async def test_per_block_reads_are_cached_within_a_block(self):
+        first = await self.get_balance()
+        second = await self.get_balance()
+        self.assertEqual(first, second)
+        self.assertEqual(self.rpc.count("eth_getBalance"), 1)
+
+        self.rpc.block_number = "0x11"
+        await self.get_balance()
+        self.assertEqual(self.rpc.count("eth_getBalance"), 2)
+
+    async def test_per_block_reads_skip_the_cache_without_a_block_number(self):
+        self.rpc.block_number = None
+        await self.get_balance()
+        await self.get_balance()
+        self.assertEqual(self.rpc.count("eth_getBalance"), 2)
+        self.assertEqual(len(self.cache._entries), 0)
+
+    async def test_errors_are_not_cached(self):
+        async def failing_fetch(method, params):
+            self.rpc.calls.append(method)
+            return {"error": {"code": -32000, "message": "execution reverted"}}
+
+        for _ in range(2):
+            await self.cache.get_or_fetch(ENDPOINT, "eth_chainId", [], failing_fetch)
+        self.assertEqual(self.rpc.count("eth_chainId"), 2)
+
+    async def test_concurrent_reads_share_one_request(self):
+        responses = await asyncio.gather(
+            *[
+                self.cache.get_or_fetch(ENDPOINT, "eth_chainId", [], self.rpc.fetch)
+                for _ in range(5)
+            ]
+        )
+        self.assertEqual(self.rpc.count("eth_chainId"), 1)
+        self.assertEqual(len({r["result"] for r in responses}), 1)
+
+    async def test_least_recently_used_entries_are_evicted(self):
+        cache = RPCResponseCache(max_entries=1)
+        for signature in ["decimals()", "asset()", "decimals()"]:
+            await cache.get_or_fetch(
+                ENDPOINT, "eth_call", eth_call(signature), self.rpc.fetch
+            )
+        self.assertEqual(self.rpc.count("eth_call"), 3)
+
+
+def failing_w3(error: Exception):
+    async def estimate_gas(transaction):
+        raise error
+
+    return SimpleNamespace(eth=SimpleNamespace(estimate_gas=estimate_gas))
+
+
+class EstimateGasLimitTests(SimpleTestCase):
+    transaction = {"from": USER, "to": TOKEN, "data": "0xdeadbeef" + "00" * 32}
+
+    async def test_reverts_raise(self):
+        with self.assertRaises(ContractLogicError):
+            await estimate_gas_limit(
+                failing_w3(ContractLogicError("execution reverted")),
+                self.transaction,
+                fallback_gas=100000,
+            )
+
+    async def test_reverts_after_a_pending_step_fall_back(self):
+        gas = await estimate_gas_limit(
+            failing_w3(ContractLogicError("execution reverted")),
+            self.transaction,
+            fallback_gas=100000,
+            after_pending_step=True,
+        )
+        self.assertEqual(gas, 100000)
+
+    async def test_rpc_failures_fall_back(self):
+        gas = await estimate_gas_limit(
+            failing_w3(TimeoutError()), self.transaction, fallback_gas=100000
+        )
+        self.assertEqual(gas, 100000)
+
+
+class ReceiptWatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.landed = set()
+        self.watcher = ReceiptWatcher(poll_interval=0)
+        patcher = mock.patch(
+            "chaindata.evm.receipt_watcher.req_post", side_effect=self.get_receipts
+        )
+        self.req_post = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            "chaindata.evm.receipt_watcher.get_rpc_url", return_value=ENDPOINT
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def get_receipts(self, url, requests):
+        return [
+            {
+                "id": request["id"],
+                "result": {"status": "0x1"} if request["id"] in self.landed else None,
+            }
+            for request in requests
+        ]
+
+    async def test_a_blocked_listener_doesnt_hold_up_other_hashes(self):
+        released = asyncio.Event()
+        seen = []
+
+        async def listener(chain_id, tx_hash, receipt):
+            seen.append(tx_hash)
+            if tx_hash == "0xa":
+                await released.wait()
+
+        self.watcher.add_listener(listener)
+        first = self.watcher.watch(IntChainId.Sonic, "0xa")
+        self.landed.add("0xa")
+        while not seen:
+            await asyncio.sleep(0)
+
+        second = self.watcher.watch(IntChainId.Sonic, "0xb")
+        self.landed.add("0xb")
+        self.assertEqual(await asyncio.wait_for(second, 1), {"status": "0x1"})
+        # Resolves only once its listeners are done
+        self.assertFalse(first.done())
+        self.assertIs(self.watcher.watch(IntChainId.Sonic, "0xA"), first)
+
+        released.set()
+        self.assertEqual(await asyncio.wait_for(first, 1), {"status": "0x1"})
+        self.assertEqual(seen, ["0xa", "0xb"])
+
+    async def test_hashes_expire_while_the_rpc_fails(self):
+        for response in [RuntimeError("rpc down"), {"error": {"code": -32005}}]:
+            with self.subTest(response=response):
+                watcher = ReceiptWatcher(poll_interval=0, watch_timeout=0)
+                receipts = []
+
+                async def listener(chain_id, tx_hash, receipt):
+                    receipts.append(receipt)
+
+                watcher.add_listener(listener)
+                with mock.patch(
+                    "chaindata.evm.receipt_watcher.req_post",
+                    side_effect=[response],
+                ):
+                    future = watcher.watch(IntChainId.Sonic, "0xa")
+                    self.assertIsNone(await asyncio.wait_for(future, 1))
+                self.assertEqual(receipts, [None])
+
+    async def test_batches_are_capped(self):
+        with mock.patch("chaindata.evm.receipt_watcher.RECEIPT_BATCH_SIZE", 2):
+            futures = [self.watcher.watch(IntChainId.Sonic, f"0x{i}") for i in range(5)]
+            self.landed.update(f"0x{i}" for i in range(5))
+            await asyncio.wait_for(asyncio.gather(*futures), 1)
+
+        batches = self.req_post.call_args_list
+        self.assertEqual([len(call.args[1]) for call in batches], [2, 2, 1])
+
+
+class RecoverTypedDataSignerTests(SimpleTestCase):
+    typed_data = build_permit_transfer_typed_data(TOKEN, 10, USER, 1, 2)
+
+    def test_recovers_the_signer(self):
+        from eth_account import Account
+        from eth_account.messages import encode_typed_data
+
+        account = Account.create()
+        typed_data = {
+            **self.typed_data,
+            "message": {
+                **self.typed_data["message"],
+                "permitted": {"token": TOKEN, "amount": 10},
+                "nonce": 1,
+                "deadline": 2,
+            },
+        }
+        signed = account.sign_message(encode_typed_data(full_message=typed_data))
+        self.assertEqual(
+            recover_typed_data_signer(self.typed_data, signed.signature.hex()),
+            account.address,
+        )
+
+    def test_malformed_signatures_raise_value_errors(self):
+        for signature in ["", "0x1234", "zz" * 65, "0x" + "ff" * 65, "0x" + "11" * 65]:
+            with self.subTest(signature):
+                with self.assertRaises(ValueError):
+                    recover_typed_data_signer(self.typed_data, signature)
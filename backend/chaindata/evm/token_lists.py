@@ -6,13 +6,16 @@ from tools.http import req_get
 
 logger = logging.getLogger(__name__)
 
+SHADOW_EXCHANGE_TOKEN_LIST_URL = "https://raw.githubusercontent.com/Shadow-Exchange/shadow-assets/main/blockchains/sonic/tokenlist.json"
+
 _TOKEN_LISTS_CACHE = None
 
 
 async def get_token_addresses_from_symbols(symbols: List[str]) -> Dict[str, str]:
     # TODO: Handle symbols by chain
 
-    token_list = await get_token_lists()
+    # Copy, the cached list is shared
+    token_list = list(await get_token_lists())
 
     # Hardcode native token for sonic chain
     token_list.append(
@@ -28,17 +31,22 @@ async def get_token_addresses_from_symbols(symbols: List[str]) -> Dict[str, str]
 
 
 async def get_token_lists():
-    global _TOKEN_LISTS_CACHE
-
-    SHADOW_EXCHANGE_TOKEN_LIST_URL = "https://raw.githubusercontent.com/Shadow-Exchange/shadow-assets/main/blockchains/sonic/tokenlist.json"
-
+    """Kept warm by the `token_lists` job, only fetched inline before its first run"""
     if _TOKEN_LISTS_CACHE is None:
         try:
-            data = await req_get(SHADOW_EXCHANGE_TOKEN_LIST_URL, timeout=5)
+            set_token_lists(await fetch_token_lists())
         except TimeoutError:
             logger.warning("Fetching token list from Solana Cloud timed out")
-            data = {}
-
-        _TOKEN_LISTS_CACHE = data.get("tokens", [[]])[0]
+            return []
 
     return _TOKEN_LISTS_CACHE
+
+
+async def fetch_token_lists() -> List[Dict]:
+    data = await req_get(SHADOW_EXCHANGE_TOKEN_LIST_URL, timeout=5)
+    return data.get("tokens", [[]])[0]
+
+
+def set_token_lists(token_list: List[Dict]) -> None:
+    global _TOKEN_LISTS_CACHE
+    _TOKEN_LISTS_CACHE = token_list
@@ -1,21 +1,37 @@
 import os
-
-from web3 import Web3, AsyncWeb3
+from typing import TYPE_CHECKING, Dict
 
 from chaindata.constants import ACTIVE_CHAINS, IntChainId
 
+if TYPE_CHECKING:
+    from web3 import AsyncWeb3
+
 BASE_RPC_URL = os.getenv("BASE_RPC_URL")
 SONIC_RPC_URL = os.getenv("SONIC_RPC_URL")
 
+# One client per chain so contract factories and http sessions are reused across requests
+_W3_BY_CHAIN: Dict[IntChainId, "AsyncWeb3"] = {}
+
+
+async def get_w3(chain_id: IntChainId) -> "AsyncWeb3":
+    if chain_id not in _W3_BY_CHAIN:
+        # web3 takes a large share of the app's import time, load it with the first client
+        from web3 import AsyncWeb3
 
-async def get_w3(chain_id: IntChainId):
+        from chaindata.evm.rpc_cache import CachedAsyncHTTPProvider
+
+        _W3_BY_CHAIN[chain_id] = AsyncWeb3(
+            CachedAsyncHTTPProvider(get_rpc_url(chain_id))
+        )
+    return _W3_BY_CHAIN[chain_id]
+
+
+def get_rpc_url(chain_id: IntChainId) -> str:
     if chain_id == IntChainId.Sonic:
-        w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(SONIC_RPC_URL))
+        return SONIC_RPC_URL
     elif chain_id == IntChainId.Base:
-        w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(BASE_RPC_URL))
+        return BASE_RPC_URL
     elif chain_id in ACTIVE_CHAINS:
         raise NotImplementedError(f"Chain {chain_id} not supported yet")
     else:
         raise ValueError(f"Unsupported chain id: {chain_id}")
-
-    return w3
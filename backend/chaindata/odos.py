@@ -1,4 +1,13 @@
-from chaindata.constants import SONIC_CHAIN_ID, IntChainId
+from chaindata.constants import (
+    ODOS_ROUTER_SPENDER_ADDRESS,
+    PERMIT2_ADDRESS,
+    SONIC_CHAIN_ID,
+    IntChainId,
+)
+from chaindata.evm.constants import ABI
+from chaindata.evm.gas import build_transaction
+from chaindata.evm.contracts import get_contract
+from chaindata.evm.utils import get_w3
 from tools.http import req_post
 
 BASE_URL = "https://api.odos.xyz/sor"
@@ -47,6 +56,7 @@ async def build_swap_transaction(
     input_token_amount: int,
     output_token_address: str,
     user_addr: str,
+    compact: bool = True,
 ):
     quote_response = await get_quote(
         chain_id,
@@ -54,6 +64,7 @@ async def build_swap_transaction(
         input_token_amount,
         output_token_address,
         user_addr,
+        compact=compact,
     )
 
     assemble_request_body = {
@@ -65,3 +76,35 @@ async def build_swap_transaction(
     }
 
     return await req_post(f"{BASE_URL}/assemble", assemble_request_body)
+
+
+async def build_swap_permit2_transaction(
+    chain_id: IntChainId,
+    assembled_transaction: dict,
+    permit2_nonce: int,
+    permit2_deadline: int,
+    signature: str,
+) -> dict:
+    """
+    Rewrites a non compact `swap` transaction from `/assemble` into `swapPermit2` so the
+    router pulls input tokens through a Permit2 signature instead of an allowance.
+    """
+    w3 = await get_w3(chain_id)
+    contract = get_contract(w3, ODOS_ROUTER_SPENDER_ADDRESS, ABI.ODOS_ROUTER_V2)
+    _, swap_args = contract.decode_function_input(assembled_transaction["data"])
+
+    return await build_transaction(
+        contract.functions.swapPermit2(
+            {
+                "contractAddress": PERMIT2_ADDRESS,
+                "nonce": permit2_nonce,
+                "deadline": permit2_deadline,
+                "signature": signature,
+            },
+            swap_args["tokenInfo"],
+            swap_args["pathDefinition"],
+            swap_args["executor"],
+            swap_args["referralCode"],
+        ),
+        {"from": assembled_transaction["from"]},
+    )
@@ -0,0 +1,70 @@
+import copy
+from typing import Optional
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from chat.models import Conversation, TransactionRequests
+from chat.typing import TransactionStates
+from tools.event_hub import EventHub
+
+# Application close codes of the conversation websocket
+NOT_FOUND_CLOSE_CODE = 4404
+# The client was too slow to drain its updates and should reconnect from its offset
+OVERFLOW_CLOSE_CODE = 4008
+
+# Updates of a conversation and its transaction requests, by conversation id
+conversation_event_hub = EventHub()
+
+
+@receiver(post_save, sender=Conversation)
+def publish_conversation_update(sender, instance: Conversation, **kwargs):
+    conversation_event_hub.publish(
+        str(instance.id), {"type": "conversation_updated", "version": instance.version}
+    )
+
+
+@receiver(post_save, sender=TransactionRequests)
+def publish_transaction_request_update(sender, instance: TransactionRequests, **kwargs):
+    # Snapshot the fields, the instance may be mutated before subscribers get to it.
+    # The details are a nested dict the transaction flows keep updating in place.
+    conversation_event_hub.publish(
+        str(instance.conversation_id),
+        {
+            "type": "transaction_request_updated",
+            "state": instance.state,
+            "transaction_details": copy.deepcopy(instance.transaction_details),
+            "pending_tx_hash": instance.pending_tx_hash,
+            "signed_tx_hash": instance.signed_tx_hash,
+            "failed_reason": instance.failed_reason,
+        },
+    )
+
+
+def build_transaction_event(transaction_request: dict) -> Optional[dict]:
+    """Client facing event for a transaction request update, if there is one to show"""
+    state = transaction_request["state"]
+    if state == TransactionStates.COMPLETED:
+        return {
+            "type": "confirmation",
+            "status": "confirmed",
+            "tx_hash": transaction_request["signed_tx_hash"],
+        }
+    if state == TransactionStates.FAILED:
+        return {
+            "type": "confirmation",
+            "status": "failed",
+            "reason": transaction_request["failed_reason"],
+        }
+    if transaction_request["pending_tx_hash"]:
+        return {
+            "type": "confirmation",
+            "status": "pending",
+            "tx_hash": transaction_request["pending_tx_hash"],
+        }
+    if transaction_request["transaction_details"] is not None:
+        return {
+            "type": "signing_request",
+            "transaction_details": transaction_request["transaction_details"],
+        }
+    return None
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import os
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from django.db import IntegrityError
+from django.utils import timezone
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from chat.models import IdempotencyKey
+from chat.turn_budget import TURN_TIMEOUT_SECONDS
+from tools.metrics import incr
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+# A reservation without a response older than this was left by a worker that died
+# mid request, a retry takes it over
+IDEMPOTENCY_LEASE_SECONDS = float(
+    os.getenv("IDEMPOTENCY_LEASE", 2 * TURN_TIMEOUT_SECONDS)
+)
+# Retries come within minutes, older keys are deleted by a scheduled job
+IDEMPOTENCY_KEY_RETENTION_SECONDS = float(os.getenv("IDEMPOTENCY_KEY_RETENTION", 86400))
+
+# (scope, key) -> execution of the first request with that key in this process
+_IN_FLIGHT: Dict[Tuple[str, str], asyncio.Future] = {}
+
+
+async def run_idempotent(
+    scope: str,
+    key: Optional[str],
+    request_body: str,
+    execute: Callable[[], Awaitable[ResponseT]],
+    response_model: Type[ResponseT],
+    is_final: Callable[[ResponseT], bool] = lambda response: True,
+) -> ResponseT:
+    """
+    Runs `execute` once per idempotency key. Concurrent duplicates wait on the in-flight
+    execution and later retries replay its stored response. Requests without a key run as is.
+    Responses that aren't final (eg. still waiting on chain) aren't stored, retries execute again.
+    """
+    if key is None:
+        return await execute()
+
+    request_hash = hashlib.sha256(request_body.encode()).hexdigest()
+    in_flight_key = (scope, key)
+    future = _IN_FLIGHT.get(in_flight_key)
+    if future is not None:
+        incr("idempotency.collapsed")
+    else:
+        # Not cancelled with the client's connection, so its retry can pick the result up
+        future = asyncio.ensure_future(
+            _run_once(scope, key, request_hash, execute, response_model, is_final)
+        )
+        _IN_FLIGHT[in_flight_key] = future
+        future.add_done_callback(lambda _: _IN_FLIGHT.pop(in_flight_key, None))
+
+    stored_hash, response = await asyncio.shield(future)
+    _check_request_hash(stored_hash, request_hash)
+    return response
+
+
+async def _run_once(
+    scope: str,
+    key: str,
+    request_hash: str,
+    execute: Callable[[], Awaitable[BaseModel]],
+    response_model: Type[BaseModel],
+    is_final: Callable[[BaseModel], bool],
+) -> Tuple[str, BaseModel]:
+    stored = await IdempotencyKey.objects.filter(scope=scope, key=key).afirst()
+    if stored is not None:
+        if stored.response is not None:
+            incr("idempotency.replayed")
+            return stored.request_hash, response_model.model_validate(stored.response)
+        record = await _take_over_abandoned(stored, request_hash)
+    else:
+        try:
+            record = await IdempotencyKey.objects.acreate(
+                scope=scope, key=key, request_hash=request_hash
+            )
+        except IntegrityError:
+            # Another worker reserved the key first
+            record = None
+    if record is None:
+        # Executing in another worker
+        raise HTTPException(
+            status_code=409, detail="A request with this key is in progress"
+        )
+
+    # Only touches the row while it is still this execution's reservation, a late
+    # finish after a takeover must not clobber the new one
+    reservation = IdempotencyKey.objects.filter(
+        pk=record.pk, created_at=record.created_at
+    )
+    try:
+        response = await execute()
+    except Exception:
+        # Failed requests aren't stored, a retry executes again
+        await reservation.adelete()
+        raise
+
+    if not is_final(response):
+        await reservation.adelete()
+        return request_hash, response
+
+    await reservation.aupdate(response=response.model_dump(mode="json"))
+    return request_hash, response
+
+
+async def _take_over_abandoned(
+    stored: IdempotencyKey, request_hash: str
+) -> Optional[IdempotencyKey]:
+    """The reservation renewed for this execution if its lease ran out, else None"""
+    now = timezone.now()
+    if stored.created_at > now - timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS):
+        return None
+
+    # Conditional, so only one of several concurrent retries takes it over
+    updated = await IdempotencyKey.objects.filter(
+        pk=stored.pk, created_at=stored.created_at, response__isnull=True
+    ).aupdate(request_hash=request_hash, created_at=now)
+    if not updated:
+        return None
+
+    incr("idempotency.taken_over")
+    stored.request_hash = request_hash
+    stored.created_at = now
+    return stored
+
+
+async def delete_expired_idempotency_keys() -> int:
+    """Deletes keys past the retention window, returns how many"""
+    cutoff = timezone.now() - timedelta(seconds=IDEMPOTENCY_KEY_RETENTION_SECONDS)
+    deleted, _ = await IdempotencyKey.objects.filter(created_at__lt=cutoff).adelete()
+    incr("idempotency.expired", deleted)
+    return deleted
+
+
+def _check_request_hash(stored_hash: str, request_hash: str) -> None:
+    if stored_hash != request_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency key was already used with a different request",
+        )
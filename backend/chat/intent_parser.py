@@ -0,0 +1,120 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from chaindata.evm.token_lists import get_token_addresses_from_symbols
+
+
+@dataclass
+class Intent:
+    """A tool call recognized without the llm"""
+
+    name: str
+    arguments: Dict[str, Any]
+
+
+def _amount(name: str) -> str:
+    return rf"(?P<{name}>\d+(?:\.\d+)?|\.\d+)"
+
+
+def _symbol(name: str) -> str:
+    return rf"\$?(?P<{name}>[a-z0-9][\w.\-]*)"
+
+
+SWAP_VERB = r"(?:swap|convert|exchange|trade)"
+LEND_VERB = r"(?:lend|deposit|supply)"
+TO_SILO = r"(?:\s+(?:on|to|in|into)\s+silo)?"
+FROM_SILO = r"(?:\s+from\s+silo)?"
+
+# Whole message grammars of the action tools, named groups are the tool arguments.
+# Amount groups end with `amount`, token groups with `symbol`.
+INTENT_PATTERNS = [
+    (
+        "swap_and_lend_tokens",
+        rf"{SWAP_VERB}\s+{_amount('input_token_amount')}\s+{_symbol('input_token_symbol')}"
+        rf"\s+(?:to|for|into)\s+{_symbol('lend_token_symbol')}"
+        rf"\s*,?\s+(?:and\s+)?(?:then\s+)?{LEND_VERB}(?:\s+(?:it|them|the\s+output))?{TO_SILO}",
+    ),
+    (
+        "swap_tokens",
+        rf"{SWAP_VERB}\s+{_amount('input_token_amount')}\s+{_symbol('input_token_symbol')}"
+        rf"\s+(?:to|for|into)\s+{_symbol('output_token_symbol')}",
+    ),
+    (
+        "lend_tokens",
+        rf"{LEND_VERB}\s+{_amount('amount')}\s+{_symbol('token_symbol')}{TO_SILO}",
+    ),
+    (
+        "withdraw_all_tokens",
+        rf"withdraw\s+all(?:\s+(?:of\s+)?my)?\s+{_symbol('token_symbol')}{FROM_SILO}",
+    ),
+    (
+        "withdraw_tokens",
+        rf"withdraw\s+{_amount('amount')}\s+{_symbol('token_symbol')}{FROM_SILO}",
+    ),
+    # Only the native token can be staked
+    ("stake_sonic", rf"stake\s+{_amount('amount')}(?:\s+\$?s)?"),
+]
+
+_COMPILED_PATTERNS = [
+    (name, re.compile(rf"(?:please\s+)?{pattern}(?:\s+please)?", re.IGNORECASE))
+    for name, pattern in INTENT_PATTERNS
+]
+# The same grammars anywhere in a longer message, eg. "hey, can you swap 10 S to USDC?"
+_SEARCH_PATTERNS = [
+    (name, re.compile(rf"(?<![\w.]){pattern}(?![\w.])", re.IGNORECASE))
+    for name, pattern in INTENT_PATTERNS
+]
+
+
+async def parse_intent(message: str) -> Optional[Intent]:
+    """
+    Tool call for a message that is exactly one supported action, eg. "swap 10 S to USDC".
+    `None` whenever the message or its tokens are ambiguous, the llm handles those.
+    """
+    text = " ".join(message.split()).rstrip(".!")
+    for name, pattern in _COMPILED_PATTERNS:
+        if match := pattern.fullmatch(text):
+            return await build_intent(name, match.groupdict())
+    return None
+
+
+async def find_intent(message: str) -> Optional[Intent]:
+    """
+    Likely tool call of a message that mentions one action among other words. Only a
+    guess, used to start work early, the llm still decides what runs.
+    """
+    text = " ".join(message.split()).rstrip(".!?")
+    for name, pattern in _SEARCH_PATTERNS:
+        if match := pattern.search(text):
+            return await build_intent(name, match.groupdict())
+    return None
+
+
+async def build_intent(name: str, groups: Dict[str, str]) -> Optional[Intent]:
+    arguments = {}
+    symbols = [value for key, value in groups.items() if key.endswith("symbol")]
+    address_by_symbol = await get_token_addresses_from_symbols(symbols)
+
+    for key, value in groups.items():
+        if key.endswith("amount"):
+            amount = float(value)
+            if amount <= 0:
+                return None
+            arguments[key] = amount
+        elif key.endswith("symbol"):
+            symbol = resolve_symbol(value, list(address_by_symbol))
+            if symbol is None:
+                return None
+            arguments[key] = symbol
+
+    return Intent(name=name, arguments=arguments)
+
+
+def resolve_symbol(symbol: str, known_symbols: List[str]) -> Optional[str]:
+    """Listed symbol the user meant, matching case only when exactly one symbol fits"""
+    if symbol in known_symbols:
+        return symbol
+
+    matches = [known for known in known_symbols if known.lower() == symbol.lower()]
+    return matches[0] if len(matches) == 1 else None
@@ -0,0 +1,95 @@
+import os
+from datetime import timedelta
+from typing import Any, Optional, Tuple
+
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+
+from chaindata.evm.token_lists import fetch_token_lists, set_token_lists
+from chat.idempotency import delete_expired_idempotency_keys
+from chat.models import ScheduledJob
+from chat.silo_lending_txns import (
+    fetch_silo_markets,
+    fetch_vaults_by_token,
+    set_silo_markets,
+    set_vaults_by_token,
+)
+from tools.scheduler import scheduler
+
+# "postgres" when running more than one worker, so only one of them calls upstream apis
+SCHEDULER_BACKEND = os.getenv("SCHEDULER_BACKEND", "memory")
+
+TOKEN_LISTS_REFRESH_SECONDS = 3600
+# APYs move, the best lending vault is picked from these
+SILO_MARKETS_REFRESH_SECONDS = 300
+SILO_VAULTS_REFRESH_SECONDS = 86400
+IDEMPOTENCY_KEYS_CLEANUP_SECONDS = 3600
+
+
+class PostgresJobStore:
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = timezone.now()
+        lease_expires_at = now + timedelta(seconds=ttl)
+        updated = await ScheduledJob.objects.filter(
+            Q(owner=owner)
+            | Q(lease_expires_at__lt=now)
+            | Q(lease_expires_at__isnull=True),
+            name=name,
+        ).aupdate(owner=owner, lease_expires_at=lease_expires_at)
+        if updated:
+            return True
+
+        try:
+            await ScheduledJob.objects.acreate(
+                name=name, owner=owner, lease_expires_at=lease_expires_at
+            )
+        except IntegrityError:
+            # Held by another worker
+            return False
+        return True
+
+    async def save_snapshot(self, name: str, data: Any) -> None:
+        await ScheduledJob.objects.filter(name=name).aupdate(
+            data=data, refreshed_at=timezone.now()
+        )
+
+    async def load_snapshot(self, name: str) -> Optional[Tuple[Any, float]]:
+        job = await ScheduledJob.objects.filter(
+            name=name, refreshed_at__isnull=False
+        ).afirst()
+        if job is None:
+            return None
+        return job.data, job.refreshed_at.timestamp()
+
+
+if SCHEDULER_BACKEND == "postgres":
+    scheduler.store = PostgresJobStore()
+
+scheduler.add_job(
+    "token_lists",
+    fetch_token_lists,
+    set_token_lists,
+    interval=TOKEN_LISTS_REFRESH_SECONDS,
+)
+scheduler.add_job(
+    "silo_markets",
+    fetch_silo_markets,
+    set_silo_markets,
+    interval=SILO_MARKETS_REFRESH_SECONDS,
+)
+scheduler.add_job(
+    "silo_vaults_by_token",
+    fetch_vaults_by_token,
+    set_vaults_by_token,
+    interval=SILO_VAULTS_REFRESH_SECONDS,
+    depends_on=("silo_markets",),
+)
+
+# Nothing to install, the fetch is the deletion and returns the deleted count
+scheduler.add_job(
+    "idempotency_keys_cleanup",
+    delete_expired_idempotency_keys,
+    lambda deleted: None,
+    interval=IDEMPOTENCY_KEYS_CLEANUP_SECONDS,
+)
@@ -1,38 +1,90 @@
 import os
 import json
+import asyncio
 import logging
-from typing import List, Any
-from groq import AsyncGroq
-
-from django.db import transaction
-from asgiref.sync import sync_to_async
-
+from typing import List, Any, Optional
+
+from chat.intent_parser import parse_intent
+from chat.prebuild import start_prebuild
+from chat.model_router import TOOL_REPAIR, model_router, select_route
+from chat.prompt_prefix import get_prompt_prefix, record_prefix_usage
+from chat.turn_budget import DEADLINE, TurnBudget
+from tools.limiter import HIGH_PRIORITY, NORMAL_PRIORITY
+from tools.speculation import Speculation
+from chat.llm_tools import (
+    TOOLS,
+    TOOL_DEFINITIONS,
+    TOOLS_BY_NAME,
+    build_tool_cache_key,
+    find_result_reference,
+    tool_result_cache,
+)
+from chat.tool_call_parser import NATIVE, build_tool_call, parse_tool_calls
 from chat.sonic_airdrop import get_points_and_gems_details
 from chat.stake_sonic_txn import stake_sonic
 from chat.silo_lending_txns import lend_tokens, withdraw_all_tokens, withdraw_tokens
 from chat.swap_transactions import swap_tokens
+from chat.swap_and_lend_txns import swap_and_lend_tokens
+from chat.txn_builder import get_last_tool_call_id
 from chat.typing import (
+    ApprovalModes,
     SiloLendingDepositTxnSteps,
     SiloLendingWithdrawTxnSteps,
     SonicStakeTxnSteps,
+    SwapAndLendTxnSteps,
     SwapTransactionSteps,
     TransactionFlows,
     TransactionStates,
 )
 from tools.dictionary import get_from_dict
+from chat.locks import conversation_locks
 from chat.models import Conversation, TransactionRequests
+from tools.db import asave_atomic
+from tools.metrics import incr
 from tools.typing import UserDetails
-from chaindata.active_chains import get_active_chains
+from chaindata.active_chains import get_active_chains, get_cached_active_chains
 from chaindata.constants import IntChainId
+from chaindata.evm.permit2 import recover_typed_data_signer
+from chaindata.evm.receipt_watcher import is_receipt_successful, receipt_watcher
 
 logger = logging.getLogger(__name__)
 
-client = AsyncGroq(
-    api_key=os.environ.get("GROQ_API_KEY"),
+# How long a submit request waits for its transaction to be mined before responding
+RECEIPT_WAIT_TIMEOUT_SECONDS = float(os.getenv("RECEIPT_WAIT_TIMEOUT", 30))
+# A second completion only when a tool call in the first one couldn't be recovered
+COMPLETION_ATTEMPTS = 2
+# Run plain action messages like "swap 10 S to USDC" without a completion
+INTENT_FAST_PATH = os.getenv("INTENT_FAST_PATH", "true") == "true"
+# Start the reads of a likely transaction while the llm is choosing its tool call
+SPECULATIVE_PREBUILD = os.getenv("SPECULATIVE_PREBUILD", "true") == "true"
+
+
+class TransactionPendingError(Exception):
+    pass
+
+
+class TurnBudgetExhausted(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+# Answer of a turn stopped by its budget, the transcript stays valid for the next message
+BUDGET_EXHAUSTED_MESSAGE = (
+    "Sorry, I couldn't finish this request in time. Please try again, or break it "
+    "down into smaller steps."
 )
 
 
-MODEL = "deepseek-r1-distill-llama-70b"
+TOOL_CALL_REPAIR_PROMPT = (
+    "Fix the malformed tool call in the user message. Answer with only a json object "
+    '{"name": <tool name>, "arguments": {...}} calling one of these tools:\n'
+    + "\n".join(
+        f"{tool.name}: {json.dumps(tool.parameters.get('properties', {}))}"
+        for tool in TOOLS
+    )
+)
+
 SYSTEM_PROMPT = """
 You are a helpful AI assistant whose goal is to help onboard users to Sonic chain.
 
@@ -45,16 +97,93 @@ Some details about the chain:
 Supported actions:
 - Swap tokens
 - Lend, withdraw tokens
+- Swap tokens and lend the output in one request
 - Stake Sonic native token `S`
 - get details about the Sonic airdrop - points and gems
 """
 
+# Conversations store the version of their system prompt instead of a copy of it.
+# Add a new version rather than editing one in place, old threads keep their prompt.
+SYSTEM_PROMPT_VERSION = "v1"
+SYSTEM_PROMPTS = {
+    "v1": SYSTEM_PROMPT,
+}
+
+
+def build_system_message() -> dict:
+    return {"role": "system", "prompt_version": SYSTEM_PROMPT_VERSION}
+
+
+def resolve_message(message: dict) -> dict:
+    """Message as sent to the llm, system prompt references are expanded"""
+    if message["role"] == "system" and "prompt_version" in message:
+        return {"role": "system", "content": SYSTEM_PROMPTS[message["prompt_version"]]}
+    return message
+
 
 async def complete_conversation(
     conversation: Conversation,
     user_details: UserDetails,
 ) -> bool:
-    await get_completion(conversation)
+    """
+    Answers the last user message, running tool calls until the model replies in text
+    or a transaction needs signing. Returns whether one does. A turn that runs out of
+    steps, time or tokens ends with an apology instead of more completions.
+    """
+    budget = TurnBudget()
+    speculation = Speculation()
+    # A user in the middle of a transaction flow is waiting on us, serve them first
+    priority = (
+        HIGH_PRIORITY
+        if await has_transaction_in_progress(conversation)
+        else NORMAL_PRIORITY
+    )
+    try:
+        needs_txn_signing = await run_turn(
+            conversation, user_details, budget, priority, speculation
+        )
+    except (TurnBudgetExhausted, asyncio.TimeoutError) as e:
+        reason = e.reason if isinstance(e, TurnBudgetExhausted) else DEADLINE
+        logger.warning(
+            f"Turn of conversation {conversation.id} stopped early, {reason} budget "
+            f"exhausted after {budget.steps} steps and {budget.tokens} tokens"
+        )
+        budget.record(exhausted=reason)
+        conversation.messages.append(
+            {"role": "assistant", "content": BUDGET_EXHAUSTED_MESSAGE}
+        )
+        await conversation.asave()
+        return False
+    finally:
+        # Prebuilt work for a tool call the llm didn't make
+        speculation.discard()
+
+    budget.record()
+    return needs_txn_signing
+
+
+async def run_turn(
+    conversation: Conversation,
+    user_details: UserDetails,
+    budget: TurnBudget,
+    priority: int = NORMAL_PRIORITY,
+    speculation: Optional[Speculation] = None,
+) -> bool:
+    if INTENT_FAST_PATH and await try_intent_fast_path(conversation):
+        incr("intent.fast_path")
+    else:
+        message = conversation.messages[-1]
+        if (
+            SPECULATIVE_PREBUILD
+            and speculation is not None
+            and message["role"] == "user"
+        ):
+            await start_prebuild(
+                speculation,
+                message.get("content") or "",
+                user_details.evm_wallet_address,
+            )
+        await get_completion(conversation, budget, priority)
 
     # Handle tool calls if present
     while conversation.messages[-1].get("tool_calls"):
@@ -66,56 +195,24 @@ async def complete_conversation(
                     get_from_dict(tool_call, ["function", "arguments"])
                 )
 
-                # Call the appropriate function
-                if function_name == "is_user_wallet_funded":
-                    result = await is_user_wallet_funded(user_details)
-                elif function_name == "swap_tokens":
-                    result = await swap_tokens(
-                        conversation,
-                        user_details.evm_wallet_address,
-                        fn_args["input_token_symbol"],
-                        fn_args["input_token_amount"],
-                        fn_args["output_token_symbol"],
-                    )
-
-                    return True
-
-                elif function_name == "lend_tokens":
-                    result = await lend_tokens(
-                        conversation,
-                        user_details.evm_wallet_address,
-                        fn_args["token_symbol"],
-                        fn_args["amount"],
-                    )
-
+                result = await run_tool_call(
+                    conversation, user_details, function_name, fn_args
+                )
+                tool = TOOLS_BY_NAME.get(function_name)
+                if tool is not None and tool.ends_turn:
                     return True
-                elif function_name == "withdraw_tokens":
-                    result = await withdraw_tokens(
-                        conversation,
-                        user_details.evm_wallet_address,
-                        fn_args["token_symbol"],
-                        fn_args["amount"],
-                    )
 
-                    return True
-                elif function_name == "withdraw_all_tokens":
-                    result = await withdraw_all_tokens(
-                        conversation,
-                        user_details.evm_wallet_address,
-                        fn_args["token_symbol"],
-                    )
-                    return True
-                elif function_name == "stake_sonic":
-                    result = await stake_sonic(
-                        conversation,
-                        user_details.evm_wallet_address,
-                        fn_args["amount"],
+                content = str(result)
+                if tool is not None and tool.result_by_reference:
+                    # The model already has this in its context, don't pay for it twice
+                    reference = find_result_reference(
+                        conversation.messages + tools_responses,
+                        function_name,
+                        content,
                     )
-                    return True
-                elif function_name == "get_points_and_gems_details":
-                    result = get_points_and_gems_details()
-                else:
-                    result = f"Error: Unknown function '{function_name}'"
+                    if reference is not None:
+                        incr(f"llm_tools.{function_name}.by_reference")
+                        content = f"Same result as the earlier {function_name} call {reference}, see above."
 
                 # Add the function response to messages
                 tools_responses.append(
@@ -123,7 +220,7 @@ async def complete_conversation(
                         "role": "tool",
                         "tool_call_id": tool_call["id"],
                         "name": function_name,
-                        "content": str(result),
+                        "content": content,
                     }
                 )
             except Exception as e:
@@ -143,220 +240,318 @@ async def complete_conversation(
         conversation.messages.extend(tools_responses)
         await conversation.asave()
 
+        if reason := budget.exhausted():
+            raise TurnBudgetExhausted(reason)
+
         # Get a new response from the assistant with the tool results
-        await get_completion(conversation)
+        await get_completion(conversation, budget, priority)
 
     return False
 
 
-async def get_completion(conversation: Conversation) -> None:
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "is_user_wallet_funded",
-                "description": "Check if the user has funded their wallet.",
-                "parameters": {},
-                "returns": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "List of funded chains",
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "get_points_and_gems_details",
-                "description": "Get details about the points and gems program on Sonic chain.",
-                "parameters": {},
-                "returns": {
-                    "type": "string",
-                    "description": "Details about the points and gems program",
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "lend_tokens",
-                "description": "Builds a transaction to lend tokens.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "token_symbol": {"type": "string"},
-                        "amount": {"type": "number"},
-                    },
-                    "required": ["token_symbol", "amount"],
-                },
-                "returns": {
-                    "type": "object",
-                    "description": "Lending transaction details",
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "withdraw_tokens",
-                "description": "Builds a transaction to withdraw tokens.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "token_symbol": {"type": "string"},
-                        "amount": {"type": "number"},
-                    },
-                    "required": ["token_symbol", "amount"],
-                },
-                "returns": {
-                    "type": "object",
-                    "description": "Withdrawal transaction details",
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "withdraw_all_tokens",
-                "description": "Builds a transaction to withdraw all tokens.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "token_symbol": {"type": "string"},
-                    },
-                    "required": ["token_symbol"],
-                },
-                "returns": {
-                    "type": "object",
-                    "description": "Withdrawal transaction details",
-                },
-            },
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "swap_tokens",
-                "description": "Builds a transaction to swap tokens.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "input_token_symbol": {"type": "string"},
-                        "input_token_amount": {"type": "number"},
-                        "output_token_symbol": {"type": "string"},
-                    },
-                    "required": [
-                        "input_token_symbol",
-                        "input_token_amount",
-                        "output_token_symbol",
-                    ],
-                },
-                "returns": {
-                    "type": "object",
-                    "description": "Swap transaction details",
-                },
-            },
-        },
+async def run_tool_call(
+    conversation: Conversation,
+    user_details: UserDetails,
+    function_name: str,
+    fn_args: dict,
+) -> Any:
+    """Runs the tool, or reuses its result for the same arguments within the tool's ttl"""
+    tool = TOOLS_BY_NAME.get(function_name)
+    if tool is None or tool.cache_ttl is None:
+        return await execute_tool_call(
+            conversation, user_details, function_name, fn_args
+        )
+
+    key = build_tool_cache_key(tool, fn_args, user_details)
+    result = await tool_result_cache.get(key)
+    if result is not None:
+        incr(f"llm_tools.{function_name}.cache_hit")
+        return result
+
+    incr(f"llm_tools.{function_name}.cache_miss")
+    result = await execute_tool_call(conversation, user_details, function_name, fn_args)
+    await tool_result_cache.set(key, result, ttl=tool.cache_ttl)
+    return result
+
+
+async def execute_tool_call(
+    conversation: Conversation,
+    user_details: UserDetails,
+    function_name: str,
+    fn_args: dict,
+) -> Any:
+    if function_name == "is_user_wallet_funded":
+        return await is_user_wallet_funded(user_details)
+    elif function_name == "swap_tokens":
+        return await swap_tokens(
+            conversation,
+            user_details.evm_wallet_address,
+            fn_args["input_token_symbol"],
+            fn_args["input_token_amount"],
+            fn_args["output_token_symbol"],
+        )
+    elif function_name == "lend_tokens":
+        return await lend_tokens(
+            conversation,
+            user_details.evm_wallet_address,
+            fn_args["token_symbol"],
+            fn_args["amount"],
+        )
+    elif function_name == "withdraw_tokens":
+        return await withdraw_tokens(
+            conversation,
+            user_details.evm_wallet_address,
+            fn_args["token_symbol"],
+            fn_args["amount"],
+        )
+    elif function_name == "withdraw_all_tokens":
+        return await withdraw_all_tokens(
+            conversation,
+            user_details.evm_wallet_address,
+            fn_args["token_symbol"],
+        )
+    elif function_name == "swap_and_lend_tokens":
+        return await swap_and_lend_tokens(
+            conversation,
+            user_details.evm_wallet_address,
+            fn_args["input_token_symbol"],
+            fn_args["input_token_amount"],
+            fn_args["lend_token_symbol"],
+        )
+    elif function_name == "stake_sonic":
+        return await stake_sonic(
+            conversation,
+            user_details.evm_wallet_address,
+            fn_args["amount"],
+        )
+    elif function_name == "get_points_and_gems_details":
+        # Calls recorded before the tool took a query get the overview
+        return get_points_and_gems_details(fn_args.get("query", ""))
+    else:
+        return f"Error: Unknown function '{function_name}'"
+
+
+async def try_intent_fast_path(conversation: Conversation) -> bool:
+    """
+    Records the tool call for an unambiguous action message without asking the llm.
+    The tool call is then run exactly like one the llm made.
+    """
+    message = conversation.messages[-1]
+    if message["role"] != "user" or not message.get("content"):
+        return False
+
+    intent = await parse_intent(message["content"])
+    if intent is None:
+        return False
+
+    # A flow in progress changes what the user means, let the llm look at it
+    if await has_transaction_in_progress(conversation):
+        return False
+
+    conversation.messages.append(
         {
-            "type": "function",
-            "function": {
-                "name": "stake_sonic",
-                "description": "Builds a transaction to stake Sonic chains native token `S`.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "amount": {"type": "number"},
-                    },
-                    "required": ["amount"],
-                },
-                "returns": {
-                    "type": "object",
-                    "description": "Staking transaction details",
-                },
-            },
-        },
-    ]
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [build_tool_call(intent.name, intent.arguments)],
+        }
+    )
+    await conversation.asave()
+    return True
+
+
+async def has_transaction_in_progress(conversation: Conversation) -> bool:
+    return await TransactionRequests.objects.filter(
+        conversation=conversation, state=TransactionStates.PROCESSING
+    ).aexists()
+
 
+async def get_completion(
+    conversation: Conversation,
+    budget: Optional[TurnBudget] = None,
+    priority: int = NORMAL_PRIORITY,
+) -> None:
     # Clean up any messages that might have a 'reasoning' field as they are not supported by groq API
     messages = [
-        {k: v for k, v in message.items() if k != "reasoning"}
+        {k: v for k, v in resolve_message(message).items() if k != "reasoning"}
         for message in conversation.messages
     ]
-
-    max_retries = 3
-    for attempt in range(max_retries):
-        chat_completion_obj = await client.chat.completions.create(
-            messages=messages,
-            model=MODEL,
-            tools=tools,
-            tool_choice="auto",
+    # Byte identical system prompt and tools at the start of every request, so the
+    # provider can serve them from its prompt cache
+    prefix = get_prompt_prefix(messages[0]["content"], TOOL_DEFINITIONS)
+    messages[0] = prefix.system_message
+    route = select_route(conversation.messages)
+
+    for attempt in range(COMPLETION_ATTEMPTS):
+        chat_completion_obj = await asyncio.wait_for(
+            model_router.complete(
+                route,
+                queue_key=conversation.user_id,
+                priority=priority,
+                messages=messages,
+                tools=prefix.tools,
+                tool_choice="auto",
+            ),
+            timeout=budget.seconds_left() if budget is not None else None,
         )
+        record_prefix_usage(prefix, chat_completion_obj.usage)
+        if budget is not None:
+            budget.charge(chat_completion_obj.usage)
 
         response = chat_completion_obj.choices[0].message.to_dict()
 
-        # Try to fix malformed tool calls in content
-        content = response.get("content", "")
-        if "<tool_call>" in content:
-            try:
-                # Extract the JSON between <tool_call> and the end delimiter
-                tool_call_start = content.find("<tool_call>") + len("<tool_call>")
-                tool_call_end = content.find("<｜tool▁calls▁end｜>")
-                if tool_call_end == -1:  # Handle case where end delimiter might vary
-                    tool_call_end = content.find("</tool_call>")
-
-                if tool_call_end != -1:
-                    tool_call_json = content[tool_call_start:tool_call_end]
-                    tool_call_data = json.loads(tool_call_json)
-
-                    # Reformat as proper tool calls
-                    response["tool_calls"] = [
-                        {
-                            "id": tool_call_data.get("id", f"call_{attempt}"),
-                            "type": "function",
-                            "function": {
-                                "name": tool_call_data["name"],
-                                "arguments": json.dumps(tool_call_data["arguments"]),
-                            },
-                        }
-                    ]
-                    response["content"] = (
-                        None  # Clear the content since we've extracted the tool call
-                    )
-                    logger.info(
-                        "Successfully extracted and reformatted tool call from content"
-                    )
-
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.exception(f"Failed to parse tool call from content: {e}")
-                if attempt < max_retries - 1:
-                    continue
-                else:
-                    logger.error("Max retries reached for malformed tool call")
+        if response.get("tool_calls"):
+            incr(f"tool_call_parser.{NATIVE}")
+        else:
+            # Reasoning models often write their tool calls into the content
+            parsed = await parse_tool_calls(
+                response.get("content"), TOOLS_BY_NAME, repair=repair_tool_call
+            )
+            if parsed.tool_calls:
+                response["tool_calls"] = parsed.tool_calls
+                response["content"] = parsed.content
+            elif (
+                parsed.failed
+                and attempt < COMPLETION_ATTEMPTS - 1
+                and (budget is None or budget.exhausted() is None)
+            ):
+                # Neither the parser nor the repair model recovered the call
+                incr("tool_call_parser.regenerated")
+                continue
 
         conversation.messages.append(response)
         await conversation.asave()
-        break
-
-
-async def is_user_wallet_funded(user_details: UserDetails) -> List[str]:
-    active_chains = await get_active_chains(user_details.evm_wallet_address)
+        return
+
+
+async def repair_tool_call(fragment: str) -> str:
+    """Json of a malformed tool call fixed by a small model, cheaper than a new completion"""
+    completion = await model_router.complete(
+        TOOL_REPAIR,
+        messages=[
+            {"role": "system", "content": TOOL_CALL_REPAIR_PROMPT},
+            {"role": "user", "content": fragment},
+        ],
+        response_format={"type": "json_object"},
+        temperature=0,
+        max_tokens=300,
+    )
+    return completion.choices[0].message.content
+
+
+async def is_user_wallet_funded(
+    user_details: UserDetails, use_cache: bool = False
+) -> List[str]:
+    if use_cache:
+        active_chains = await get_cached_active_chains(user_details.evm_wallet_address)
+    else:
+        active_chains = await get_active_chains(user_details.evm_wallet_address)
     return [IntChainId.get_str(chain_id) for chain_id in active_chains]
 
 
 async def submit_signed_transaction(
     conversation: Conversation, signed_tx_hash: str
 ) -> bool:
+    """
+    Registers the signed hash with the receipt watcher and waits for it to be mined.
+    The flow is advanced by `on_transaction_receipt`, so it still moves forward if the
+    client goes away or the wait times out.
+    """
+    # Not held while waiting, the receipt listener takes the lock to advance the flow
+    async with conversation_locks.hold(conversation.id):
+        try:
+            transaction_request = await TransactionRequests.objects.aget(
+                conversation=conversation, state=TransactionStates.PROCESSING
+            )
+        except TransactionRequests.DoesNotExist:
+            raise ValueError("No pending transaction found for conversation")
+        except TransactionRequests.MultipleObjectsReturned:
+            raise ValueError("Multiple pending transactions found for conversation")
+
+        if is_awaiting_permit_signature(transaction_request):
+            raise ValueError("Pending transaction request expects a signature")
+
+        signed_tx_hash = signed_tx_hash.lower()
+        transaction_request.pending_tx_hash = signed_tx_hash
+        await transaction_request.asave()
+
     try:
-        transaction_request = await TransactionRequests.objects.aget(
-            conversation=conversation, state=TransactionStates.PROCESSING
+        await asyncio.wait_for(
+            asyncio.shield(receipt_watcher.watch(IntChainId.Sonic, signed_tx_hash)),
+            timeout=RECEIPT_WAIT_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        raise TransactionPendingError(
+            f"Transaction {signed_tx_hash} is not confirmed yet"
         )
+
+    await conversation.arefresh_from_db()
+    await transaction_request.arefresh_from_db()
+
+    return (
+        transaction_request.state == TransactionStates.PROCESSING
+        and transaction_request.transaction_details is not None
+    )
+
+
+async def on_transaction_receipt(
+    chain_id: IntChainId, tx_hash: str, receipt: Optional[dict]
+) -> None:
+    pending_requests = TransactionRequests.objects.filter(
+        pending_tx_hash=tx_hash, state=TransactionStates.PROCESSING
+    )
+    try:
+        conversation_id = await pending_requests.values_list(
+            "conversation_id", flat=True
+        ).aget()
     except TransactionRequests.DoesNotExist:
-        raise ValueError("No pending transaction found for conversation")
-    except TransactionRequests.MultipleObjectsReturned:
-        raise ValueError("Multiple pending transactions found for conversation")
+        return
+
+    # Read again under the lock, a turn may have changed the conversation meanwhile
+    async with conversation_locks.hold(conversation_id):
+        try:
+            transaction_request = await pending_requests.select_related(
+                "conversation"
+            ).aget()
+        except TransactionRequests.DoesNotExist:
+            return
+
+        await advance_transaction_request(transaction_request, receipt)
+
+
+receipt_watcher.add_listener(on_transaction_receipt)
+
+
+async def watch_pending_transactions() -> None:
+    """
+    Watches the hashes submitted before this process started again, the watcher only
+    keeps them in memory. Their flows then advance through `on_transaction_receipt`.
+    """
+    async for chain_id, tx_hash in TransactionRequests.objects.filter(
+        state=TransactionStates.PROCESSING, pending_tx_hash__isnull=False
+    ).values_list("chain_id", "pending_tx_hash"):
+        receipt_watcher.watch(IntChainId(chain_id), tx_hash)
+        incr("receipt_watcher.rewatched")
+
+
+async def advance_transaction_request(
+    transaction_request: TransactionRequests, receipt: Optional[dict]
+) -> None:
+    """Moves the flow to its next step, or fails it, once the pending transaction is mined"""
+    conversation = transaction_request.conversation
+    signed_tx_hash = transaction_request.pending_tx_hash
+    transaction_request.pending_tx_hash = None
 
     transaction_request.transaction_details = None
     content = None
-    if transaction_request.flow == TransactionFlows.SWAP:
+    if not is_receipt_successful(receipt):
+        transaction_request.state = TransactionStates.FAILED
+        transaction_request.failed_reason = (
+            "Transaction reverted"
+            if receipt is not None
+            else "Transaction was not mined in time"
+        )
+        content = f"transaction failed: {transaction_request.failed_reason}"
+    elif transaction_request.flow == TransactionFlows.SWAP:
         from chat.swap_transactions import process_swap_transaction
 
         if transaction_request.step == SwapTransactionSteps.BUILD_SWAP_TX:
@@ -377,12 +572,12 @@ async def submit_signed_transaction(
     elif transaction_request.flow == TransactionFlows.SILO_LENDING_WITHDRAW:
         from chat.silo_lending_txns import process_withdraw_transaction
 
-        if transaction_request.step == SiloLendingWithdrawTxnSteps.WITHDRAW:
+        # Withdrawals of native S end with an optional unwrap step
+        needs_txn_signing = await process_withdraw_transaction(transaction_request)
+        if not needs_txn_signing:
             transaction_request.state = TransactionStates.COMPLETED
             content = f"withdrawal successful"
             transaction_request.step += 1
-        else:
-            await process_withdraw_transaction(transaction_request)
     elif transaction_request.flow == TransactionFlows.STAKE_SONIC:
         from chat.stake_sonic_txn import process_stake_sonic_transaction
 
@@ -392,11 +587,20 @@ async def submit_signed_transaction(
             transaction_request.step += 1
         else:
             await process_stake_sonic_transaction(transaction_request)
+    elif transaction_request.flow == TransactionFlows.SWAP_AND_LEND:
+        from chat.swap_and_lend_txns import process_swap_and_lend_transaction
+
+        if transaction_request.step == SwapAndLendTxnSteps.DEPOSIT:
+            transaction_request.state = TransactionStates.COMPLETED
+            content = f"swap and deposit successful"
+            transaction_request.step += 1
+        else:
+            await process_swap_and_lend_transaction(transaction_request)
     else:
         raise ValueError("Unexpected transaction flow")
 
-    if transaction_request.state == TransactionStates.COMPLETED:
-        assert content is not None, "Content must be set for completed transactions"
+    if transaction_request.state != TransactionStates.PROCESSING:
+        assert content is not None, "Content must be set for finished transactions"
 
         tools_responses = [
             {
@@ -405,22 +609,46 @@ async def submit_signed_transaction(
             }
         ]
         transaction_request.signed_tx_hash = signed_tx_hash
-        transaction_request.tool_call_id = conversation.messages[-1]["tool_calls"][0][
-            "id"
-        ]
+        if transaction_request.tool_call_id is None:
+            # Requests created before the tool call id was stored with them
+            transaction_request.tool_call_id = get_last_tool_call_id(
+                conversation.messages
+            )
         conversation.messages.extend(tools_responses)
 
-    # Wrap the transaction.atomic() block in sync_to_async
-    @sync_to_async
-    def save_transaction():
-        with transaction.atomic():
-            conversation.save()
-            transaction_request.save()
+    await asave_atomic(conversation, transaction_request)
 
-    await save_transaction()
 
-    if transaction_request.state == TransactionStates.COMPLETED:
-        # Continue the conversation
-        return False
+async def submit_signed_permit(conversation: Conversation, signature: str) -> bool:
+    """Attach an off-chain Permit2 signature to the pending swap and build the swap transaction"""
+    try:
+        transaction_request = await TransactionRequests.objects.aget(
+            conversation=conversation, state=TransactionStates.PROCESSING
+        )
+    except TransactionRequests.DoesNotExist:
+        raise ValueError("No pending transaction found for conversation")
+    except TransactionRequests.MultipleObjectsReturned:
+        raise ValueError("Multiple pending transactions found for conversation")
 
-    return True
+    if not is_awaiting_permit_signature(transaction_request):
+        raise ValueError("Pending transaction request does not expect a signature")
+
+    typed_data = transaction_request.data["permit2_typed_data"]
+    signer = recover_typed_data_signer(typed_data, signature)
+    if signer.lower() != transaction_request.user_address.lower():
+        raise ValueError("Signature was not made by the user's wallet")
+
+    from chat.swap_transactions import process_swap_transaction
+
+    transaction_request.data["permit2_signature"] = signature
+    return await process_swap_transaction(transaction_request)
+
+
+def is_awaiting_permit_signature(transaction_request: TransactionRequests) -> bool:
+    data = transaction_request.data
+    return (
+        transaction_request.flow == TransactionFlows.SWAP
+        and data.get("approval_mode") == ApprovalModes.PERMIT2
+        and data.get("permit2_typed_data") is not None
+        and data.get("permit2_signature") is None
+    )
@@ -0,0 +1,170 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from aiocache import SimpleMemoryCache
+
+from tools.typing import UserDetails
+
+
+@dataclass
+class LLMTool:
+    name: str
+    description: str
+    parameters: Dict[str, Any]
+    returns: Dict[str, Any] = field(default_factory=dict)
+    # Builds a transaction, the turn ends so the user can sign it
+    ends_turn: bool = False
+    # Seconds a result is reused for the same arguments, `None` runs the tool every time
+    cache_ttl: Optional[float] = None
+    # Results don't depend on who asks, shared by all users
+    cache_global: bool = False
+    # Repeats of a static result point at the earlier tool message instead of copying it
+    result_by_reference: bool = False
+
+    def definition(self) -> dict:
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+                "returns": self.returns,
+            },
+        }
+
+
+def _object(properties: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": {name: {"type": type_} for name, type_ in properties.items()},
+        "required": list(properties),
+    }
+
+
+TOOLS = [
+    LLMTool(
+        name="is_user_wallet_funded",
+        description="Check if the user has funded their wallet.",
+        parameters={},
+        returns={
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "List of funded chains",
+        },
+        # Short, the user may be funding their wallet while asking
+        cache_ttl=15,
+    ),
+    LLMTool(
+        name="get_points_and_gems_details",
+        description="Search the docs of the points and gems airdrop program on Sonic chain.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The user's question about the airdrop",
+                },
+            },
+            "required": ["query"],
+        },
+        returns={
+            "type": "string",
+            "description": "Passages of the points and gems docs relevant to the question",
+        },
+        cache_ttl=3600,
+        cache_global=True,
+        result_by_reference=True,
+    ),
+    LLMTool(
+        name="lend_tokens",
+        description="Builds a transaction to lend tokens.",
+        parameters=_object({"token_symbol": "string", "amount": "number"}),
+        returns={"type": "object", "description": "Lending transaction details"},
+        ends_turn=True,
+    ),
+    LLMTool(
+        name="withdraw_tokens",
+        description="Builds a transaction to withdraw tokens.",
+        parameters=_object({"token_symbol": "string", "amount": "number"}),
+        returns={"type": "object", "description": "Withdrawal transaction details"},
+        ends_turn=True,
+    ),
+    LLMTool(
+        name="withdraw_all_tokens",
+        description="Builds a transaction to withdraw all tokens.",
+        parameters=_object({"token_symbol": "string"}),
+        returns={"type": "object", "description": "Withdrawal transaction details"},
+        ends_turn=True,
+    ),
+    LLMTool(
+        name="swap_tokens",
+        description="Builds a transaction to swap tokens.",
+        parameters=_object(
+            {
+                "input_token_symbol": "string",
+                "input_token_amount": "number",
+                "output_token_symbol": "string",
+            }
+        ),
+        returns={"type": "object", "description": "Swap transaction details"},
+        ends_turn=True,
+    ),
+    LLMTool(
+        name="swap_and_lend_tokens",
+        description="Builds the transactions to swap tokens and lend the swapped tokens, use when the user wants to lend a token they don't hold yet.",
+        parameters=_object(
+            {
+                "input_token_symbol": "string",
+                "input_token_amount": "number",
+                "lend_token_symbol": "string",
+            }
+        ),
+        returns={
+            "type": "object",
+            "description": "Swap and lend transaction details",
+        },
+        ends_turn=True,
+    ),
+    LLMTool(
+        name="stake_sonic",
+        description="Builds a transaction to stake Sonic chains native token `S`.",
+        parameters=_object({"amount": "number"}),
+        returns={"type": "object", "description": "Staking transaction details"},
+        ends_turn=True,
+    ),
+]
+
+TOOLS_BY_NAME = {tool.name: tool for tool in TOOLS}
+TOOL_DEFINITIONS = [tool.definition() for tool in TOOLS]
+
+tool_result_cache = SimpleMemoryCache(namespace="llm_tool_results")
+
+
+def build_tool_cache_key(
+    tool: LLMTool, arguments: dict, user_details: Optional[UserDetails]
+) -> str:
+    """Tool name, the arguments as the model would mean them and the user if results are personal"""
+    normalized = {}
+    for name, value in arguments.items():
+        if isinstance(value, str):
+            value = value.strip().lower()
+        elif isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        normalized[name] = value
+    user = "" if tool.cache_global or user_details is None else user_details.id
+    return f"{tool.name}:{user}:{json.dumps(normalized, sort_keys=True)}"
+
+
+def find_result_reference(
+    messages: list, tool_name: str, content: str
+) -> Optional[str]:
+    """Id of an earlier call of the tool in the transcript that returned the same content"""
+    for message in messages:
+        if (
+            message.get("role") == "tool"
+            and message.get("name") == tool_name
+            and message.get("content") == content
+        ):
+            return message["tool_call_id"]
+    return None
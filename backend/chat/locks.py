@@ -0,0 +1,11 @@
+import os
+
+from tools.locks import KeyedLock
+
+# Only needed with more than one worker process, pins a pooled connection per running turn
+CONVERSATION_ADVISORY_LOCKS = (
+    os.getenv("CONVERSATION_ADVISORY_LOCKS", "false") == "true"
+)
+
+# Serializes everything that mutates a conversation's transcript or its transaction requests
+conversation_locks = KeyedLock("conversation", advisory=CONVERSATION_ADVISORY_LOCKS)
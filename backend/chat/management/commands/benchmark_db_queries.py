@@ -0,0 +1,149 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from chat.typing import TransactionStates
+
+BENCHMARK_USER_PATTERN = "did:privy:bench-%"
+
+BENCHMARK_INDEXES = [
+    "conversation_user_updated_idx",
+    "txn_request_conv_state_idx",
+    "unique_processing_txn_request",
+]
+
+BENCHMARK_QUERIES = {
+    "processing request": (
+        "SELECT id FROM chat_transactionrequests WHERE conversation_id = %s AND state = %s",
+        lambda conversation_id, user_id: [
+            conversation_id,
+            TransactionStates.PROCESSING,
+        ],
+    ),
+    "completed requests": (
+        "SELECT id, tool_call_id FROM chat_transactionrequests WHERE conversation_id = %s AND state = %s",
+        lambda conversation_id, user_id: [conversation_id, TransactionStates.COMPLETED],
+    ),
+    "user conversations": (
+        "SELECT id FROM chat_conversation WHERE user_id = %s ORDER BY updated_at DESC LIMIT 20",
+        lambda conversation_id, user_id: [user_id],
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds synthetic conversations and transaction requests inside a transaction, "
+        "times the hot lookups with and without the chat indexes, then rolls back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--conversations", type=int, default=200_000)
+        parser.add_argument("--requests-per-conversation", type=int, default=10)
+        parser.add_argument("--users", type=int, default=20_000)
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                self.seed(cursor, options)
+                samples = self.sample_keys(cursor, options["iterations"])
+
+                with_indexes = self.run_queries(cursor, samples)
+                # DDL is transactional in postgres, the indexes come back on rollback
+                for index_name in BENCHMARK_INDEXES + self.foreign_key_indexes(cursor):
+                    cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+                without_indexes = self.run_queries(cursor, samples)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'query':<22}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}"
+        )
+        for name in BENCHMARK_QUERIES:
+            before, after = without_indexes[name], with_indexes[name]
+            self.stdout.write(
+                f"{name:<22}{before:>16.3f}{after:>16.3f}{before / max(after, 1e-9):>9.1f}x"
+            )
+
+    def seed(self, cursor, options):
+        conversations = options["conversations"]
+        requests_per_conversation = options["requests_per_conversation"]
+        self.stdout.write(
+            f"Seeding {conversations} conversations and "
+            f"{conversations * requests_per_conversation} transaction requests"
+        )
+
+        started = time.perf_counter()
+        cursor.execute(
+            """
+            INSERT INTO chat_conversation (
+                id, user_id, messages, created_at, updated_at, version
+            )
+            SELECT gen_random_uuid(), 'did:privy:bench-' || (i %% %s), '[]'::jsonb,
+                   now() - i * interval '1 second', now() - i * interval '1 second', 0
+            FROM generate_series(1, %s) AS i
+            """,
+            [options["users"], conversations],
+        )
+        # Every conversation gets one PROCESSING request, the rest are finished
+        cursor.execute(
+            """
+            INSERT INTO chat_transactionrequests (
+                conversation_id, chain_id, user_address, flow, data, state, step,
+                created_at, updated_at, version
+            )
+            SELECT c.id, 146, '0x0000000000000000000000000000000000000000', 0, '{}'::jsonb,
+                   CASE WHEN n = 1 THEN %s WHEN n %% 4 = 0 THEN %s ELSE %s END,
+                   0, now(), now(), 0
+            FROM chat_conversation c, generate_series(1, %s) AS n
+            WHERE c.user_id LIKE %s
+            """,
+            [
+                TransactionStates.PROCESSING,
+                TransactionStates.FAILED,
+                TransactionStates.COMPLETED,
+                requests_per_conversation,
+                BENCHMARK_USER_PATTERN,
+            ],
+        )
+        cursor.execute("ANALYZE chat_conversation")
+        cursor.execute("ANALYZE chat_transactionrequests")
+        self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    def sample_keys(self, cursor, iterations):
+        cursor.execute(
+            "SELECT id, user_id FROM chat_conversation WHERE user_id LIKE %s",
+            [BENCHMARK_USER_PATTERN],
+        )
+        rows = cursor.fetchall()
+        return [random.choice(rows) for _ in range(iterations)]
+
+    def foreign_key_indexes(self, cursor):
+        """
+        Django's automatic indexes on the conversation foreign key, named with a hash,
+        without them the lookups by conversation still use an index
+        """
+        constraints = connection.introspection.get_constraints(
+            cursor, "chat_transactionrequests"
+        )
+        return [
+            name
+            for name, constraint in constraints.items()
+            if constraint["index"]
+            and not constraint["unique"]
+            and constraint["columns"] == ["conversation_id"]
+        ]
+
+    def run_queries(self, cursor, samples):
+        """Mean latency in milliseconds of each query over the sampled keys"""
+        results = {}
+        for name, (sql, get_params) in BENCHMARK_QUERIES.items():
+            started = time.perf_counter()
+            for conversation_id, user_id in samples:
+                cursor.execute(sql, get_params(conversation_id, user_id))
+                cursor.fetchall()
+            results[name] = (time.perf_counter() - started) * 1000 / len(samples)
+        return results
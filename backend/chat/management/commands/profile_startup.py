@@ -0,0 +1,119 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+# Dependencies that should only be imported once a request needs them
+LAZY_MODULES = ["web3", "eth_abi", "eth_account", "groq"]
+
+# Runs in a fresh interpreter so nothing is imported or warm yet
+PROFILE_SCRIPT = """
+import asyncio, json, os, sys, time
+
+started = time.perf_counter()
+import backend.asgi
+result = {
+    "import_seconds": time.perf_counter() - started,
+    "lazy_modules_imported": [m for m in %(lazy_modules)r if m in sys.modules],
+}
+
+if os.environ.get("PROFILE_WARM_UP") == "1":
+    from tools.startup import startup_state
+
+    async def main():
+        app = backend.asgi.app
+        async with app.router.lifespan_context(app):
+            while not startup_state.ready:
+                await asyncio.sleep(0.01)
+            result["ready_seconds"] = time.perf_counter() - started
+            result["warm_up"] = startup_state.status()
+
+    asyncio.run(main())
+
+print(json.dumps(result))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Profiles cold starts of the ASGI app in fresh interpreters: time to import "
+        "`backend.asgi`, the slowest imported packages and, with --warm-up, time until ready"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--warm-up",
+            action="store_true",
+            help="Also run the startup warm up, this calls upstream apis and rpcs",
+        )
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "PROFILE_WARM_UP": "1" if options["warm_up"] else "0"}
+        results = []
+        package_seconds = defaultdict(float)
+        for _ in range(options["runs"]):
+            result, import_times = self.profile_once(env)
+            results.append(result)
+            for package, seconds in import_times.items():
+                package_seconds[package] += seconds / options["runs"]
+
+        import_seconds = [result["import_seconds"] for result in results]
+        self.stdout.write(
+            f"import backend.asgi: median {statistics.median(import_seconds) * 1000:.0f}ms, "
+            f"max {max(import_seconds) * 1000:.0f}ms over {len(results)} runs"
+        )
+        if ready_seconds := [
+            r["ready_seconds"] for r in results if "ready_seconds" in r
+        ]:
+            self.stdout.write(
+                f"cold start to ready: median {statistics.median(ready_seconds) * 1000:.0f}ms"
+            )
+            for name, step in results[-1]["warm_up"]["steps"].items():
+                duration = step.get("duration")
+                duration = f"{duration * 1000:.0f}ms" if duration is not None else "-"
+                self.stdout.write(f"  {name:<20}{step['status']:>10}{duration:>10}")
+
+        if lazy_modules := results[-1]["lazy_modules_imported"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Imported at startup but expected lazily: {', '.join(lazy_modules)}"
+                )
+            )
+
+        self.stdout.write(f"{'package':<30}{'self import time (ms)':>24}")
+        for package, seconds in sorted(
+            package_seconds.items(), key=lambda item: item[1], reverse=True
+        )[: options["top"]]:
+            self.stdout.write(f"{package:<30}{seconds * 1000:>24.1f}")
+
+    def profile_once(self, env):
+        """Result of the profile script and the self import time of each top level package"""
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                PROFILE_SCRIPT % {"lazy_modules": LAZY_MODULES},
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        import_times = defaultdict(float)
+        for line in process.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, _, module = line[len("import time:") :].split("|")
+            import_times[module.strip().split(".")[0]] += int(self_us) / 1e6
+
+        return json.loads(process.stdout.splitlines()[-1]), import_times
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-19 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_transactionrequests_signed_tx_hash_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transactionrequests',
+            name='flow',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Swap'), (1, 'Silo Lending Deposit'), (2, 'Silo Lending Withdraw'), (3, 'Stake Sonic'), (4, 'Swap And Lend')], default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-19 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_alter_transactionrequests_flow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transactionrequests',
+            name='pending_tx_hash',
+            field=models.CharField(max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.7 on 2026-10-19 20:05
+
+from django.db import migrations, models
+
+
+def fail_duplicate_processing_requests(apps, schema_editor):
+    """Only the newest PROCESSING request of a conversation survives the unique constraint"""
+    TransactionRequests = apps.get_model('chat', 'TransactionRequests')
+    seen_conversations = set()
+    duplicates = []
+    for transaction_request in TransactionRequests.objects.filter(state=0).order_by('conversation_id', '-created_at', '-id'):
+        if transaction_request.conversation_id in seen_conversations:
+            duplicates.append(transaction_request.id)
+        seen_conversations.add(transaction_request.conversation_id)
+
+    TransactionRequests.objects.filter(id__in=duplicates).update(
+        state=2, failed_reason='Superseded by a newer transaction request'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0006_transactionrequests_pending_tx_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_processing_requests, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['user_id', '-updated_at'], name='conversation_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactionrequests',
+            index=models.Index(fields=['conversation', 'state'], name='txn_request_conv_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactionrequests',
+            index=models.Index(condition=models.Q(('pending_tx_hash__isnull', False)), fields=['pending_tx_hash'], name='txn_request_pending_hash_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='transactionrequests',
+            constraint=models.UniqueConstraint(condition=models.Q(('state', 0)), fields=('conversation',), name='unique_processing_txn_request'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0007_transactionrequests_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='transactionrequests',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-19 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0009_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('owner', models.CharField(max_length=255, null=True)),
+                ('lease_expires_at', models.DateTimeField(null=True)),
+                ('data', models.JSONField(null=True)),
+                ('refreshed_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
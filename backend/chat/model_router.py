@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+from tools.limiter import NORMAL_PRIORITY, FairLimiter
+from tools.metrics import get_counters, incr
+
+logger = logging.getLogger(__name__)
+
+REASONING_MODEL = "deepseek-r1-distill-llama-70b"
+FAST_MODEL = os.getenv("FAST_MODEL", "llama-3.1-8b-instant")
+
+# Steps of a turn, each served by its own list of models
+TOOL_SELECTION = "tool_selection"
+TOOL_RESULT = "tool_result"
+EXPLANATION = "explanation"
+TOOL_REPAIR = "tool_repair"
+
+# Preferred model first, the rest are tried in order when a call fails
+DEFAULT_ROUTES = {
+    TOOL_SELECTION: [FAST_MODEL, REASONING_MODEL],
+    TOOL_RESULT: [FAST_MODEL, REASONING_MODEL],
+    EXPLANATION: [REASONING_MODEL, FAST_MODEL],
+    TOOL_REPAIR: [FAST_MODEL],
+}
+# eg. MODEL_ROUTES='{"tool_selection": ["llama-3.3-70b-versatile"]}', routing everything
+# to the reasoning model is MODEL_ROUTING=false
+MODEL_ROUTES = {**DEFAULT_ROUTES, **json.loads(os.getenv("MODEL_ROUTES", "{}"))}
+MODEL_ROUTING = os.getenv("MODEL_ROUTING", "true") == "true"
+
+# Completions in flight at once in this worker, more wait in a fair queue per user
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 8))
+# Rate limited requests are retried after the provider's retry-after, everyone waits
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BASE_WAIT = 1
+RATE_LIMIT_MAX_WAIT = 60
+
+# USD per million (input, output) tokens as listed by Groq, only used for the cost counters
+MODEL_PRICES = {
+    "deepseek-r1-distill-llama-70b": (0.75, 0.99),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+# A user asking for one of these usually just needs the right tool call
+ACTION_KEYWORDS = re.compile(
+    r"\b(swap|convert|exchange|trade|buy|sell|lend|deposit|supply|withdraw|stake|fund(ed)?|balance)\b",
+    re.IGNORECASE,
+)
+# Tool results the user wants explained rather than acknowledged
+EXPLAINED_TOOLS = {"get_points_and_gems_details"}
+
+_client = None
+
+
+def get_groq_client():
+    """Created on first use, importing groq is slow and most processes never call the llm"""
+    global _client
+    if _client is None:
+        from groq import AsyncGroq
+
+        _client = AsyncGroq(
+            api_key=os.environ.get("GROQ_API_KEY"),
+        )
+    return _client
+
+
+def get_retry_after(error: Exception, attempt: int) -> float:
+    """Seconds the provider asked us to wait, exponential backoff when it didn't say"""
+    response = getattr(error, "response", None)
+    headers = response.headers if response is not None else {}
+    try:
+        if "retry-after-ms" in headers:
+            return min(float(headers["retry-after-ms"]) / 1000, RATE_LIMIT_MAX_WAIT)
+        if "retry-after" in headers:
+            return min(float(headers["retry-after"]), RATE_LIMIT_MAX_WAIT)
+    except ValueError:
+        pass
+    return min(RATE_LIMIT_BASE_WAIT * 2**attempt, RATE_LIMIT_MAX_WAIT)
+
+
+def select_route(messages: List[dict]) -> str:
+    """Step the next completion serves, judged from the end of the transcript"""
+    last_message = messages[-1]
+    if last_message["role"] == "tool":
+        for message in reversed(messages):
+            if message["role"] != "tool":
+                break
+            if message.get("name") in EXPLAINED_TOOLS:
+                return EXPLANATION
+        return TOOL_RESULT
+
+    if last_message["role"] == "user" and ACTION_KEYWORDS.search(
+        last_message.get("content") or ""
+    ):
+        return TOOL_SELECTION
+
+    return EXPLANATION
+
+
+class ModelRouter:
+    """
+    Sends each completion to the models of its route, falling back to the next one on
+    errors. Latency, token and cost counters are kept per route and model.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, List[str]],
+        enabled: bool = True,
+        limiter: Optional[FairLimiter] = None,
+    ):
+        self.routes = routes
+        self.enabled = enabled
+        self.limiter = limiter or FairLimiter("llm", LLM_CONCURRENCY)
+
+    def get_models(self, route: str) -> List[str]:
+        if not self.enabled:
+            return [REASONING_MODEL]
+        return self.routes.get(route) or [REASONING_MODEL]
+
+    async def complete(
+        self,
+        route: str,
+        queue_key: str = "",
+        priority: int = NORMAL_PRIORITY,
+        **kwargs,
+    ):
+        """
+        Completion from the first model of the route that answers. `queue_key` (eg. the
+        user) and `priority` decide the place in the queue when the limiter is full.
+        """
+        models = self.get_models(route)
+        for index, model in enumerate(models):
+            started = time.perf_counter()
+            try:
+                completion = await self.create(
+                    route, model, queue_key, priority, **kwargs
+                )
+            except Exception as e:
+                incr(f"llm.{route}.{model}.errors")
+                if index == len(models) - 1:
+                    raise
+                incr(f"llm.{route}.fallbacks")
+                logger.warning(f"{model} failed for {route}, falling back: {e!r}")
+                continue
+
+            self.record(route, model, time.perf_counter() - started, completion.usage)
+            return completion
+
+    async def create(
+        self, route: str, model: str, queue_key: str, priority: int, **kwargs
+    ):
+        from groq import RateLimitError
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            async with self.limiter.hold(queue_key, priority):
+                try:
+                    return await get_groq_client().chat.completions.create(
+                        model=model, **kwargs
+                    )
+                except RateLimitError as e:
+                    if attempt == RATE_LIMIT_RETRIES:
+                        raise
+                    retry_after = get_retry_after(e, attempt)
+                    incr(f"llm.{route}.{model}.rate_limited")
+                    logger.warning(f"{model} rate limited, retrying in {retry_after}s")
+                    # Holds back every queued request, not just this one
+                    self.limiter.pause(retry_after)
+
+    def record(self, route: str, model: str, duration: float, usage) -> None:
+        prefix = f"llm.{route}.{model}"
+        incr(f"{prefix}.calls")
+        incr(f"{prefix}.latency_ms", duration * 1000)
+        if usage is None:
+            return
+
+        incr(f"{prefix}.prompt_tokens", usage.prompt_tokens)
+        incr(f"{prefix}.completion_tokens", usage.completion_tokens)
+        if price := MODEL_PRICES.get(model):
+            cost = (
+                usage.prompt_tokens * price[0] + usage.completion_tokens * price[1]
+            ) / 1e6
+            incr(f"{prefix}.cost_usd", cost)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Counters grouped by "route.model", with the mean latency of each"""
+        stats: Dict[str, Dict[str, float]] = {}
+        for name, value in get_counters("llm.").items():
+            key, _, metric = name[len("llm.") :].rpartition(".")
+            stats.setdefault(key, {})[metric] = value
+
+        for values in stats.values():
+            if values.get("calls"):
+                values["mean_latency_ms"] = values["latency_ms"] / values["calls"]
+        return stats
+
+
+model_router = ModelRouter(MODEL_ROUTES, enabled=MODEL_ROUTING)
@@ -2,23 +2,30 @@ import uuid
 
 from django.db import models
 
-from tools.app_model import AppModel
+from tools.app_model import AppModel, VersionedModel
 from chaindata.constants import IntChainId
 from chat.typing import SwapTransactionSteps, TransactionFlows, TransactionStates
 
 
-class Conversation(AppModel):
+class Conversation(VersionedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user_id = models.CharField(max_length=255)
     messages = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user_id", "-updated_at"], name="conversation_user_updated_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Conversation {self.id}"
 
 
-class TransactionRequests(AppModel):
+class TransactionRequests(VersionedModel):
     conversation = models.ForeignKey(
         Conversation, on_delete=models.DO_NOTHING, related_name="transaction_requests"
     )
@@ -45,6 +52,64 @@ class TransactionRequests(AppModel):
     transaction_details = models.JSONField(null=True)
     tool_call_id = models.CharField(max_length=255, null=True)
     signed_tx_hash = models.CharField(max_length=255, null=True)
+    # Hash of the last submitted transaction that is waiting to be mined
+    pending_tx_hash = models.CharField(max_length=255, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["conversation", "state"], name="txn_request_conv_state_idx"
+            ),
+            models.Index(
+                fields=["pending_tx_hash"],
+                condition=models.Q(pending_tx_hash__isnull=False),
+                name="txn_request_pending_hash_idx",
+            ),
+        ]
+        constraints = [
+            # A conversation has at most one transaction flow in progress
+            models.UniqueConstraint(
+                fields=["conversation"],
+                condition=models.Q(state=TransactionStates.PROCESSING),
+                name="unique_processing_txn_request",
+            ),
+        ]
 
     def __str__(self):
         return f"TransactionRequest {self.id}"
+
+
+class IdempotencyKey(AppModel):
+    """Response of a request made with an `Idempotency-Key` header, replayed to retries"""
+
+    # Endpoint and the resource it acts on, eg. "process_messages:<conversation id>"
+    scope = models.CharField(max_length=255)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    # Null while the request is executing
+    response = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "key"], name="unique_idempotency_key"
+            ),
+        ]
+
+    def __str__(self):
+        return f"IdempotencyKey {self.scope} {self.key}"
+
+
+class ScheduledJob(AppModel):
+    """Lease and latest result of a scheduled refresh job shared by all workers"""
+
+    name = models.CharField(max_length=100, primary_key=True)
+    # Worker currently refreshing the job
+    owner = models.CharField(max_length=255, null=True)
+    lease_expires_at = models.DateTimeField(null=True)
+    data = models.JSONField(null=True)
+    refreshed_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"ScheduledJob {self.name}"
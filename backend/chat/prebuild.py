@@ -0,0 +1,152 @@
+import logging
+from typing import Awaitable, Callable, Dict
+
+from chaindata.constants import (
+    ODOS_ROUTER_SPENDER_ADDRESS,
+    PERMIT2_ADDRESS,
+    SILO_ROUTER_V2_ADDRESS,
+    IntChainId,
+)
+from chaindata.evm.token_lists import get_token_addresses_from_symbols
+from chaindata.evm.token_metadata import get_token_metadata
+from chaindata.odos import build_swap_transaction
+from chat.intent_parser import find_intent
+from chat.silo_lending_txns import get_best_lending_vault
+from chat.txn_builder import check_and_build_allowance, has_sufficient_allowance
+from tools.speculation import Speculation
+
+logger = logging.getLogger(__name__)
+
+# The calls started here must use the exact arguments the transaction builders pass,
+# anything else is never claimed and just discarded. The swap quote is only claimed when
+# the swap is built in the same turn, with native input or an existing router allowance.
+# Permit2 swaps are assembled once the signature arrives and swaps that need an approval
+# once it is mined, both after the speculation is discarded.
+
+
+async def get_decimals(token_address: str) -> int:
+    metadata = (await get_token_metadata([token_address])).get(token_address)
+    return metadata.decimals if metadata else 18
+
+
+async def prebuild_swap(
+    speculation: Speculation,
+    user_address: str,
+    input_token_symbol: str,
+    input_token_amount: float,
+    output_token_symbol: str,
+) -> None:
+    addresses = await get_token_addresses_from_symbols(
+        [input_token_symbol, output_token_symbol]
+    )
+    input_token_address = addresses[input_token_symbol]
+    decimals = await get_decimals(input_token_address)
+
+    router_allowance = speculation.start(
+        has_sufficient_allowance,
+        input_token_address,
+        user_address,
+        ODOS_ROUTER_SPENDER_ADDRESS,
+        input_token_amount,
+        decimals,
+    )
+    speculation.start(
+        has_sufficient_allowance,
+        input_token_address,
+        user_address,
+        PERMIT2_ADDRESS,
+        input_token_amount,
+        decimals,
+    )
+    speculation.start_after(
+        router_allowance,
+        build_swap_transaction,
+        IntChainId.Sonic,
+        input_token_address,
+        input_token_amount * 10**decimals,
+        addresses[output_token_symbol],
+        user_address,
+    )
+
+
+async def prebuild_lend(
+    speculation: Speculation,
+    user_address: str,
+    token_symbol: str,
+    amount: float,
+) -> None:
+    addresses = await get_token_addresses_from_symbols([token_symbol])
+    token_address = addresses[token_symbol]
+
+    speculation.start(get_best_lending_vault, token_address)
+    speculation.start(
+        check_and_build_allowance,
+        token_address,
+        user_address,
+        SILO_ROUTER_V2_ADDRESS,
+        amount,
+        await get_decimals(token_address),
+        token_symbol,
+    )
+
+
+async def prebuild_swap_and_lend(
+    speculation: Speculation,
+    user_address: str,
+    input_token_symbol: str,
+    input_token_amount: float,
+    lend_token_symbol: str,
+) -> None:
+    addresses = await get_token_addresses_from_symbols(
+        [input_token_symbol, lend_token_symbol]
+    )
+    input_token_address = addresses[input_token_symbol]
+    lend_token_address = addresses[lend_token_symbol]
+    decimals = await get_decimals(input_token_address)
+
+    speculation.start(get_best_lending_vault, lend_token_address)
+    swap_approval = speculation.start(
+        check_and_build_allowance,
+        input_token_address,
+        user_address,
+        ODOS_ROUTER_SPENDER_ADDRESS,
+        input_token_amount,
+        decimals,
+        input_token_symbol,
+    )
+    speculation.start_after(
+        swap_approval,
+        build_swap_transaction,
+        IntChainId.Sonic,
+        input_token_address,
+        input_token_amount * 10**decimals,
+        lend_token_address,
+        user_address,
+        # No approval transaction to sign first
+        when=lambda approval: approval is None,
+    )
+
+
+PREBUILDERS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "swap_tokens": prebuild_swap,
+    "lend_tokens": prebuild_lend,
+    "swap_and_lend_tokens": prebuild_swap_and_lend,
+}
+
+
+async def start_prebuild(
+    speculation: Speculation, message: str, user_address: str
+) -> None:
+    """
+    Starts the allowance checks, swap quote and vault selection of the transaction the
+    message most likely asks for, so they run while the llm is choosing its tool call.
+    """
+    try:
+        intent = await find_intent(message)
+        if intent is not None and intent.name in PREBUILDERS:
+            await PREBUILDERS[intent.name](
+                speculation, user_address, **intent.arguments
+            )
+    except Exception as e:
+        # Only an optimization, the tool call does the work itself
+        logger.warning(f"Couldn't start prebuilding for {message!r}: {e!r}")
@@ -0,0 +1,71 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from tools.metrics import get_counters, incr
+
+# Rough size of a token in serialized prompt text, only used for the accounting
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """
+    System message and tool schemas sent at the start of every completion. The same
+    objects are reused for every request so they serialize to the same bytes, which is
+    what provider side prompt caching keys on.
+    """
+
+    system_message: dict
+    tools: List[dict]
+    hash: str
+    estimated_tokens: int
+
+
+_PREFIXES: Dict[Tuple[str, int], PromptPrefix] = {}
+
+
+def get_prompt_prefix(system_prompt: str, tools: List[dict]) -> PromptPrefix:
+    key = (system_prompt, id(tools))
+    if key not in _PREFIXES:
+        system_message = {"role": "system", "content": system_prompt}
+        serialized = json.dumps([system_message, tools], separators=(",", ":"))
+        _PREFIXES[key] = PromptPrefix(
+            system_message=system_message,
+            tools=tools,
+            hash=hashlib.sha256(serialized.encode()).hexdigest()[:12],
+            estimated_tokens=len(serialized) // CHARS_PER_TOKEN,
+        )
+    return _PREFIXES[key]
+
+
+def record_prefix_usage(prefix: PromptPrefix, usage) -> None:
+    """Prompt tokens of a completion split into the shared prefix and the conversation"""
+    incr(f"prompt_prefix.{prefix.hash}.completions")
+    if usage is None:
+        return
+
+    prefix_tokens = min(prefix.estimated_tokens, usage.prompt_tokens)
+    incr("prompt_prefix.prefix_tokens", prefix_tokens)
+    incr("prompt_prefix.fresh_tokens", usage.prompt_tokens - prefix_tokens)
+
+    # Reported by the provider when its prompt cache served part of the prompt
+    details = getattr(usage, "prompt_tokens_details", None)
+    if cached_tokens := getattr(details, "cached_tokens", None):
+        incr("prompt_prefix.provider_cached_tokens", cached_tokens)
+
+
+def prompt_prefix_stats() -> Dict[str, float]:
+    """Prefix token counters and the share of prompt tokens that were the shared prefix"""
+    stats = {
+        name[len("prompt_prefix.") :]: value
+        for name, value in get_counters("prompt_prefix.").items()
+    }
+    prompt_tokens = stats.get("prefix_tokens", 0) + stats.get("fresh_tokens", 0)
+    if prompt_tokens:
+        stats["prefix_share"] = stats.get("prefix_tokens", 0) / prompt_tokens
+        stats["provider_cached_share"] = (
+            stats.get("provider_cached_tokens", 0) / prompt_tokens
+        )
+    return stats
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from chat.models import Conversation, TransactionRequests
+from tools.response_cache import ResponseCache
+
+# Read responses scoped by conversation id
+conversation_response_cache = ResponseCache()
+
+
+@receiver(post_save, sender=Conversation)
+def invalidate_conversation(sender, instance: Conversation, **kwargs):
+    conversation_response_cache.invalidate(str(instance.id))
+
+
+@receiver(post_save, sender=TransactionRequests)
+def invalidate_transaction_request(sender, instance: TransactionRequests, **kwargs):
+    conversation_response_cache.invalidate(str(instance.conversation_id))
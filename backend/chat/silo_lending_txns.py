@@ -1,18 +1,21 @@
 import asyncio
-from typing import Optional
-from aiocache import cached
+from typing import Dict, List, Optional
 from collections import defaultdict
 
-from eth_abi import encode
 
 from tools.dictionary import get_from_dict
 from tools.http import req_post
+from tools.speculation import speculated
 from chat.txn_builder import (
     build_transaction_request,
+    build_unwrap_native_transaction,
     check_and_build_allowance,
+    run_transaction_steps,
     validate_token,
 )
+from chaindata.evm.contracts import get_contract
 from chaindata.evm.utils import get_w3
+from chaindata.evm.gas import build_transaction
 from chaindata.evm.constants import ABI
 from chaindata.evm.token_metadata import get_token_metadata
 from chat.models import Conversation, TransactionRequests
@@ -31,6 +34,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Used only when gas estimation fails and no gas profile of the method is cached yet,
+# eg. a deposit built before its approval is mined
+FALLBACK_DEPOSIT_GAS = 500000
+FALLBACK_WITHDRAW_GAS = 350000
+
+# Kept warm by the `silo_markets` and `silo_vaults_by_token` jobs
+_SILO_MARKETS: Optional[List[Dict]] = None
+_VAULTS_BY_TOKEN: Optional[Dict[str, List[str]]] = None
+
 
 async def withdraw_all_tokens(
     conversation: Conversation,
@@ -108,10 +120,17 @@ async def process_withdraw_transaction(
         NOTE: The router contract of Silo V2 does not support this unwrapping and just withdraws WS to the user.
         eg tx: https://sonicscan.org/tx/0x0e1b969c97afbd924d48d9f171235e2bce2140f87bc408ee648f137e6808f508
 
-        TODO: Maybe automatically add a step to unwrap the token?
+        An UNWRAP step is added after the withdrawal to convert WS back to S.
         """
         token_address = WRAPPED_SONIC_ADDRESS
 
+    if transaction_request.step >= SiloLendingWithdrawTxnSteps.WITHDRAW:
+        # Withdrawal is done, the vault balance is gone so only the unwrap step can be left
+        return await run_transaction_steps(
+            transaction_request,
+            [(SiloLendingWithdrawTxnSteps.UNWRAP, build_unwrap_step)],
+        )
+
     token_metadata = await get_token_metadata([token_address])
     if metadata := token_metadata.get(token_address):
         token_decimals = metadata.decimals
@@ -119,7 +138,6 @@ async def process_withdraw_transaction(
         logger.warning(f"Token {token_address} not found in token metadata")
         token_decimals = 18
 
-    # TODO: load `get_vaults_by_token` on bootup and cache it
     vaults_by_token = await get_vaults_by_token()
     vaults_to_check_for_assets = vaults_by_token.get(token_address) or []
 
@@ -140,26 +158,54 @@ async def process_withdraw_transaction(
     if lending_vault is None:
         return False
 
-    if transaction_request.step < SiloLendingWithdrawTxnSteps.WITHDRAW:
-        if amount is None:
-            return await handle_max_withdraw_step(
-                transaction_request,
-                lending_vault,
-                token_symbol,
-                user_address,
-            )
-        else:
-            return await handle_withdraw_step(
-                transaction_request,
-                lending_vault,
-                token_address,
-                amount,
-                token_symbol,
-                token_decimals,
-                user_address,
-            )
+    if amount is None:
+        return await handle_max_withdraw_step(
+            transaction_request,
+            lending_vault,
+            token_symbol,
+            user_address,
+        )
+    else:
+        return await handle_withdraw_step(
+            transaction_request,
+            lending_vault,
+            token_address,
+            amount,
+            token_symbol,
+            token_decimals,
+            user_address,
+        )
+
 
-    return False
+async def build_unwrap_step(transaction_request: TransactionRequests) -> dict | None:
+    """Unwraps the WS received from a withdrawal of native S"""
+    if (
+        transaction_request.data.get("token_address")
+        != SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS
+    ):
+        return None
+
+    user_address = transaction_request.user_address
+    w3 = await get_w3(IntChainId.Sonic)
+    wrapped_balance = await (
+        get_contract(w3, WRAPPED_SONIC_ADDRESS, ABI.WRAPPED_NATIVE)
+        .functions.balanceOf(user_address)
+        .call()
+    )
+    # Never unwrap more than the withdrawal returned, the user might hold WS of their own
+    amount_in_wei = min(
+        wrapped_balance, transaction_request.data.get("withdrawn_amount_in_wei", 0)
+    )
+    if amount_in_wei <= 0:
+        return None
+
+    txn = await build_unwrap_native_transaction(
+        IntChainId.Sonic, user_address, WRAPPED_SONIC_ADDRESS, amount_in_wei
+    )
+    return {
+        "transaction": txn,
+        "description": f"Unwrapping {amount_in_wei / 10**18} WS to S",
+    }
 
 
 async def process_lend_transaction(transaction_request: TransactionRequests) -> bool:
@@ -177,7 +223,7 @@ async def process_lend_transaction(transaction_request: TransactionRequests) ->
         logger.warning(f"Token {token_address} not found in token metadata")
         token_decimals = 18
 
-    lending_vault = await get_best_lending_vault(token_address)
+    lending_vault = await speculated(get_best_lending_vault, token_address)
     if lending_vault is None:
         return False
 
@@ -220,7 +266,8 @@ async def handle_approval_step(
     """Handles the approval step of the lending transaction"""
     transaction_request.step = SiloLendingDepositTxnSteps.APPROVAL
 
-    transaction_details = await check_and_build_allowance(
+    transaction_details = await speculated(
+        check_and_build_allowance,
         token_address,
         user_address,
         SILO_ROUTER_V2_ADDRESS,
@@ -250,33 +297,10 @@ async def handle_lend_step(
     """Handles the lending step of the transaction"""
     transaction_request.step = SiloLendingDepositTxnSteps.DEPOSIT
 
-    w3 = await get_w3(IntChainId.Sonic)
-    contract = w3.eth.contract(address=SILO_ROUTER_V2_ADDRESS, abi=ABI.SILO_ROUTER_ABI)
-
-    # options is a hex string of `amount` + `collateral type` (1) for active lending collateral accruing interest
-    collateral_type = 1
     amount_in_wei = int(amount * 10**token_decimals)
-    encoded = encode(["uint256", "uint8"], [amount_in_wei, collateral_type])
-    options = "0x" + encoded.hex()
-
-    value_dict = {}
-    if token_address == SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS:
-        value_dict["value"] = amount_in_wei
-
-    txn = await contract.functions.execute(
-        [
-            {
-                "actionType": 0,
-                "silo": lending_vault,
-                "asset": (
-                    token_address
-                    if token_address != SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS
-                    else WRAPPED_SONIC_ADDRESS
-                ),
-                "options": options,
-            }
-        ],
-    ).build_transaction({"from": user_address, "gas": 500000, **value_dict})
+    txn = await build_deposit_transaction(
+        lending_vault, token_address, amount_in_wei, user_address
+    )
 
     transaction_details = {
         "transaction": txn,
@@ -288,6 +312,60 @@ async def handle_lend_step(
     return True
 
 
+def build_deposit_action(
+    lending_vault: str, token_address: str, amount_in_wei: int
+) -> dict:
+    """Silo router `Deposit` action, native S is wrapped by the router from `msg.value`"""
+    from eth_abi import encode
+
+    # options is a hex string of `amount` + `collateral type` (1) for active lending collateral accruing interest
+    collateral_type = 1
+    encoded = encode(["uint256", "uint8"], [amount_in_wei, collateral_type])
+
+    return {
+        "actionType": 0,
+        "silo": lending_vault,
+        "asset": (
+            token_address
+            if token_address != SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS
+            else WRAPPED_SONIC_ADDRESS
+        ),
+        "options": "0x" + encoded.hex(),
+    }
+
+
+async def build_router_execute_transaction(
+    actions: List[dict], user_address: str, value: int = 0
+) -> dict:
+    """Batches any number of router actions into one `execute` transaction"""
+    w3 = await get_w3(IntChainId.Sonic)
+    contract = get_contract(w3, SILO_ROUTER_V2_ADDRESS, ABI.SILO_ROUTER_ABI)
+
+    value_dict = {}
+    if value:
+        value_dict["value"] = value
+
+    return await build_transaction(
+        contract.functions.execute(actions),
+        {"from": user_address, **value_dict},
+        fallback_gas=FALLBACK_DEPOSIT_GAS,
+    )
+
+
+async def build_deposit_transaction(
+    lending_vault: str, token_address: str, amount_in_wei: int, user_address: str
+) -> dict:
+    value = 0
+    if token_address == SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS:
+        value = amount_in_wei
+
+    return await build_router_execute_transaction(
+        [build_deposit_action(lending_vault, token_address, amount_in_wei)],
+        user_address,
+        value,
+    )
+
+
 async def handle_withdraw_step(
     transaction_request: TransactionRequests,
     lending_vault: str,
@@ -301,17 +379,15 @@ async def handle_withdraw_step(
     transaction_request.step = SiloLendingWithdrawTxnSteps.WITHDRAW
 
     w3 = await get_w3(IntChainId.Sonic)
-    contract = w3.eth.contract(address=lending_vault, abi=ABI.SILO)
+    contract = get_contract(w3, lending_vault, ABI.SILO)
 
     amount_in_wei = int(amount * 10**token_decimals)
+    transaction_request.data["withdrawn_amount_in_wei"] = amount_in_wei
 
-    txn = await contract.functions.withdraw(
-        amount_in_wei, user_address, user_address
-    ).build_transaction(
-        {
-            "from": user_address,
-            "gas": 350000,  # Set a higher minimum gas limit with ~40% buffer
-        }
+    txn = await build_transaction(
+        contract.functions.withdraw(amount_in_wei, user_address, user_address),
+        {"from": user_address},
+        fallback_gas=FALLBACK_WITHDRAW_GAS,
     )
 
     transaction_details = {
@@ -335,16 +411,18 @@ async def handle_max_withdraw_step(
     transaction_request.step = SiloLendingWithdrawTxnSteps.WITHDRAW
 
     w3 = await get_w3(IntChainId.Sonic)
-    contract = w3.eth.contract(address=lending_vault, abi=ABI.SILO)
+    contract = get_contract(w3, lending_vault, ABI.SILO)
 
     max_shares = await contract.functions.maxRedeem(user_address).call()
-    txn = await contract.functions.redeem(
-        max_shares, user_address, user_address
-    ).build_transaction(
-        {
-            "from": user_address,
-            "gas": 350000,  # Set a higher minimum gas limit with ~40% buffer
-        }
+    transaction_request.data["withdrawn_amount_in_wei"] = (
+        await contract.get_function_by_signature("previewRedeem(uint256)")(
+            max_shares
+        ).call()
+    )
+    txn = await build_transaction(
+        contract.functions.redeem(max_shares, user_address, user_address),
+        {"from": user_address},
+        fallback_gas=FALLBACK_WITHDRAW_GAS,
     )
 
     transaction_details = {
@@ -358,7 +436,18 @@ async def handle_max_withdraw_step(
     return True
 
 
-async def get_silo_markets():
+async def get_silo_markets() -> List[Dict]:
+    if _SILO_MARKETS is None:
+        set_silo_markets(await fetch_silo_markets())
+    return _SILO_MARKETS
+
+
+def set_silo_markets(markets: List[Dict]) -> None:
+    global _SILO_MARKETS
+    _SILO_MARKETS = markets
+
+
+async def fetch_silo_markets() -> List[Dict]:
     return await req_post(
         "https://v2.silo.finance/api/display-markets-v2",
         {
@@ -411,8 +500,18 @@ async def get_best_lending_vault(token_address: str):
     return None
 
 
-@cached(ttl=7 * 86400, namespace="silo_vaults")  # 1 week with specific namespace
-async def get_vaults_by_token():
+async def get_vaults_by_token() -> Dict[str, List[str]]:
+    if _VAULTS_BY_TOKEN is None:
+        set_vaults_by_token(await fetch_vaults_by_token())
+    return _VAULTS_BY_TOKEN
+
+
+def set_vaults_by_token(vaults_by_token: Dict[str, List[str]]) -> None:
+    global _VAULTS_BY_TOKEN
+    _VAULTS_BY_TOKEN = vaults_by_token
+
+
+async def fetch_vaults_by_token() -> Dict[str, List[str]]:
     silo_config_addresses = set()
     markets = await get_silo_markets()
     for market in markets:
@@ -433,15 +532,14 @@ async def get_vaults_by_token():
     for vault, asset_address in zip(all_vault_addresses, asset_addresses):
         vaults_by_token[asset_address].add(vault)
 
-    return vaults_by_token
+    # Lists so the result can be stored as a job snapshot
+    return {token: sorted(vaults) for token, vaults in vaults_by_token.items()}
 
 
 async def get_silo_vaults(config_address: str):
     w3 = await get_w3(IntChainId.Sonic)
     silo_vaults = await (
-        w3.eth.contract(address=config_address, abi=ABI.SILO_CONFIG)
-        .functions.getSilos()
-        .call()
+        get_contract(w3, config_address, ABI.SILO_CONFIG).functions.getSilos().call()
     )
 
     return silo_vaults
@@ -449,14 +547,10 @@ async def get_silo_vaults(config_address: str):
 
 async def get_asset_address_from_vault(vault_address: str):
     w3 = await get_w3(IntChainId.Sonic)
-    return (
-        await w3.eth.contract(address=vault_address, abi=ABI.SILO)
-        .functions.asset()
-        .call()
-    )
+    return await get_contract(w3, vault_address, ABI.SILO).functions.asset().call()
 
 
 async def get_user_balance_in_vault(vault_address: str, user_address: str):
     w3 = await get_w3(IntChainId.Sonic)
-    contract = w3.eth.contract(address=vault_address, abi=ABI.SILO)
+    contract = get_contract(w3, vault_address, ABI.SILO)
     return await contract.functions.balanceOf(user_address).call()
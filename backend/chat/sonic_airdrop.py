@@ -1,9 +1,87 @@
-def get_points_and_gems_details():
-    return f"""
-{get_points_details()}
-
-{get_gems_details()}
-"""
+import os
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+from tools.bm25 import BM25Index
+
+AIRDROP_SEARCH_TOP_K = int(os.getenv("AIRDROP_SEARCH_TOP_K", 3))
+# Passages scoring below this share of the best one only add tokens
+MIN_RELATIVE_SCORE = 0.3
+# Sections longer than this are split between paragraphs
+MAX_PASSAGE_CHARS = 1200
+
+
+def get_points_and_gems_details(query: str = "") -> str:
+    """Passages of the airdrop docs relevant to the question instead of the whole ~10 KB"""
+    passages = get_airdrop_passages()
+    hits = get_airdrop_index().search(query, AIRDROP_SEARCH_TOP_K)
+    if hits:
+        best_score = hits[0][1]
+        # Keep document order, reads better than score order for adjacent passages
+        selected = sorted(
+            index for index, score in hits if score >= best_score * MIN_RELATIVE_SCORE
+        )
+    else:
+        # Nothing specific asked, the overviews of points and gems
+        selected = [
+            index
+            for index, (title, _) in enumerate(passages)
+            if title.endswith("> Overview")
+        ]
+
+    return "\n\n---\n\n".join(
+        f"[{passages[index][0]}]\n{passages[index][1]}" for index in selected
+    )
+
+
+@lru_cache(maxsize=None)
+def get_airdrop_index() -> BM25Index:
+    # Titles are indexed too, they carry the words questions are usually phrased with
+    return BM25Index([f"{title}\n{text}" for title, text in get_airdrop_passages()])
+
+
+@lru_cache(maxsize=None)
+def get_airdrop_passages() -> List[Tuple[str, str]]:
+    return chunk_document("Sonic Points", get_points_details()) + chunk_document(
+        "Sonic Gems", get_gems_details()
+    )
+
+
+def chunk_document(document_title: str, text: str) -> List[Tuple[str, str]]:
+    """
+    (title, passage) pairs of a doc, split at the sections listed in its "— Section"
+    table of contents. The text before the first section is the overview.
+    """
+    lines = text.strip().splitlines()
+    toc = {line.strip("— ").strip() for line in lines if line.strip().startswith("—")}
+
+    sections = [("Overview", [])]
+    for line in lines:
+        if line.strip().startswith("—"):
+            continue
+        if line.strip() in toc:
+            sections.append((line.strip(), []))
+        else:
+            sections[-1][1].append(line)
+
+    passages = []
+    for section_title, section_lines in sections:
+        paragraphs = [
+            paragraph.strip()
+            for paragraph in re.split(r"\n\s*\n", "\n".join(section_lines))
+            if paragraph.strip()
+        ]
+        chunk = ""
+        for paragraph in paragraphs:
+            if chunk and len(chunk) + len(paragraph) > MAX_PASSAGE_CHARS:
+                passages.append((f"{document_title} > {section_title}", chunk))
+                chunk = ""
+            chunk = f"{chunk}\n\n{paragraph}" if chunk else paragraph
+        if chunk:
+            passages.append((f"{document_title} > {section_title}", chunk))
+
+    return passages
 
 
 def get_points_details():
@@ -2,7 +2,9 @@ from chaindata.evm.token_metadata import get_sonic_token_metadata
 from chat.txn_builder import build_transaction_request
 from chat.typing import SonicStakeTxnSteps, TransactionFlows
 from chaindata.constants import IntChainId
+from chaindata.evm.contracts import get_contract
 from chaindata.evm.utils import get_w3
+from chaindata.evm.gas import build_transaction
 from chaindata.evm.constants import ABI
 from chat.models import Conversation, TransactionRequests
 
@@ -58,15 +60,14 @@ async def process_stake_sonic_transaction(
         transaction_request.step = SonicStakeTxnSteps.STAKE
 
         w3 = await get_w3(IntChainId.Sonic)
-        contract = w3.eth.contract(address=SONIC_FORWARD_PROXY_CONTRACT, abi=ABI.SFC)
+        contract = get_contract(w3, SONIC_FORWARD_PROXY_CONTRACT, ABI.SFC)
 
-        txn = await contract.functions.delegate(
-            TOP_SELF_STAKE_VALIDATOR_ID
-        ).build_transaction(
+        txn = await build_transaction(
+            contract.functions.delegate(TOP_SELF_STAKE_VALIDATOR_ID),
             {
                 "from": user_address,
                 "value": decimal_adjusted_amount,
-            }
+            },
         )
 
         transaction_request.transaction_details = {
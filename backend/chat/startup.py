@@ -0,0 +1,40 @@
+import asyncio
+
+from chaindata.constants import ACTIVE_CHAINS, IntChainId
+from chaindata.evm.contracts import preload_contract_factories
+from chaindata.evm.utils import get_rpc_url, get_w3
+from chat.jobs import scheduler
+from chat.llm_conversation import watch_pending_transactions
+from chat.sonic_airdrop import get_airdrop_index
+from tools.startup import run_warmup
+
+
+async def warm_up_chain(chain_id: IntChainId) -> None:
+    w3 = await get_w3(chain_id)
+    preload_contract_factories(w3)
+    # Opens the http session and caches the chain id web3 checks when building transactions
+    await w3.eth.chain_id
+
+
+async def warm_up_chains() -> None:
+    await asyncio.gather(
+        *[
+            warm_up_chain(chain_id)
+            for chain_id in ACTIVE_CHAINS
+            if get_rpc_url(chain_id)
+        ]
+    )
+
+
+async def warm_up() -> None:
+    """Fills the caches the first requests would otherwise pay for, then starts the refresh loops"""
+    await run_warmup(
+        {
+            "scheduled_jobs": scheduler.run_all,
+            "chains": warm_up_chains,
+            "airdrop_index": lambda: asyncio.to_thread(get_airdrop_index),
+            # Flows waiting on a transaction submitted before a restart or deploy
+            "pending_transactions": watch_pending_transactions,
+        }
+    )
+    scheduler.start(run_immediately=False)
@@ -0,0 +1,190 @@
+import logging
+
+from chaindata.constants import (
+    ODOS_ROUTER_SPENDER_ADDRESS,
+    SILO_ROUTER_V2_ADDRESS,
+    SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS,
+    IntChainId,
+)
+from chaindata.evm.constants import ABI
+from chaindata.evm.token_metadata import get_token_metadata
+from chaindata.evm.contracts import get_contract
+from chaindata.evm.utils import get_w3
+from chaindata.odos import build_swap_transaction
+from chat.models import Conversation, TransactionRequests
+from chat.silo_lending_txns import build_deposit_transaction, get_best_lending_vault
+from chat.txn_builder import (
+    build_transaction_request,
+    check_and_build_allowance,
+    run_transaction_steps,
+    validate_token,
+)
+from chat.typing import SwapAndLendTxnSteps, TransactionFlows, TransactionStates
+from tools.dictionary import get_from_dict
+from tools.speculation import speculated
+
+logger = logging.getLogger(__name__)
+
+# Matches the default `slippage_limit_percent` of the Odos quote
+SWAP_SLIPPAGE_PERCENT = 1
+
+
+async def swap_and_lend_tokens(
+    conversation: Conversation,
+    user_address: str,
+    input_token_symbol: str,
+    input_token_amount: float,
+    lend_token_symbol: str,
+) -> bool | str:
+    """
+    Swap into a token and lend the output to Silo, tracked as a single transaction request.
+    The swap and the deposit stay separate transactions, the Silo router has no action
+    that calls Odos. Returns an error message when the request can't be built.
+    """
+    transaction_request = await build_transaction_request(
+        conversation,
+        user_address,
+        TransactionFlows.SWAP_AND_LEND,
+        {
+            "input_token_symbol": input_token_symbol,
+            "input_token_amount": input_token_amount,
+            "lend_token_symbol": lend_token_symbol,
+        },
+    )
+
+    input_token_address, error = await validate_token(
+        input_token_symbol, transaction_request
+    )
+    if error:
+        return f"Error: {error}"
+
+    lend_token_address, error = await validate_token(
+        lend_token_symbol, transaction_request
+    )
+    if error:
+        return f"Error: {error}"
+
+    lending_vault = await speculated(get_best_lending_vault, lend_token_address)
+    if lending_vault is None:
+        error = f"No Silo lending vault found for {lend_token_symbol}"
+        transaction_request.failed_reason = error
+        transaction_request.state = TransactionStates.FAILED
+        await transaction_request.asave()
+        return f"Error: {error}"
+
+    data = transaction_request.data
+    data.update(
+        {
+            "input_token_address": input_token_address,
+            "lend_token_address": lend_token_address,
+            "lending_vault": lending_vault,
+        }
+    )
+    transaction_request.data = data
+    await transaction_request.asave()
+
+    return await process_swap_and_lend_transaction(transaction_request)
+
+
+async def process_swap_and_lend_transaction(
+    transaction_request: TransactionRequests,
+) -> bool:
+    """Process the swap and lend transaction and returns a bool indicating if transaction signing is required"""
+    data = transaction_request.data
+    user_address = transaction_request.user_address
+    input_token_symbol = data["input_token_symbol"]
+    input_token_address = data["input_token_address"]
+    input_token_amount = data["input_token_amount"]
+    lend_token_symbol = data["lend_token_symbol"]
+    lend_token_address = data["lend_token_address"]
+
+    token_metadata = await get_token_metadata([input_token_address, lend_token_address])
+    decimals = {}
+    for token_address in [input_token_address, lend_token_address]:
+        if metadata := token_metadata.get(token_address):
+            decimals[token_address] = metadata.decimals
+        else:
+            logger.warning(f"Token {token_address} not found in token metadata")
+            decimals[token_address] = 18
+
+    async def build_swap_approval(transaction_request: TransactionRequests):
+        return await speculated(
+            check_and_build_allowance,
+            input_token_address,
+            user_address,
+            ODOS_ROUTER_SPENDER_ADDRESS,
+            input_token_amount,
+            decimals[input_token_address],
+            input_token_symbol,
+        )
+
+    async def build_swap(transaction_request: TransactionRequests):
+        transaction_details = await speculated(
+            build_swap_transaction,
+            IntChainId.Sonic,
+            input_token_address,
+            input_token_amount * 10 ** decimals[input_token_address],
+            lend_token_address,
+            user_address,
+        )
+        expected_output = int(
+            get_from_dict(transaction_details, ["outputTokens", 0, "amount"], 0)
+        )
+        transaction_request.data["min_swap_output_in_wei"] = (
+            expected_output * (100 - SWAP_SLIPPAGE_PERCENT) // 100
+        )
+        transaction_details["description"] = (
+            f"Swapping {input_token_amount} {input_token_symbol} to {lend_token_symbol}"
+        )
+        return transaction_details
+
+    async def build_lend_approval(transaction_request: TransactionRequests):
+        lend_amount_in_wei = await get_lend_amount_in_wei(transaction_request)
+        transaction_request.data["lend_amount_in_wei"] = lend_amount_in_wei
+        return await check_and_build_allowance(
+            lend_token_address,
+            user_address,
+            SILO_ROUTER_V2_ADDRESS,
+            lend_amount_in_wei / 10 ** decimals[lend_token_address],
+            decimals[lend_token_address],
+            lend_token_symbol,
+        )
+
+    async def build_deposit(transaction_request: TransactionRequests):
+        lend_amount_in_wei = transaction_request.data["lend_amount_in_wei"]
+        txn = await build_deposit_transaction(
+            transaction_request.data["lending_vault"],
+            lend_token_address,
+            lend_amount_in_wei,
+            user_address,
+        )
+        lend_amount = lend_amount_in_wei / 10 ** decimals[lend_token_address]
+        return {
+            "transaction": txn,
+            "description": f"Lending {lend_amount} {lend_token_symbol} to Silo Protocol",
+        }
+
+    return await run_transaction_steps(
+        transaction_request,
+        [
+            (SwapAndLendTxnSteps.SWAP_APPROVAL, build_swap_approval),
+            (SwapAndLendTxnSteps.SWAP, build_swap),
+            (SwapAndLendTxnSteps.LEND_APPROVAL, build_lend_approval),
+            (SwapAndLendTxnSteps.DEPOSIT, build_deposit),
+        ],
+    )
+
+
+async def get_lend_amount_in_wei(transaction_request: TransactionRequests) -> int:
+    """Lend what the swap returned, capped by the slippage adjusted quote"""
+    lend_token_address = transaction_request.data["lend_token_address"]
+    user_address = transaction_request.user_address
+
+    w3 = await get_w3(IntChainId.Sonic)
+    if lend_token_address == SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS:
+        balance = await w3.eth.get_balance(user_address)
+    else:
+        contract = get_contract(w3, lend_token_address, ABI.ERC20)
+        balance = await contract.functions.balanceOf(user_address).call()
+
+    return min(balance, transaction_request.data["min_swap_output_in_wei"])
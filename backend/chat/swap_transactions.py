@@ -1,20 +1,37 @@
 from typing import Dict
+import asyncio
 import logging
 
-from chat.txn_builder import build_transaction_request, check_and_build_allowance
+from chat.txn_builder import (
+    build_allowance_transaction,
+    build_transaction_request,
+    has_sufficient_allowance,
+)
 from chaindata.evm.token_lists import get_token_addresses_from_symbols
 from chaindata.evm.utils import get_w3
 from chaindata.evm.constants import ABI
-from chaindata.odos import build_swap_transaction
+from chaindata.evm.permit2 import (
+    build_permit_transfer_typed_data,
+    get_permit2_deadline,
+    new_permit2_nonce,
+)
+from chaindata.odos import build_swap_permit2_transaction, build_swap_transaction
 from chaindata.evm.token_metadata import get_token_metadata
 from chat.models import Conversation, TransactionRequests
-from chat.typing import SwapTransactionSteps, TransactionFlows, TransactionStates
+from chat.typing import (
+    ApprovalModes,
+    SwapTransactionSteps,
+    TransactionFlows,
+    TransactionStates,
+)
 from chaindata.constants import (
     ODOS_ROUTER_SPENDER_ADDRESS,
+    PERMIT2_ADDRESS,
     SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS,
     IntChainId,
 )
 from chat.txn_builder import validate_token
+from tools.speculation import speculated
 
 
 logger = logging.getLogger(__name__)
@@ -123,22 +140,44 @@ async def handle_approval_step(
     """Handles the approval step of the swap transaction and returns a bool indicating if we need to sign the transaction"""
     transaction_request.step = SwapTransactionSteps.APPROVAL_A
 
-    transaction_details = await check_and_build_allowance(
-        input_token_address,
-        user_address,
-        ODOS_ROUTER_SPENDER_ADDRESS,
-        input_token_amount,
-        input_token_decimals,
-        input_token_symbol,
+    router_allowance_ok, permit2_allowance_ok = await asyncio.gather(
+        speculated(
+            has_sufficient_allowance,
+            input_token_address,
+            user_address,
+            ODOS_ROUTER_SPENDER_ADDRESS,
+            input_token_amount,
+            input_token_decimals,
+        ),
+        speculated(
+            has_sufficient_allowance,
+            input_token_address,
+            user_address,
+            PERMIT2_ADDRESS,
+            input_token_amount,
+            input_token_decimals,
+        ),
     )
 
-    if transaction_details:
-        transaction_request.transaction_details = transaction_details
+    if router_allowance_ok:
         await transaction_request.asave()
-        return True
+        return False
+
+    if permit2_allowance_ok:
+        # Skip the approval transaction, the swap pulls tokens with a Permit2 signature
+        transaction_request.data["approval_mode"] = ApprovalModes.PERMIT2
+        await transaction_request.asave()
+        return False
 
+    transaction_request.transaction_details = await build_allowance_transaction(
+        IntChainId.Sonic,
+        user_address,
+        input_token_address,
+        ODOS_ROUTER_SPENDER_ADDRESS,
+        input_token_symbol,
+    )
     await transaction_request.asave()
-    return False
+    return True
 
 
 async def handle_swap_step(
@@ -151,19 +190,103 @@ async def handle_swap_step(
     input_token_decimals: int,
     user_address: str,
 ) -> bool:
+    description = (
+        f"Swapping {input_token_amount} {input_token_symbol} to {output_token_symbol}"
+    )
+
+    if transaction_request.data.get("approval_mode") == ApprovalModes.PERMIT2:
+        return await handle_permit2_swap_step(
+            transaction_request,
+            input_token_address,
+            input_token_amount,
+            output_token_address,
+            input_token_symbol,
+            input_token_decimals,
+            user_address,
+            description,
+        )
+
     transaction_request.step = SwapTransactionSteps.BUILD_SWAP_TX
 
-    transaction_details = await build_swap_transaction(
+    transaction_details = await speculated(
+        build_swap_transaction,
         IntChainId.Sonic,
         input_token_address,
         input_token_amount * 10**input_token_decimals,
         output_token_address,
         user_address,
     )
-    transaction_details["description"] = (
-        f"Swapping {input_token_amount} {input_token_symbol} to {output_token_symbol}"
-    )
+    transaction_details["description"] = description
 
     transaction_request.transaction_details = transaction_details
     await transaction_request.asave()
     return True
+
+
+async def handle_permit2_swap_step(
+    transaction_request: TransactionRequests,
+    input_token_address: str,
+    input_token_amount: float,
+    output_token_address: str,
+    input_token_symbol: str,
+    input_token_decimals: int,
+    user_address: str,
+    description: str,
+) -> bool:
+    """
+    Asks the user for a Permit2 signature first, then quotes and builds `swapPermit2`
+    with it. The signature only covers the input token, amount and nonce, the route is
+    assembled once it arrives so the quote is fresh. The step only moves to
+    BUILD_SWAP_TX once there is a transaction to sign.
+    """
+    data = transaction_request.data
+    signature = data.get("permit2_signature")
+    input_amount_in_wei = int(float(input_token_amount * 10**input_token_decimals))
+
+    if signature is None:
+        nonce = new_permit2_nonce()
+        deadline = get_permit2_deadline()
+        typed_data = build_permit_transfer_typed_data(
+            input_token_address,
+            input_amount_in_wei,
+            ODOS_ROUTER_SPENDER_ADDRESS,
+            nonce,
+            deadline,
+        )
+        data.update(
+            {
+                "permit2_nonce": nonce,
+                "permit2_deadline": deadline,
+                "permit2_typed_data": typed_data,
+            }
+        )
+        transaction_request.data = data
+        transaction_request.transaction_details = {
+            "typed_data": typed_data,
+            "description": f"Allow swapping {input_token_amount} {input_token_symbol} with a signature",
+        }
+        await transaction_request.asave()
+        return True
+
+    transaction_request.step = SwapTransactionSteps.BUILD_SWAP_TX
+    assembled = await build_swap_transaction(
+        IntChainId.Sonic,
+        input_token_address,
+        input_amount_in_wei,
+        output_token_address,
+        user_address,
+        compact=False,  # `swapPermit2` has no compact variant
+    )
+    txn = await build_swap_permit2_transaction(
+        IntChainId.Sonic,
+        assembled["transaction"],
+        data["permit2_nonce"],
+        data["permit2_deadline"],
+        signature,
+    )
+    transaction_request.transaction_details = {
+        "transaction": txn,
+        "description": description,
+    }
+    await transaction_request.asave()
+    return True
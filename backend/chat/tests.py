@@ -1,3 +1,387 @@
-from django.test import TestCase
+import json
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from fastapi import HTTPException
+from starlette.requests import Request
+from pydantic import BaseModel
+
+from chat.idempotency import (
+    IDEMPOTENCY_KEY_RETENTION_SECONDS,
+    IDEMPOTENCY_LEASE_SECONDS,
+    delete_expired_idempotency_keys,
+    run_idempotent,
+)
+from chat.intent_parser import Intent, find_intent, parse_intent
+from chat.models import Conversation, IdempotencyKey, TransactionRequests
+from chat.response_cache import conversation_response_cache
+from chat.tool_call_parser import loads_lenient, parse_tool_calls
+from chat.turn_budget import DEADLINE, STEPS, TOKENS, TurnBudget
+from chat.views import (
+    build_conversation_cursor,
+    get_pending_transaction,
+    parse_conversation_cursor,
+)
+
+SCOPE = "process_messages:test"
+
+
+class Response_(BaseModel):
+    count: int
+    final: bool = True
+
+
+class RunIdempotentTests(TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    async def execute(self) -> Response_:
+        self.calls += 1
+        return Response_(count=self.calls)
+
+    async def run_request(self, key="key", body="body", **kwargs) -> Response_:
+        return await run_idempotent(SCOPE, key, body, self.execute, Response_, **kwargs)
+
+    async def test_retries_replay_the_stored_response(self):
+        first = await self.run_request()
+        second = await self.run_request()
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, 1)
+
+    async def test_requests_without_a_key_always_execute(self):
+        await self.run_request(key=None)
+        await self.run_request(key=None)
+        self.assertEqual(self.calls, 2)
+
+    async def test_reusing_a_key_for_another_request_is_rejected(self):
+        await self.run_request()
+        with self.assertRaises(HTTPException) as raised:
+            await self.run_request(body="other body")
+        self.assertEqual(raised.exception.status_code, 422)
+
+    async def test_responses_that_arent_final_are_not_stored(self):
+        is_final = lambda response: False
+        await self.run_request(is_final=is_final)
+        await self.run_request(is_final=is_final)
+        self.assertEqual(self.calls, 2)
+        self.assertFalse(await IdempotencyKey.objects.filter(scope=SCOPE).aexists())
+
+    async def test_reservations_of_another_worker_conflict(self):
+        await IdempotencyKey.objects.acreate(
+            scope=SCOPE, key="key", request_hash="hash"
+        )
+        with self.assertRaises(HTTPException) as raised:
+            await self.run_request()
+        self.assertEqual(raised.exception.status_code, 409)
+        self.assertEqual(self.calls, 0)
+
+    async def test_abandoned_reservations_are_taken_over(self):
+        record = await IdempotencyKey.objects.acreate(
+            scope=SCOPE, key="key", request_hash="hash"
+        )
+        abandoned_at = timezone.now() - timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS + 1)
+        await IdempotencyKey.objects.filter(pk=record.pk).aupdate(
+            created_at=abandoned_at
+        )
+
+        response = await self.run_request()
+        self.assertEqual(response.count, 1)
+        await record.arefresh_from_db()
+        self.assertEqual(record.response, response.model_dump(mode="json"))
+        self.assertGreater(record.created_at, abandoned_at)
+
+    async def test_expired_keys_are_deleted(self):
+        await self.run_request(key="old")
+        await self.run_request(key="recent")
+        expired_at = timezone.now() - timedelta(
+            seconds=IDEMPOTENCY_KEY_RETENTION_SECONDS + 1
+        )
+        await IdempotencyKey.objects.filter(key="old").aupdate(created_at=expired_at)
+
+        self.assertEqual(await delete_expired_idempotency_keys(), 1)
+        keys = [
+            key async for key in IdempotencyKey.objects.values_list("key", flat=True)
+        ]
+        self.assertEqual(keys, ["recent"])
+
+
+TOKEN_ADDRESSES = {
+    "S": "0x0000000000000000000000000000000000000000",
+    "USDC": "0x0000000000000000000000000000000000000001",
+    "USDC.e": "0x0000000000000000000000000000000000000002",
+    "stS": "0x0000000000000000000000000000000000000003",
+    "STS": "0x0000000000000000000000000000000000000004",
+}
+
+
+class IntentParserTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch(
+            "chat.intent_parser.get_token_addresses_from_symbols",
+            return_value=TOKEN_ADDRESSES,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ParseIntentTests(IntentParserTestCase):
+    async def test_single_actions(self):
+        self.assertEqual(
+            await parse_intent("Swap 10 S to usdc please."),
+            Intent(
+                "swap_tokens",
+                {
+                    "input_token_amount": 10.0,
+                    "input_token_symbol": "S",
+                    "output_token_symbol": "USDC",
+                },
+            ),
+        )
+        self.assertEqual(
+            await parse_intent("deposit .5 $USDC.e into silo"),
+            Intent("lend_tokens", {"amount": 0.5, "token_symbol": "USDC.e"}),
+        )
+        self.assertEqual(
+            await parse_intent("swap 1 S for USDC and then lend it"),
+            Intent(
+                "swap_and_lend_tokens",
+                {
+                    "input_token_amount": 1.0,
+                    "input_token_symbol": "S",
+                    "lend_token_symbol": "USDC",
+                },
+            ),
+        )
+        self.assertEqual(
+            await parse_intent("withdraw all my usdc from silo"),
+            Intent("withdraw_all_tokens", {"token_symbol": "USDC"}),
+        )
+        self.assertEqual(
+            await parse_intent("stake 2.5 S"), Intent("stake_sonic", {"amount": 2.5})
+        )
+
+    async def test_anything_else_is_left_to_the_llm(self):
+        for message in [
+            "can you swap 10 S to USDC?",
+            "swap 10 S to USDC and tell me the price",
+            "swap 0 S to USDC",
+            "swap 10 S to DOGE",
+            # Listed as stS and STS, the user's casing doesn't pick one
+            "lend 5 sts",
+        ]:
+            with self.subTest(message):
+                self.assertIsNone(await parse_intent(message))
+
+    async def test_exact_case_wins_over_case_insensitive_matches(self):
+        intent = await parse_intent("lend 5 stS")
+        self.assertEqual(intent.arguments["token_symbol"], "stS")
+
+
+TOOL_NAMES = ["swap_tokens", "lend_tokens"]
+
+
+def call_of(tool_call: dict) -> tuple:
+    function = tool_call["function"]
+    return function["name"], json.loads(function["arguments"])
+
+
+class FindIntentTests(IntentParserTestCase):
+    async def test_actions_among_other_words(self):
+        self.assertEqual(
+            await find_intent("hey, can you swap 10 S to USDC and tell me the price?"),
+            Intent(
+                "swap_tokens",
+                {
+                    "input_token_amount": 10.0,
+                    "input_token_symbol": "S",
+                    "output_token_symbol": "USDC",
+                },
+            ),
+        )
+        self.assertEqual(
+            await find_intent("I'd like to lend 5 usdc.e, what's the APY?"),
+            Intent("lend_tokens", {"amount": 5.0, "token_symbol": "USDC.e"}),
+        )
+
+    async def test_no_guess_without_a_whole_action(self):
+        for message in [
+            "what can I swap?",
+            "unswap 10 S to USDC",
+            "swap 10 S to DOGE",
+            "lend 5 sts",
+        ]:
+            with self.subTest(message):
+                self.assertIsNone(await find_intent(message))
+
+
+class LoadsLenientTests(SimpleTestCase):
+    def test_recoverable_json(self):
+        for text in [
+            '```json\n{"symbol": "S"}\n```',
+            '{"symbol": "S"} and some trailing text',
+            'Sure: {"symbol": "S",}',
+            '{"symbol": "S", ',
+        ]:
+            with self.subTest(text):
+                self.assertEqual(loads_lenient(text), {"symbol": "S"})
+        self.assertEqual(loads_lenient('{"a": [1, {"b": "c"}'), {"a": [1, {"b": "c"}]})
+
+    def test_values_cut_off_midway_are_rejected(self):
+        # Closing them would read "US" for "USDC" or 1 for 10
+        for text in ['{"symbol": "US', '{"amount": 1', "no json here"]:
+            with self.subTest(text):
+                with self.assertRaises(ValueError):
+                    loads_lenient(text)
+
+
+class ParseToolCallsTests(SimpleTestCase):
+    async def test_tagged_calls(self):
+        parsed = await parse_tool_calls(
+            "<think>maybe <tool_call>{}</tool_call></think>Swapping now."
+            '<tool_call>{"name": "swap_tokens", "arguments": {"amount": 1}}</tool_call>'
+            '<tool_call>{"name": "lend_tokens", "arguments": "{\\"amount\\": 2}"}',
+            TOOL_NAMES,
+        )
+        self.assertEqual(
+            [call_of(tool_call) for tool_call in parsed.tool_calls],
+            [("swap_tokens", {"amount": 1}), ("lend_tokens", {"amount": 2})],
+        )
+        self.assertEqual(parsed.content, "Swapping now.")
+
+    async def test_deepseek_tokens(self):
+        parsed = await parse_tool_calls(
+            "<｜tool▁calls▁begin｜><｜tool▁call▁begin｜>function<｜tool▁sep｜>lend_tokens\n"
+            '```json\n{"amount": 2}\n```<｜tool▁call▁end｜><｜tool▁calls▁end｜>',
+            TOOL_NAMES,
+        )
+        self.assertEqual(
+            [call_of(tool_call) for tool_call in parsed.tool_calls],
+            [("lend_tokens", {"amount": 2})],
+        )
+        self.assertIsNone(parsed.content)
+
+    async def test_bare_json(self):
+        parsed = await parse_tool_calls(
+            '{"function": {"name": "swap_tokens", "parameters": {"amount": 1}}}',
+            TOOL_NAMES,
+        )
+        self.assertEqual(
+            [call_of(tool_call) for tool_call in parsed.tool_calls],
+            [("swap_tokens", {"amount": 1})],
+        )
+
+    async def test_plain_content_is_left_alone(self):
+        content = "You can swap tokens with swap_tokens {like this}"
+        parsed = await parse_tool_calls(content, TOOL_NAMES)
+        self.assertEqual(parsed.tool_calls, [])
+        self.assertEqual(parsed.content, content)
+
+    async def test_unrecoverable_calls_go_to_the_repair(self):
+        fragment = '{"name": "swap_tokens", "arguments": {"symbol": "US'
+        repairs = []
+
+        async def repair(broken):
+            repairs.append(broken)
+            return '{"name": "swap_tokens", "arguments": {"symbol": "USDC"}}'
+
+        parsed = await parse_tool_calls(f"<tool_call>{fragment}", TOOL_NAMES)
+        self.assertEqual(parsed.tool_calls, [])
+        self.assertEqual(parsed.failed, [fragment])
+
+        parsed = await parse_tool_calls(f"<tool_call>{fragment}", TOOL_NAMES, repair)
+        self.assertEqual(repairs, [fragment])
+        self.assertEqual(
+            [call_of(tool_call) for tool_call in parsed.tool_calls],
+            [("swap_tokens", {"symbol": "USDC"})],
+        )
+
+    async def test_unknown_tools_fail(self):
+        parsed = await parse_tool_calls(
+            '<tool_call>{"name": "transfer_all", "arguments": {}}</tool_call>',
+            TOOL_NAMES,
+        )
+        self.assertEqual(parsed.tool_calls, [])
+        self.assertEqual(len(parsed.failed), 1)
+
+
+class TurnBudgetTests(SimpleTestCase):
+    def usage(self, total_tokens):
+        return SimpleNamespace(total_tokens=total_tokens)
+
+    def test_steps(self):
+        budget = TurnBudget(max_steps=2)
+        budget.charge(None)
+        self.assertIsNone(budget.exhausted())
+        budget.charge(self.usage(10))
+        self.assertEqual(budget.exhausted(), STEPS)
+        self.assertEqual(budget.tokens, 10)
+
+    def test_tokens(self):
+        budget = TurnBudget(max_tokens=100)
+        budget.charge(self.usage(60))
+        self.assertIsNone(budget.exhausted())
+        budget.charge(self.usage(40))
+        self.assertEqual(budget.exhausted(), TOKENS)
+
+    def test_deadline(self):
+        budget = TurnBudget(timeout=10)
+        self.assertGreater(budget.seconds_left(), 9)
+        with mock.patch("chat.turn_budget.time.monotonic") as monotonic:
+            monotonic.return_value = budget.started_at + 11
+            self.assertEqual(budget.seconds_left(), 0)
+            self.assertEqual(budget.exhausted(), DEADLINE)
+
+
+class PendingTransactionTests(TestCase):
+    def setUp(self):
+        self.addCleanup(conversation_response_cache._entries.clear)
+
+    async def get(self, conversation):
+        request = Request({"type": "http", "method": "GET", "headers": []})
+        return await get_pending_transaction(request, str(conversation.id))
+
+    async def test_nothing_to_sign_is_cached_until_a_request_is_created(self):
+        conversation = await Conversation.objects.acreate(user_id="user", messages=[])
+        response = await self.get(conversation)
+        self.assertEqual(response.status_code, 404)
+
+        with mock.patch.object(
+            Conversation.objects, "aget", side_effect=AssertionError("queried")
+        ):
+            cached = await self.get(conversation)
+        self.assertEqual(cached.status_code, 404)
+        self.assertEqual(cached.headers["etag"], response.headers["etag"])
+
+        await TransactionRequests.objects.acreate(
+            conversation=conversation,
+            chain_id=146,
+            user_address="0x0000000000000000000000000000000000000001",
+            data={},
+            transaction_details={"to": "0x"},
+        )
+        response = await self.get(conversation)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.body), {"transaction_details": {"to": "0x"}}
+        )
+
+
+class ConversationCursorTests(SimpleTestCase):
+    def test_round_trip_is_url_safe(self):
+        updated_at = timezone.now()
+        conversation_id = uuid.uuid4()
+        cursor = build_conversation_cursor(updated_at, conversation_id)
+        self.assertRegex(cursor, r"^[A-Za-z0-9_-]+$")
+        self.assertEqual(
+            parse_conversation_cursor(cursor), (updated_at, conversation_id)
+        )
+
+    def test_invalid_cursors_raise_value_errors(self):
+        for cursor in ["", "not a cursor", "2026-10-19T12:30:00 00:00_abc", "\u00e9"]:
+            with self.subTest(cursor):
+                with self.assertRaises(ValueError):
+                    parse_conversation_cursor(cursor)
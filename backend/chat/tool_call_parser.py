@@ -0,0 +1,209 @@
+import json
+import logging
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Collection, List, Optional, Tuple
+
+from tools.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+THINK_BLOCK = re.compile(r"<think>.*?(?:</think>|$)", re.DOTALL)
+# `<tool_call>{json}</tool_call>`, some completions close with the deepseek token or not at all
+TAGGED_CALL = re.compile(
+    r"<tool_call>\s*(.*?)\s*(?:</tool_call>|<｜tool▁calls?▁end｜>|(?=<tool_call>)|$)",
+    re.DOTALL,
+)
+# `<｜tool▁call▁begin｜>function<｜tool▁sep｜>name\n```json\n{args}\n```<｜tool▁call▁end｜>`
+DEEPSEEK_CALL = re.compile(
+    r"<｜tool▁call▁begin｜>\s*(?:function)?\s*<｜tool▁sep｜>\s*([\w\-]+)\s*(.*?)\s*"
+    r"(?:<｜tool▁call▁end｜>|(?=<｜tool▁call▁begin｜>)|<｜tool▁calls▁end｜>|$)",
+    re.DOTALL,
+)
+DEEPSEEK_TOKENS = re.compile(r"<｜tool▁(?:calls▁begin|calls▁end|call▁end)｜>")
+CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+# Repair paths, also the suffixes of the `tool_call_parser.*` counters
+NATIVE = "native"
+TAGGED = "tagged"
+DEEPSEEK = "deepseek_tokens"
+BARE_JSON = "bare_json"
+JSON_REPAIRED = "json_repaired"
+MODEL_REPAIRED = "model_repaired"
+FAILED = "failed"
+
+ToolCallRepair = Callable[[str], Awaitable[str]]
+
+
+@dataclass
+class ParsedToolCalls:
+    tool_calls: List[dict] = field(default_factory=list)
+    # What is left of the content once the tool calls are taken out
+    content: Optional[str] = None
+    # Fragments that looked like tool calls but couldn't be recovered
+    failed: List[str] = field(default_factory=list)
+
+
+def build_tool_call(name: str, arguments: dict, call_id: Optional[str] = None) -> dict:
+    return {
+        "id": call_id or f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)},
+    }
+
+
+async def parse_tool_calls(
+    content: Optional[str],
+    tool_names: Collection[str],
+    repair: Optional[ToolCallRepair] = None,
+) -> ParsedToolCalls:
+    """
+    Tool calls a reasoning model wrote into its message content instead of the api's
+    `tool_calls`. Handles several calls per message, `<tool_call>` tags, the deepseek
+    special tokens and truncated or sloppy json. Fragments that still don't parse are
+    sent to `repair`, which should return the fixed json of that single call.
+    """
+    if not content:
+        return ParsedToolCalls(content=content)
+
+    text = THINK_BLOCK.sub("", content)
+    fragments: List[Tuple[Optional[str], str]] = []
+    path = None
+    if "<｜tool▁call▁begin｜>" in text:
+        path = DEEPSEEK
+        fragments = [(name, args) for name, args in DEEPSEEK_CALL.findall(text)]
+        text = DEEPSEEK_TOKENS.sub("", DEEPSEEK_CALL.sub("", text))
+    elif "<tool_call>" in text:
+        path = TAGGED
+        fragments = [(None, fragment) for fragment in TAGGED_CALL.findall(text)]
+        text = DEEPSEEK_TOKENS.sub("", TAGGED_CALL.sub("", text))
+    elif text.strip().startswith("{") and any(name in text for name in tool_names):
+        path = BARE_JSON
+        fragments = [(None, text.strip())]
+        text = ""
+
+    if path is None:
+        return ParsedToolCalls(content=content)
+
+    parsed = ParsedToolCalls(content=text.strip() or None)
+    for name, fragment in fragments:
+        tool_call = await parse_fragment(name, fragment, tool_names, repair)
+        if tool_call is None:
+            incr(f"tool_call_parser.{FAILED}")
+            parsed.failed.append(fragment)
+        else:
+            parsed.tool_calls.append(tool_call)
+
+    if parsed.tool_calls:
+        incr(f"tool_call_parser.{path}")
+    return parsed
+
+
+async def parse_fragment(
+    name: Optional[str],
+    fragment: str,
+    tool_names: Collection[str],
+    repair: Optional[ToolCallRepair],
+) -> Optional[dict]:
+    try:
+        return to_tool_call(name, fragment, tool_names)
+    except ValueError as e:
+        if repair is None:
+            logger.warning(f"Unrecoverable tool call {fragment!r}: {e}")
+            return None
+
+    try:
+        # The repair always answers with the whole {"name", "arguments"} object
+        broken = fragment if name is None else f"{name} {fragment}"
+        tool_call = to_tool_call(None, await repair(broken), tool_names)
+    except Exception as e:
+        logger.warning(f"Model couldn't repair tool call {fragment!r}: {e}")
+        return None
+
+    incr(f"tool_call_parser.{MODEL_REPAIRED}")
+    return tool_call
+
+
+def to_tool_call(
+    name: Optional[str], fragment: str, tool_names: Collection[str]
+) -> dict:
+    """Api shaped tool call, `name` is given when the format puts it outside the json"""
+    data = loads_lenient(fragment)
+    if not isinstance(data, dict):
+        raise ValueError("Tool call is not a json object")
+
+    if name is not None:
+        arguments = data
+    else:
+        # {"name", "arguments"} or the api's own {"function": {"name", "arguments"}}
+        call = data.get("function", data)
+        name = call.get("name")
+        arguments = call.get("arguments", call.get("parameters", {}))
+        if isinstance(arguments, str):
+            arguments = loads_lenient(arguments) if arguments.strip() else {}
+
+    if name not in tool_names:
+        raise ValueError(f"Unknown tool {name!r}")
+    if not isinstance(arguments, dict):
+        raise ValueError("Tool call arguments are not a json object")
+
+    return build_tool_call(name, arguments, data.get("id"))
+
+
+def loads_lenient(text: str) -> Any:
+    """
+    `json.loads` that tolerates code fences, text after the value, trailing commas and
+    output cut off between values, the usual ways a model's json goes wrong.
+    """
+    text = CODE_FENCE.sub("", text.strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    start = min([i for i in (text.find("{"), text.find("[")) if i != -1], default=-1)
+    if start == -1:
+        raise ValueError("No json value found")
+    text = TRAILING_COMMA.sub(r"\1", text[start:])
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+    except json.JSONDecodeError:
+        try:
+            value = json.loads(TRAILING_COMMA.sub(r"\1", close_json(text)))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid json: {e}")
+
+    incr(f"tool_call_parser.{JSON_REPAIRED}")
+    return value
+
+
+def close_json(text: str) -> str:
+    """Closes the objects and arrays left open by json cut off between values"""
+    closers = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+
+    # Only safe to close after a complete value, a cut off "USDC" or 10 reads as "US" or 1
+    if in_string:
+        raise ValueError("Json cut off inside a string")
+    text = text.rstrip().rstrip(",")
+    if not text.endswith(('"', "}", "]")):
+        raise ValueError("Json cut off inside a value")
+    return text + "".join(reversed(closers))
@@ -0,0 +1,54 @@
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from tools.metrics import incr
+
+# Limits of one user turn, the completions and tool calls answering a single message
+TURN_MAX_STEPS = int(os.getenv("TURN_MAX_STEPS", 6))
+TURN_TIMEOUT_SECONDS = float(os.getenv("TURN_TIMEOUT", 60))
+TURN_MAX_TOKENS = int(os.getenv("TURN_MAX_TOKENS", 40000))
+
+# Why a turn stopped early, also the suffixes of the `turn_budget.exhausted.*` counters
+STEPS = "steps"
+DEADLINE = "deadline"
+TOKENS = "tokens"
+
+
+@dataclass
+class TurnBudget:
+    """Completions, wall clock time and tokens a turn may still spend"""
+
+    max_steps: int = TURN_MAX_STEPS
+    timeout: float = TURN_TIMEOUT_SECONDS
+    max_tokens: int = TURN_MAX_TOKENS
+    steps: int = 0
+    tokens: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def seconds_left(self) -> float:
+        return max(self.started_at + self.timeout - time.monotonic(), 0)
+
+    def charge(self, usage) -> None:
+        """Counts a completion and its tokens"""
+        self.steps += 1
+        if usage is not None:
+            self.tokens += usage.total_tokens
+
+    def exhausted(self) -> Optional[str]:
+        """Limit that rules out another completion, `None` while there is budget left"""
+        if self.steps >= self.max_steps:
+            return STEPS
+        if self.seconds_left() <= 0:
+            return DEADLINE
+        if self.tokens >= self.max_tokens:
+            return TOKENS
+        return None
+
+    def record(self, exhausted: Optional[str] = None) -> None:
+        incr("turn_budget.turns")
+        incr("turn_budget.steps", self.steps)
+        incr("turn_budget.tokens", self.tokens)
+        if exhausted is not None:
+            incr(f"turn_budget.exhausted.{exhausted}")
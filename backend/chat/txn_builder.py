@@ -1,8 +1,12 @@
-from typing import Dict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from django.db import IntegrityError
 
 from tools.display import abbreviate_evm_address
 from chaindata.evm.constants import ABI
+from chaindata.evm.contracts import get_contract
 from chaindata.evm.utils import get_w3
+from chaindata.evm.gas import build_transaction
 from chaindata.evm.token_lists import get_token_addresses_from_symbols
 from chaindata.constants import SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS, IntChainId
 from chat.models import Conversation, TransactionRequests
@@ -22,16 +26,64 @@ async def build_transaction_request(
         )
         assert transaction_request.flow == flow
     except TransactionRequests.DoesNotExist:
-        transaction_request = await TransactionRequests.objects.acreate(
-            chain_id=IntChainId.Sonic,
-            conversation=conversation,
-            user_address=user_address,
-            flow=flow,
-            data=data,
-        )
+        try:
+            transaction_request = await TransactionRequests.objects.acreate(
+                chain_id=IntChainId.Sonic,
+                conversation=conversation,
+                user_address=user_address,
+                flow=flow,
+                data=data,
+                # Stored now, by the time the transaction is confirmed the user may have
+                # sent more messages
+                tool_call_id=get_last_tool_call_id(conversation.messages),
+            )
+        except IntegrityError:
+            # A concurrent turn created the PROCESSING request first
+            transaction_request = await TransactionRequests.objects.aget(
+                conversation=conversation, state=TransactionStates.PROCESSING
+            )
+            assert transaction_request.flow == flow
     return transaction_request
 
 
+def get_last_tool_call_id(messages: List[dict]) -> Optional[str]:
+    """Id of the latest tool call in the transcript, the one being run while tools execute"""
+    for message in reversed(messages):
+        if message.get("tool_calls"):
+            return message["tool_calls"][0]["id"]
+    return None
+
+
+FALLBACK_UNWRAP_GAS = 60000
+
+StepBuilder = Callable[[TransactionRequests], Awaitable[Dict | None]]
+
+
+async def run_transaction_steps(
+    transaction_request: TransactionRequests,
+    steps: List[Tuple[int, StepBuilder]],
+) -> bool:
+    """
+    Runs the pending steps of a multi step flow in order, tracked on one transaction request.
+    A step builder returns the transaction details to sign, or None when the step isn't
+    needed (eg. allowance is already set) so it is skipped without asking the user to sign.
+    Returns a bool indicating if transaction signing is required.
+    """
+    for step, build_step in steps:
+        if transaction_request.step >= step:
+            continue
+
+        transaction_request.step = step
+        transaction_details = await build_step(transaction_request)
+        if transaction_details:
+            transaction_request.transaction_details = transaction_details
+            await transaction_request.asave()
+            return True
+
+    await transaction_request.asave()
+    return False
+
+
 async def validate_token(
     token_symbol: str,
     transaction_request: TransactionRequests,
@@ -59,14 +111,9 @@ async def check_and_build_allowance(
     token_symbol: str,
 ) -> Dict | None:
     """Check allowance and build approval transaction if needed"""
-    if token_address == SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS:
-        return None
-
-    w3 = await get_w3(IntChainId.Sonic)
-    contract = w3.eth.contract(address=token_address, abi=ABI.ERC20)
-    allowance = await contract.functions.allowance(user_address, spender_address).call()
-
-    if allowance < amount * 10**token_decimals:
+    if not await has_sufficient_allowance(
+        token_address, user_address, spender_address, amount, token_decimals
+    ):
         return await build_allowance_transaction(
             IntChainId.Sonic,
             user_address,
@@ -77,6 +124,23 @@ async def check_and_build_allowance(
     return None
 
 
+async def has_sufficient_allowance(
+    token_address: str,
+    user_address: str,
+    spender_address: str,
+    amount: float,
+    token_decimals: int,
+) -> bool:
+    if token_address == SONIC_NATIVE_TOKEN_PLACEHOLDER_ADDRESS:
+        return True
+
+    w3 = await get_w3(IntChainId.Sonic)
+    contract = get_contract(w3, token_address, ABI.ERC20)
+    allowance = await contract.functions.allowance(user_address, spender_address).call()
+
+    return allowance >= amount * 10**token_decimals
+
+
 async def build_allowance_transaction(
     chain_id: IntChainId,
     user_address: str,
@@ -85,12 +149,29 @@ async def build_allowance_transaction(
     token_symbol: str,
 ) -> Dict:
     w3 = await get_w3(chain_id)
-    contract = w3.eth.contract(address=token_address, abi=ABI.ERC20)
-    txn = await contract.functions.approve(
-        spender_address, 2**256 - 1
-    ).build_transaction({"from": user_address})
+    contract = get_contract(w3, token_address, ABI.ERC20)
+    txn = await build_transaction(
+        contract.functions.approve(spender_address, 2**256 - 1),
+        {"from": user_address},
+    )
 
     return {
         "transaction": txn,
         "description": f"Approving {abbreviate_evm_address(spender_address)} to spend {token_symbol}",
     }
+
+
+async def build_unwrap_native_transaction(
+    chain_id: IntChainId,
+    user_address: str,
+    wrapped_token_address: str,
+    amount_in_wei: int,
+) -> Dict:
+    w3 = await get_w3(chain_id)
+    contract = get_contract(w3, wrapped_token_address, ABI.WRAPPED_NATIVE)
+    # Built once the withdrawal returning the wrapped tokens is mined, a revert is real
+    return await build_transaction(
+        contract.functions.withdraw(amount_in_wei),
+        {"from": user_address},
+        fallback_gas=FALLBACK_UNWRAP_GAS,
+    )
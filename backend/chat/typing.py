@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, List, Optional
 from uuid import UUID
 from pydantic import BaseModel
@@ -23,13 +24,34 @@ class ProcessMessageRequest_(BaseModel):
 class ConversationResponse_(BaseModel):
     id: UUID
     messages: List[MessageDetails_]
+    # Index of the first returned message in the transcript, turns only return new messages
+    offset: int = 0
+    has_more: bool = False
     needs_txn_signing: bool = False
+    # Submitted transaction isn't mined yet, the flow continues once it is
+    pending_confirmation: bool = False
+
+
+class ConversationSummary_(BaseModel):
+    id: UUID
+    title: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class ConversationListResponse_(BaseModel):
+    conversations: List[ConversationSummary_]
+    next_cursor: Optional[str] = None
 
 
 class SubmitTransactionRequest_(BaseModel):
     signed_tx_hash: str
 
 
+class SubmitSignatureRequest_(BaseModel):
+    signature: str
+
+
 class SwapTransactionSteps(models.IntegerChoices):
     # States for Swapping token A to token B
     APPROVAL_A = 1
@@ -43,17 +65,33 @@ class SiloLendingDepositTxnSteps(models.IntegerChoices):
 
 class SiloLendingWithdrawTxnSteps(models.IntegerChoices):
     WITHDRAW = 1
+    # Silo router withdraws wS for native deposits, unwrap it back to S
+    UNWRAP = 2
 
 
 class SonicStakeTxnSteps(models.IntegerChoices):
     STAKE = 1
 
 
+class SwapAndLendTxnSteps(models.IntegerChoices):
+    SWAP_APPROVAL = 1
+    SWAP = 2
+    LEND_APPROVAL = 3
+    DEPOSIT = 4
+
+
 class TransactionFlows(models.IntegerChoices):
     SWAP = 0
     SILO_LENDING_DEPOSIT = 1
     SILO_LENDING_WITHDRAW = 2
     STAKE_SONIC = 3
+    SWAP_AND_LEND = 4
+
+
+class ApprovalModes(models.IntegerChoices):
+    ALLOWANCE = 0
+    # Tokens are pulled with an off-chain Permit2 signature bundled into the action
+    PERMIT2 = 1
 
 
 class TransactionStates(models.IntegerChoices):
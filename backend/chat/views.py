@@ -1,70 +1,120 @@
+import asyncio
+import base64
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.fields.json import KT
 
 from chaindata.evm.typing import TokenHoldings
 from chaindata.evm.token_balances import TokenHolding, get_sonic_token_holdings
+from chat.events import (
+    NOT_FOUND_CLOSE_CODE,
+    OVERFLOW_CLOSE_CODE,
+    build_transaction_event,
+    conversation_event_hub,
+)
+from chat.idempotency import run_idempotent
+from chat.locks import conversation_locks
+from chat.model_router import model_router
+from chat.prompt_prefix import prompt_prefix_stats
 from chat.models import Conversation, TransactionRequests
+from chat.response_cache import conversation_response_cache
+from tools.event_hub import SubscriptionOverflow
 from tools.privy import get_user_profile
+from tools.response_cache import build_etag, etag_response
 from chat.typing import (
     ChatResponse_,
+    ConversationListResponse_,
     ConversationResponse_,
+    ConversationSummary_,
     MessageDetails_,
     ProcessMessageRequest_,
+    SubmitSignatureRequest_,
     SubmitTransactionRequest_,
     TransactionStates,
 )
 from chat.llm_conversation import (
-    SYSTEM_PROMPT,
+    TransactionPendingError,
+    build_system_message,
     complete_conversation,
     is_user_wallet_funded,
+    submit_signed_permit,
     submit_signed_transaction,
 )
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+UNFUNDED_GREETING = "Hello! I'm here to help you get started on Sonic Chain. Let's get you set up. Please fund your wallet with natives on Base or Sonic chain."
+FUNDED_GREETING = """
+Hello! I can help you with the following to explore Sonic chain:
+- Swap tokens
+- Lend, withdraw tokens at the best yield
+- Stake Sonic native token S
+- get details about the airdrop
+        """
+
+MAX_PAGE_SIZE = 100
+# First user message of a thread, after the system prompt and the greeting
+TITLE_MESSAGE_INDEX = 2
+
 
 @router.post("/process_messages")
 async def process_message(
-    request: ProcessMessageRequest_, privy_user_id: str
+    request: ProcessMessageRequest_,
+    privy_user_id: str,
+    idempotency_key: Optional[str] = Header(None),
 ) -> ConversationResponse_:
-    # Get conversation, add new message and save
-    conversation = await Conversation.objects.aget(id=request.id)
-    conversation.messages.append({"role": "user", "content": request.user_message})
-    await conversation.asave()
+    async def execute() -> ConversationResponse_:
+        async with conversation_locks.hold(request.id):
+            # Get conversation, add new message and save
+            conversation = await Conversation.objects.aget(id=request.id)
+            offset = len(conversation.messages)
+            conversation.messages.append(
+                {"role": "user", "content": request.user_message}
+            )
+            await conversation.asave()
 
-    user_details = await get_user_profile(privy_user_id)
-    needs_txn_signing = await complete_conversation(conversation, user_details)
+            user_details = await get_user_profile(privy_user_id)
+            needs_txn_signing = await complete_conversation(conversation, user_details)
 
-    return ConversationResponse_(
-        id=conversation.id,
-        messages=await build_message_details(conversation),
-        needs_txn_signing=needs_txn_signing,
+            return ConversationResponse_(
+                id=conversation.id,
+                messages=await build_message_details(conversation, offset),
+                offset=offset,
+                needs_txn_signing=needs_txn_signing,
+            )
+
+    return await run_idempotent(
+        f"process_messages:{request.id}",
+        idempotency_key,
+        request.model_dump_json(),
+        execute,
+        ConversationResponse_,
     )
 
 
 @router.get("/new_thread", response_model=ConversationResponse_)
 async def new_thread(request: Request, privy_user_id: str) -> ConversationResponse_:
     user_details = await get_user_profile(privy_user_id)
-    is_wallet_funded = await is_user_wallet_funded(user_details)
-    if not is_wallet_funded:
-        assistant_message = "Hello! I'm here to help you get started on Sonic Chain. Let's get you set up. Please fund your wallet with natives on Base or Sonic chain."
-    else:
-        assistant_message = """
-Hello! I can help you with the following to explore Sonic chain:
-- Swap tokens
-- Lend, withdraw tokens at the best yield
-- Stake Sonic native token S
-- get details about the airdrop
-        """
+    is_wallet_funded = await is_user_wallet_funded(user_details, use_cache=True)
+    assistant_message = FUNDED_GREETING if is_wallet_funded else UNFUNDED_GREETING
 
     messages = [
-        {
-            "role": "system",
-            "content": SYSTEM_PROMPT,
-        },
+        build_system_message(),
         {
             "role": "assistant",
             "content": assistant_message,
@@ -74,9 +124,79 @@ Hello! I can help you with the following to explore Sonic chain:
         user_id=privy_user_id, messages=messages
     )
 
+    # A new thread has no transaction requests, skip the lookup of build_message_details
     return ConversationResponse_(
-        id=conversation.id, messages=await build_message_details(conversation)
+        id=conversation.id,
+        messages=[
+            MessageDetails_(role=message["role"], content=message.get("content"))
+            for message in messages
+        ],
+    )
+
+
+@router.get("/conversations", response_model=ConversationListResponse_)
+async def list_conversations(
+    privy_user_id: str, cursor: Optional[str] = None, limit: int = 20
+) -> ConversationListResponse_:
+    """Conversations of the user, most recently updated first"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    conversations = Conversation.objects.filter(user_id=privy_user_id)
+    if cursor:
+        try:
+            updated_at, conversation_id = parse_conversation_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        conversations = conversations.filter(
+            Q(updated_at__lt=updated_at)
+            | Q(updated_at=updated_at, id__lt=conversation_id)
+        )
+
+    rows = [
+        row
+        async for row in conversations.order_by("-updated_at", "-id")
+        .annotate(title=KT(f"messages__{TITLE_MESSAGE_INDEX}__content"))
+        .values("id", "title", "created_at", "updated_at")[: limit + 1]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = build_conversation_cursor(rows[-1]["updated_at"], rows[-1]["id"])
+
+    return ConversationListResponse_(
+        conversations=[ConversationSummary_(**row) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/conversations/{conversation_id}/messages",
+    response_model=ConversationResponse_,
+)
+async def get_messages(
+    request: Request, conversation_id: str, since: int = 0, limit: int = 50
+):
+    """Page of the transcript starting at message index `since`"""
+    since = max(since, 0)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cache_key = ("messages", since, limit)
+    if cached := conversation_response_cache.get(conversation_id.lower(), cache_key):
+        return etag_response(request, *cached)
+
+    try:
+        conversation = await Conversation.objects.aget(id=conversation_id)
+    except Conversation.DoesNotExist:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    response = ConversationResponse_(
+        id=conversation.id,
+        messages=await build_message_details(conversation, since, limit),
+        offset=since,
+        has_more=since + limit < len(conversation.messages),
     )
+    etag = build_etag(conversation.version)
+    conversation_response_cache.set(str(conversation.id), cache_key, etag, response)
+    return etag_response(request, etag, response)
 
 
 @router.get(
@@ -84,6 +204,10 @@ Hello! I can help you with the following to explore Sonic chain:
 )
 async def get_pending_transaction(request: Request, conversation_id: str):
     """Get pending transaction for a conversation"""
+    cache_key = "pending_transaction"
+    if cached := conversation_response_cache.get(conversation_id.lower(), cache_key):
+        return etag_response(request, *cached)
+
     try:
         conversation = await Conversation.objects.aget(id=conversation_id)
     except Conversation.DoesNotExist:
@@ -94,41 +218,194 @@ async def get_pending_transaction(request: Request, conversation_id: str):
             conversation=conversation, state=TransactionStates.PROCESSING
         )
     except TransactionRequests.DoesNotExist:
-        raise HTTPException(
-            status_code=404, detail="No pending transaction found for conversation"
+        # Nothing to sign is what most polls see, cache it too. Creating a request
+        # invalidates the conversation's responses.
+        response = {"detail": "No pending transaction found for conversation"}
+        etag = build_etag(conversation.version)
+        conversation_response_cache.set(
+            str(conversation.id), cache_key, etag, response, status_code=404
         )
+        return etag_response(request, etag, response, status_code=404)
     except TransactionRequests.MultipleObjectsReturned:
         raise HTTPException(
             status_code=409,
             detail="Multiple pending transactions found for conversation",
         )
 
-    return {"transaction_details": transaction_request.transaction_details}
+    response = {"transaction_details": transaction_request.transaction_details}
+    etag = build_etag(conversation.version, transaction_request.version)
+    conversation_response_cache.set(str(conversation.id), cache_key, etag, response)
+    return etag_response(request, etag, response)
 
 
 @router.post(
     "/conversations/{conversation_id}/submit_transaction",
 )
 async def submit_transaction(
-    request: SubmitTransactionRequest_, conversation_id: str
+    request: SubmitTransactionRequest_,
+    conversation_id: str,
+    idempotency_key: Optional[str] = Header(None),
 ) -> ConversationResponse_:
     """Submit a signed transaction hash and continue the conversation"""
-    try:
-        conversation = await Conversation.objects.aget(id=conversation_id)
-    except Conversation.DoesNotExist:
-        raise HTTPException(status_code=404, detail="Conversation not found")
 
-    needs_txn_signing = await submit_signed_transaction(
-        conversation, request.signed_tx_hash
+    async def execute() -> ConversationResponse_:
+        try:
+            conversation = await Conversation.objects.aget(id=conversation_id)
+        except Conversation.DoesNotExist:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+
+        offset = len(conversation.messages)
+        try:
+            needs_txn_signing = await submit_signed_transaction(
+                conversation, request.signed_tx_hash
+            )
+        except TransactionPendingError:
+            return ConversationResponse_(
+                id=conversation.id,
+                messages=await build_message_details(conversation, offset),
+                offset=offset,
+                pending_confirmation=True,
+            )
+        except ValueError as e:
+            # eg. a transaction hash posted while a Permit2 signature is expected
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return ConversationResponse_(
+            id=conversation.id,
+            messages=await build_message_details(conversation, offset),
+            offset=offset,
+            needs_txn_signing=needs_txn_signing,
+        )
+
+    # Pending responses aren't replayed, the retry re-arms the wait for the receipt
+    return await run_idempotent(
+        f"submit_transaction:{conversation_id.lower()}",
+        idempotency_key,
+        request.model_dump_json(),
+        execute,
+        ConversationResponse_,
+        is_final=lambda response: not response.pending_confirmation,
     )
 
+
+@router.post(
+    "/conversations/{conversation_id}/submit_signature",
+)
+async def submit_signature(
+    request: SubmitSignatureRequest_, conversation_id: str
+) -> ConversationResponse_:
+    """Submit an off-chain signature (eg. Permit2) requested by the pending transaction"""
+    async with conversation_locks.hold(conversation_id):
+        try:
+            conversation = await Conversation.objects.aget(id=conversation_id)
+        except Conversation.DoesNotExist:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+
+        offset = len(conversation.messages)
+        try:
+            needs_txn_signing = await submit_signed_permit(
+                conversation, request.signature
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     return ConversationResponse_(
         id=conversation.id,
-        messages=await build_message_details(conversation),
+        messages=await build_message_details(conversation, offset),
+        offset=offset,
         needs_txn_signing=needs_txn_signing,
     )
 
 
+@router.websocket("/conversations/{conversation_id}/ws")
+async def conversation_updates(
+    websocket: WebSocket, conversation_id: str, offset: int = 0
+):
+    """
+    Pushes new messages, signing requests and transaction confirmations of a conversation.
+    `offset` is the index of the next message the client expects, so a reconnecting client
+    resumes where it left off. Clients that fall behind are closed with OVERFLOW_CLOSE_CODE.
+    """
+    await websocket.accept()
+    # Subscribe before the catch up reads so updates landing in between aren't missed
+    subscription = conversation_event_hub.subscribe(conversation_id.lower())
+    try:
+        try:
+            conversation = await Conversation.objects.aget(id=conversation_id)
+        except (Conversation.DoesNotExist, ValidationError):
+            await websocket.close(
+                code=NOT_FOUND_CLOSE_CODE, reason="Conversation not found"
+            )
+            return
+
+        offset = await send_new_messages(websocket, conversation, max(offset, 0))
+        transaction_request = await TransactionRequests.objects.filter(
+            conversation=conversation, state=TransactionStates.PROCESSING
+        ).afirst()
+        if transaction_request is not None:
+            event = build_transaction_event(
+                {
+                    "state": transaction_request.state,
+                    "transaction_details": transaction_request.transaction_details,
+                    "pending_tx_hash": transaction_request.pending_tx_hash,
+                    "signed_tx_hash": transaction_request.signed_tx_hash,
+                    "failed_reason": transaction_request.failed_reason,
+                }
+            )
+            if event is not None:
+                await websocket.send_json(event)
+
+        async def forward_events():
+            nonlocal offset
+            while True:
+                event = await subscription.get()
+                if event["type"] == "conversation_updated":
+                    await conversation.arefresh_from_db()
+                    offset = await send_new_messages(websocket, conversation, offset)
+                elif transaction_event := build_transaction_event(event):
+                    await websocket.send_json(transaction_event)
+
+        async def wait_for_disconnect():
+            # Nothing is expected from the client, this only notices it going away
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        tasks = [
+            asyncio.create_task(forward_events()),
+            asyncio.create_task(wait_for_disconnect()),
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+
+        for task in done:
+            error = task.exception()
+            if isinstance(error, SubscriptionOverflow):
+                await websocket.close(
+                    code=OVERFLOW_CLOSE_CODE, reason=f"Resume from offset {offset}"
+                )
+            elif error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        subscription.close()
+
+
+async def send_new_messages(
+    websocket: WebSocket, conversation: Conversation, offset: int
+) -> int:
+    """Sends messages from `offset` on and returns the offset after them"""
+    messages = await build_message_details(conversation, offset)
+    if messages:
+        await websocket.send_json(
+            {
+                "type": "messages",
+                "offset": offset,
+                "messages": [message.model_dump() for message in messages],
+            }
+        )
+    return offset + len(messages)
+
+
 @router.get(
     "/sonic_holdings",
 )
@@ -138,21 +415,56 @@ async def get_sonic_holdings(request: Request, privy_user_id: str) -> TokenHoldi
     return await get_sonic_token_holdings(user_details.evm_wallet_address)
 
 
-async def build_message_details(conversation: Conversation) -> List[MessageDetails_]:
+@router.get("/llm_stats")
+async def llm_stats() -> dict:
+    """
+    Calls, fallbacks, latency, tokens and cost of this worker per model route, how much
+    of the prompts was the shared prompt prefix and the state of the request queue
+    """
+    return {
+        **model_router.stats(),
+        "prompt_prefix": prompt_prefix_stats(),
+        "limiter": model_router.limiter.stats(),
+    }
+
+
+def build_conversation_cursor(updated_at: datetime, conversation_id) -> str:
+    """Opaque and url safe, the `+` of the timestamp's offset would read as a space"""
+    payload = f"{updated_at.isoformat()}_{conversation_id}"
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def parse_conversation_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """ValueError for anything `build_conversation_cursor` didn't produce"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    payload = base64.urlsafe_b64decode(padded.encode()).decode()
+    updated_at, _, conversation_id = payload.rpartition("_")
+    return datetime.fromisoformat(updated_at), UUID(conversation_id)
+
+
+async def build_message_details(
+    conversation: Conversation, offset: int = 0, limit: Optional[int] = None
+) -> List[MessageDetails_]:
     """
     Transaction requests stores signed txn hash and tool call id. The first assistant message after tool call request should have the txn hash.
+    Only messages from `offset` (up to `limit` of them) are returned.
     """
+    end = len(conversation.messages) if limit is None else offset + limit
+    if offset >= len(conversation.messages):
+        return []
+
     signed_txn_hash_by_tool_call_id = {}
     async for transaction_request in TransactionRequests.objects.filter(
         conversation=conversation, state=TransactionStates.COMPLETED
-    ):
-        signed_txn_hash_by_tool_call_id[transaction_request.tool_call_id] = (
-            transaction_request.signed_tx_hash
+    ).values("tool_call_id", "signed_tx_hash"):
+        signed_txn_hash_by_tool_call_id[transaction_request["tool_call_id"]] = (
+            transaction_request["signed_tx_hash"]
         )
 
     tool_call_id = None
     message_details = []
-    for message in conversation.messages:
+    # Walk from the start, the tool call a message belongs to may be before the page
+    for index, message in enumerate(conversation.messages[:end]):
         current_tx_hash = None
 
         if message.get("tool_calls"):
@@ -161,6 +473,9 @@ async def build_message_details(conversation: Conversation) -> List[MessageDetai
             current_tx_hash = signed_txn_hash_by_tool_call_id.get(tool_call_id)
             tool_call_id = None  # Reset after using it
 
+        if index < offset:
+            continue
+
         message_details.append(
             MessageDetails_(
                 role=message["role"],
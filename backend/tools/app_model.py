@@ -55,3 +55,42 @@ class TimeTrackedModel(AppModel):
 
     class Meta(AppModel.Meta):
         abstract = True
+
+
+class StaleVersionError(Exception):
+    """The row was saved by someone else after this instance was read"""
+
+
+class VersionedModel(AppModel):
+    """
+    Bumps `version` on every save, so readers can tell if a row changed without diffing it.
+    Saves are optimistic, they only overwrite the version the instance was read at and raise
+    StaleVersionError otherwise instead of silently losing the other write.
+    """
+
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta(AppModel.Meta):
+        abstract = True
+
+    def bump_version(self):
+        self.version += 1
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+
+        self.bump_version()
+        try:
+            super().save(*args, **kwargs)
+        except StaleVersionError:
+            self.version -= 1
+            raise
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if base_qs.filter(pk=pk_val, version=self.version - 1)._update(values) > 0:
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise StaleVersionError(f"{self} was updated concurrently")
+        return False
@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter
+from typing import List, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "i", "in", "is", "it", "its", "me", "my", "of", "on", "or",
+    "the", "their", "they", "this", "to", "what", "when", "where", "which", "who",
+    "will", "with", "you", "your",
+}  # fmt: skip
+
+# Crude suffix folding so "calculated" finds "calculation" and "gems" finds "gem"
+SUFFIXES = ("ation", "ated", "ate", "ing", "ed", "es", "s")
+
+
+def stem(token: str) -> str:
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith("ss"):
+                return token
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(stem(token))
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 ranking over a small in-memory corpus, built once and read only"""
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(document)) for document in documents]
+        self._lengths = [sum(term_freqs.values()) for term_freqs in self._term_freqs]
+        self._avg_length = sum(self._lengths) / max(len(documents), 1)
+
+        document_freqs = Counter()
+        for term_freqs in self._term_freqs:
+            document_freqs.update(term_freqs.keys())
+        self._idf = {
+            term: math.log(1 + (len(documents) - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_freqs.items()
+        }
+
+    def score(self, query: str) -> List[float]:
+        terms = set(tokenize(query))
+        scores = []
+        for term_freqs, length in zip(self._term_freqs, self._lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            score = 0.0
+            for term in terms:
+                freq = term_freqs.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Indexes and scores of the `k` best matching documents, non matching ones left out"""
+        ranked = sorted(enumerate(self.score(query)), key=lambda item: -item[1])
+        return [(index, score) for index, score in ranked[:k] if score > 0]
@@ -0,0 +1,44 @@
+from typing import Dict
+
+from asgiref.sync import sync_to_async
+from django.db import connections, models, transaction
+
+from tools.app_model import VersionedModel
+
+
+def _save_atomic(*instances: models.Model) -> None:
+    versions = [getattr(instance, "version", None) for instance in instances]
+    try:
+        with transaction.atomic():
+            for instance in instances:
+                instance.save()
+    except Exception:
+        # The transaction rolled back the rows, the instances are at their read version
+        for instance, version in zip(instances, versions):
+            if isinstance(instance, VersionedModel):
+                instance.version = version
+        raise
+
+
+async def asave_atomic(*instances: models.Model) -> None:
+    """
+    Saves model instances in a single transaction, `save()` under `atomic()` on the ORM's
+    pooled connection. VersionedModel instances raise StaleVersionError as with `save()`.
+    Django has no async `atomic()`, so the transaction still runs on the sync thread,
+    the pool only saves opening a connection for it.
+    """
+    await sync_to_async(_save_atomic)(*instances)
+
+
+def get_db_pool_stats() -> Dict[str, float]:
+    """Gauges of the ORM's connection pool plus the mean time requests waited for one"""
+    pool = getattr(connections["default"], "pool", None)
+    if pool is None:
+        return {}
+
+    stats = {f"db.pool.{name}": value for name, value in pool.get_stats().items()}
+    requests = stats.get("db.pool.requests_num", 0)
+    stats["db.pool.mean_wait_ms"] = (
+        stats.get("db.pool.requests_wait_ms", 0) / requests if requests else 0
+    )
+    return stats
@@ -0,0 +1,95 @@
+import asyncio
+import os
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from tools.metrics import incr
+
+EVENT_QUEUE_MAX_SIZE = int(os.getenv("EVENT_QUEUE_MAX_SIZE", 100))
+
+
+class SubscriptionOverflow(Exception):
+    """Subscriber fell too far behind and missed events, it has to resume from its offset"""
+
+
+class Subscription:
+    def __init__(self, hub: "EventHub", topic: str, max_size: int):
+        self.hub = hub
+        self.topic = topic
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    def _put(self, event: Any) -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Don't buffer without bound for a slow client, cut it off instead
+            incr("event_hub.overflows")
+            self.overflowed = True
+            self._wake()
+
+    def _wake(self) -> None:
+        # Unblock a pending `get()` so it can raise
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Any:
+        event = await self._queue.get()
+        if self.overflowed:
+            raise SubscriptionOverflow()
+        return event
+
+    def close(self) -> None:
+        self.hub._unsubscribe(self)
+
+
+class EventHub:
+    """
+    In-process fan out of events per topic (eg. a conversation id) with a bounded queue per
+    subscriber. Publishing is thread safe, so django signals fired from the ORM's sync
+    thread can publish too.
+    """
+
+    def __init__(self, max_queue_size: int = EVENT_QUEUE_MAX_SIZE):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, topic: str) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self, topic, self.max_queue_size)
+        self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def publish(self, topic: str, event: Any) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            self._publish(topic, event)
+        else:
+            self._loop.call_soon_threadsafe(self._publish, topic, event)
+
+    def _publish(self, topic: str, event: Any) -> None:
+        for subscription in list(self._subscriptions.get(topic, ())):
+            incr("event_hub.published")
+            subscription._put(event)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscriptions.get(topic, ()))
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.topic)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.topic]
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from tools.metrics import get_counters, incr
+
+# Waiters of a higher priority are always served first
+HIGH_PRIORITY = 0
+NORMAL_PRIORITY = 1
+
+
+class FairLimiter:
+    """
+    At most `limit` holders at a time. Waiters queue per key (eg. a user) and keys take
+    turns, so one key with many requests can't starve the others. `pause` stops handing
+    out slots until a provider's retry-after has passed, holders already running keep
+    theirs.
+    """
+
+    def __init__(self, namespace: str, limit: int):
+        self.namespace = namespace
+        self.limit = limit
+        self.active = 0
+        self.paused_until = 0.0
+        # Per priority, the waiting futures of each key in the order keys get served
+        self._queues: Dict[int, OrderedDict[str, Deque[asyncio.Future]]] = {
+            HIGH_PRIORITY: OrderedDict(),
+            NORMAL_PRIORITY: OrderedDict(),
+        }
+        self._resume_handle: Optional[asyncio.TimerHandle] = None
+
+    @asynccontextmanager
+    async def hold(
+        self, key: str = "", priority: int = NORMAL_PRIORITY
+    ) -> AsyncIterator[None]:
+        started = time.perf_counter()
+        if self.active < self.limit and not self.queue_depth() and not self.paused():
+            self.active += 1
+        else:
+            incr(f"limiter.{self.namespace}.queued")
+            waiter = asyncio.get_running_loop().create_future()
+            self._queues[priority].setdefault(key, deque()).append(waiter)
+            # Schedules the resume when the limiter is paused with nothing running
+            self._dispatch()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted right before the cancellation, hand the slot on
+                    self._release()
+                else:
+                    self._remove(priority, key, waiter)
+                raise
+
+        incr(f"limiter.{self.namespace}.acquired")
+        incr(
+            f"limiter.{self.namespace}.wait_ms", (time.perf_counter() - started) * 1000
+        )
+        try:
+            yield
+        finally:
+            self._release()
+
+    def pause(self, seconds: float) -> None:
+        """No new slots for `seconds`, eg. the retry-after of a rate limited request"""
+        incr(f"limiter.{self.namespace}.paused")
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def paused(self) -> bool:
+        return time.monotonic() < self.paused_until
+
+    def queue_depth(self) -> int:
+        return sum(
+            len(waiters)
+            for queue in self._queues.values()
+            for waiters in queue.values()
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """Current occupancy and queue, with the wait counters and mean wait per slot"""
+        prefix = f"limiter.{self.namespace}."
+        stats = {
+            name[len(prefix) :]: value for name, value in get_counters(prefix).items()
+        }
+        if stats.get("acquired"):
+            stats["mean_wait_ms"] = stats["wait_ms"] / stats["acquired"]
+        return {
+            **stats,
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.queue_depth(),
+            "queued_keys": sum(len(queue) for queue in self._queues.values()),
+            "paused_seconds": max(self.paused_until - time.monotonic(), 0),
+        }
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self.paused():
+            if self._resume_handle is None:
+                self._resume_handle = asyncio.get_running_loop().call_later(
+                    self.paused_until - time.monotonic(), self._resume
+                )
+            return
+
+        while self.active < self.limit and (waiter := self._next_waiter()):
+            self.active += 1
+            waiter.set_result(None)
+
+    def _resume(self) -> None:
+        self._resume_handle = None
+        self._dispatch()
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """First waiter of the next key in line, the key then moves to the back"""
+        for queue in self._queues.values():
+            while queue:
+                key, waiters = next(iter(queue.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    queue.move_to_end(key)
+                else:
+                    del queue[key]
+                if not waiter.done():
+                    return waiter
+        return None
+
+    def _remove(self, priority: int, key: str, waiter: asyncio.Future) -> None:
+        waiters = self._queues[priority].get(key)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[priority][key]
@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict
+
+from django.db import connection
+
+from tools.metrics import incr
+
+
+@dataclass
+class _LockEntry:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Holders and waiters, the entry is dropped once nobody references it
+    users: int = 0
+
+
+class KeyedLock:
+    """
+    Mutual exclusion per key (eg. a conversation id) that never blocks other keys.
+    In process it is an asyncio.Lock per key. With `advisory=True` the holder also takes a
+    postgres advisory lock, so workers of other processes are excluded too. That pins a
+    thread and a pooled connection for as long as the lock is held, size the pool
+    accordingly.
+    """
+
+    def __init__(self, namespace: str, advisory: bool = False):
+        self.namespace = namespace
+        self.advisory = advisory
+        self._entries: Dict[str, _LockEntry] = {}
+
+    @asynccontextmanager
+    async def hold(self, key) -> AsyncIterator[None]:
+        key = str(key).lower()
+        entry = self._entries.setdefault(key, _LockEntry())
+        entry.users += 1
+        started = time.perf_counter()
+        try:
+            if entry.lock.locked():
+                incr(f"locks.{self.namespace}.contended")
+            async with entry.lock:
+                if self.advisory:
+                    async with self._hold_advisory(key):
+                        self._record_wait(started)
+                        yield
+                else:
+                    self._record_wait(started)
+                    yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del self._entries[key]
+
+    @asynccontextmanager
+    async def _hold_advisory(self, key: str) -> AsyncIterator[None]:
+        lock_id = self.advisory_lock_id(key)
+        # Session level lock, the unlock has to run on the connection, ie. the thread,
+        # that took it
+        executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        acquired = False
+        try:
+            await loop.run_in_executor(executor, _advisory_lock, lock_id)
+            acquired = True
+            yield
+        finally:
+            if acquired:
+                await loop.run_in_executor(executor, _advisory_unlock, lock_id)
+            else:
+                # Cancelled while waiting, unlocks once the pending lock call returns
+                executor.submit(_advisory_unlock, lock_id)
+            executor.shutdown(wait=False)
+
+    def advisory_lock_id(self, key: str) -> int:
+        digest = hashlib.sha256(f"{self.namespace}:{key}".encode()).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
+    def _record_wait(self, started: float) -> None:
+        incr(f"locks.{self.namespace}.acquired")
+        incr(f"locks.{self.namespace}.wait_ms", (time.perf_counter() - started) * 1000)
+
+
+def _advisory_lock(lock_id: int) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [lock_id])
+
+
+def _advisory_unlock(lock_id: int) -> None:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+    finally:
+        # Hands the thread's connection back to the pool
+        connection.close()
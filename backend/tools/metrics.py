@@ -0,0 +1,13 @@
+from collections import defaultdict
+from typing import Dict
+
+_COUNTERS: Dict[str, float] = defaultdict(float)
+
+
+def incr(name: str, value: float = 1) -> None:
+    """Increment an in-process counter. Counters are per worker and reset on restart."""
+    _COUNTERS[name] += value
+
+
+def get_counters(prefix: str = "") -> Dict[str, float]:
+    return {name: value for name, value in _COUNTERS.items() if name.startswith(prefix)}
@@ -3,6 +3,8 @@ import asyncio
 import base64
 from typing import Any, Dict
 
+from aiocache import cached
+
 from tools.typing import UserDetails
 from tools.http import req_get
 
@@ -10,6 +12,12 @@ PRIVY_APP_ID = os.getenv("PRIVY_APP_ID")
 PRIVY_APP_SECRET = os.getenv("PRIVY_APP_SECRET")
 
 
+# Embedded wallets don't change once created, but a new user may not have one yet
+@cached(
+    ttl=3600,
+    namespace="privy_user_profiles",
+    skip_cache_func=lambda profile: profile.evm_wallet_address is None,
+)
 async def get_user_profile(user_privy_id: str) -> UserDetails:
     user_details = await get_user_details(user_privy_id)
     evm_wallet_address, solana_wallet_address = _get_wallet_addresses(user_details)
@@ -0,0 +1,84 @@
+import os
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from tools.metrics import incr
+
+# Bounds staleness across workers, writes only invalidate the cache of their own process
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL", 5))
+RESPONSE_CACHE_MAX_SCOPES = int(os.getenv("RESPONSE_CACHE_MAX_SCOPES", 10000))
+
+
+class ResponseCache:
+    """
+    Latest response body, its ETag and status per (scope, key), eg. (conversation id,
+    endpoint). Not found answers of a polled resource are worth caching too.
+    Writers invalidate a whole scope so the next read goes back to the database.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+        max_scopes: int = RESPONSE_CACHE_MAX_SCOPES,
+    ):
+        self.ttl = ttl
+        self.max_scopes = max_scopes
+        self._entries: Dict[str, Dict[Hashable, Tuple[str, Any, int, float]]] = {}
+
+    def get(self, scope: str, key: Hashable) -> Optional[Tuple[str, Any, int]]:
+        entry = self._entries.get(scope, {}).get(key)
+        if entry is None or entry[3] < time.monotonic():
+            incr("response_cache.miss")
+            return None
+
+        incr("response_cache.hit")
+        return entry[0], entry[1], entry[2]
+
+    def set(
+        self, scope: str, key: Hashable, etag: str, body: Any, status_code: int = 200
+    ) -> None:
+        if scope not in self._entries and len(self._entries) >= self.max_scopes:
+            self._prune()
+        self._entries.setdefault(scope, {})[key] = (
+            etag,
+            body,
+            status_code,
+            time.monotonic() + self.ttl,
+        )
+
+    def invalidate(self, scope: str) -> None:
+        self._entries.pop(scope, None)
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for scope in list(self._entries):
+            entries = self._entries[scope]
+            for key in [key for key, entry in entries.items() if entry[3] < now]:
+                del entries[key]
+            if not entries:
+                del self._entries[scope]
+
+        # Still full of live entries, drop the oldest scopes
+        while len(self._entries) >= self.max_scopes:
+            del self._entries[next(iter(self._entries))]
+
+
+def build_etag(*versions: int) -> str:
+    return 'W/"' + "-".join(str(version) for version in versions) + '"'
+
+
+def etag_response(
+    request: Request, etag: str, body: Any, status_code: int = 200
+) -> Response:
+    """304 when the client already has this version, otherwise the body with its ETag"""
+    if status_code == 200 and request.headers.get("if-none-match") == etag:
+        incr("response_cache.not_modified")
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return JSONResponse(
+        content=jsonable_encoder(body), status_code=status_code, headers={"ETag": etag}
+    )
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+from tools.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process when competing for job leases
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobStore(Protocol):
+    """Shared state letting one worker refresh a job while the others reuse its result"""
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool: ...
+
+    async def save_snapshot(self, name: str, data: Any) -> None: ...
+
+    async def load_snapshot(self, name: str) -> Optional[Tuple[Any, float]]: ...
+
+
+@dataclass
+class Job:
+    name: str
+    # Produces json serializable data, eg. by calling an external api
+    fetch: Callable[[], Awaitable[Any]]
+    # Installs fetched data into the in-process cache read by request handlers
+    apply: Callable[[Any], None]
+    interval: float
+    jitter: float = 0.1
+    # Jobs whose data `fetch` reads, `run_all` refreshes them first
+    depends_on: Tuple[str, ...] = ()
+
+    runs: int = 0
+    failures: int = 0
+    last_run_at: Optional[float] = None
+    last_success_at: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    # "fetched" by this worker or loaded from the leader's "snapshot"
+    last_source: Optional[str] = None
+    snapshot_refreshed_at: Optional[float] = None
+
+    def next_delay(self) -> float:
+        # Spread refreshes so jobs and workers don't hit upstream apis in lockstep
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "last_success_at": self.last_success_at,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "last_source": self.last_source,
+        }
+
+
+class Scheduler:
+    """
+    Runs periodic refresh jobs in the background of each worker. With a `store`, only the
+    worker holding a job's lease fetches it, the others apply the snapshot it saved.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None):
+        self.store = store
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        apply: Callable[[Any], None],
+        interval: float,
+        jitter: float = 0.1,
+        depends_on: Tuple[str, ...] = (),
+    ) -> Job:
+        job = Job(
+            name=name,
+            fetch=fetch,
+            apply=apply,
+            interval=interval,
+            jitter=jitter,
+            depends_on=depends_on,
+        )
+        self._jobs[name] = job
+        return job
+
+    async def run_job(self, job: Job) -> None:
+        """One refresh of the job, failures keep the data of the previous run"""
+        started = time.perf_counter()
+        job.runs += 1
+        job.last_run_at = time.time()
+        try:
+            await self._refresh(job)
+        except Exception as e:
+            job.failures += 1
+            job.last_error = repr(e)
+            incr(f"scheduler.{job.name}.failures")
+            logger.exception(f"Scheduled job {job.name} failed")
+        else:
+            job.last_success_at = time.time()
+            job.last_error = None
+        finally:
+            job.last_duration = time.perf_counter() - started
+
+    async def _refresh(self, job: Job) -> None:
+        # Lease outlives the interval so the leader keeps it across its own runs
+        if self.store is None or await self.store.acquire_lease(
+            job.name, WORKER_ID, job.interval * 2
+        ):
+            data = await job.fetch()
+            job.apply(data)
+            job.last_source = "fetched"
+            if self.store is not None:
+                await self.store.save_snapshot(job.name, data)
+            return
+
+        snapshot = await self.store.load_snapshot(job.name)
+        if snapshot is None:
+            # Leader hasn't produced anything yet, don't stay cold until it does
+            job.apply(await job.fetch())
+            job.last_source = "fetched"
+            return
+
+        data, refreshed_at = snapshot
+        if refreshed_at != job.snapshot_refreshed_at:
+            job.apply(data)
+            job.snapshot_refreshed_at = refreshed_at
+        job.last_source = "snapshot"
+
+    async def run_all(self) -> None:
+        """Runs every job once, concurrently except where a job depends on another"""
+        runs: Dict[str, asyncio.Future] = {}
+
+        def run(job: Job) -> asyncio.Future:
+            if job.name not in runs:
+                dependencies = [run(self._jobs[name]) for name in job.depends_on]
+                runs[job.name] = asyncio.ensure_future(
+                    self._run_after(job, dependencies)
+                )
+            return runs[job.name]
+
+        await asyncio.gather(*[run(job) for job in self._jobs.values()])
+
+    async def _run_after(self, job: Job, dependencies: List[asyncio.Future]) -> None:
+        await asyncio.gather(*dependencies)
+        await self.run_job(job)
+
+    def start(self, run_immediately: bool = True) -> None:
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job, run_immediately)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, job: Job, run_immediately: bool) -> None:
+        if not run_immediately:
+            await asyncio.sleep(job.next_delay())
+        while True:
+            await self.run_job(job)
+            await asyncio.sleep(job.next_delay())
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "worker_id": WORKER_ID,
+            "backend": "memory" if self.store is None else type(self.store).__name__,
+            "jobs": {name: job.status() for name, job in self._jobs.items()},
+        }
+
+
+scheduler = Scheduler()
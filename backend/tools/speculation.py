@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from tools.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+# Started calls not yet claimed, keyed by function and arguments
+_PENDING: Dict[Tuple, asyncio.Task] = {}
+
+
+def _key(fn: Callable, args: Tuple) -> Tuple:
+    return (fn.__module__, fn.__qualname__, *args)
+
+
+class Speculation:
+    """
+    Read only calls started before we know they are needed. A later `speculated` call of
+    the same function with the same arguments takes over the running call, whatever is
+    left unclaimed is cancelled by `discard`.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Tuple, asyncio.Task] = {}
+        self._discarded = False
+
+    def start(self, fn: Callable[..., Awaitable[Any]], *args) -> asyncio.Task:
+        key = _key(fn, args)
+        if key in _PENDING:
+            return _PENDING[key]
+        incr("speculation.started")
+        task = asyncio.create_task(fn(*args))
+        self._tasks[key] = _PENDING[key] = task
+        return task
+
+    def start_after(
+        self,
+        condition: asyncio.Task,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        when: Callable[[Any], bool] = bool,
+    ) -> None:
+        """
+        Starts `fn(*args)` once `when` holds for the result of the `condition` call, for
+        calls only worth making if an earlier speculative check passes
+        """
+
+        def on_done(task: asyncio.Task) -> None:
+            if self._discarded or task.cancelled() or task.exception() is not None:
+                return
+            if when(task.result()):
+                self.start(fn, *args)
+            else:
+                incr("speculation.skipped")
+
+        condition.add_done_callback(on_done)
+
+    def discard(self) -> None:
+        self._discarded = True
+        for key, task in self._tasks.items():
+            if _PENDING.get(key) is task:
+                del _PENDING[key]
+                incr("speculation.discarded")
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Nobody awaits it anymore, don't log a failure as never retrieved
+                    task.exception()
+        self._tasks.clear()
+
+
+async def speculated(fn: Callable[..., Awaitable[Any]], *args) -> Any:
+    """`fn(*args)`, taking over a speculative call with the same arguments if one runs"""
+    task = _PENDING.pop(_key(fn, args), None)
+    if task is None:
+        return await fn(*args)
+
+    try:
+        result = await task
+    except Exception as e:
+        # Might have been transient, the real call decides
+        incr("speculation.failed")
+        logger.warning(f"Speculative {fn.__qualname__} failed, calling again: {e!r}")
+        return await fn(*args)
+
+    incr("speculation.hit")
+    return result
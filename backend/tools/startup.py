@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from tools.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+# Past this the worker reports ready anyway, handlers fall back to filling caches inline
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT", 60))
+
+
+class StartupState:
+    def __init__(self):
+        self.ready = False
+        self.started_at = time.time()
+        self.warmup_duration = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "warmup_duration": self.warmup_duration,
+            "steps": self.steps,
+        }
+
+
+startup_state = StartupState()
+
+
+async def run_warmup(
+    steps: Dict[str, Callable[[], Awaitable[Any]]],
+    timeout: float = WARMUP_TIMEOUT_SECONDS,
+) -> None:
+    """Runs the warm up steps concurrently, then marks the worker ready"""
+    started = time.perf_counter()
+
+    async def run_step(name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        step_started = time.perf_counter()
+        startup_state.steps[name] = {"status": "running"}
+        try:
+            await step()
+        except Exception as e:
+            incr(f"startup.{name}.failures")
+            logger.exception(f"Warm up step {name} failed")
+            startup_state.steps[name] = {"status": "failed", "error": repr(e)}
+        else:
+            startup_state.steps[name] = {"status": "ok"}
+        startup_state.steps[name]["duration"] = time.perf_counter() - step_started
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*[run_step(name, step) for name, step in steps.items()]),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Warm up didn't finish within {timeout}s")
+        for step in startup_state.steps.values():
+            if step["status"] == "running":
+                step["status"] = "timed_out"
+
+    startup_state.warmup_duration = time.perf_counter() - started
+    startup_state.ready = True
+    logger.info(f"Warm up finished in {startup_state.warmup_duration:.2f}s")
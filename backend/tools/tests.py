@@ -0,0 +1,245 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from tools.bm25 import BM25Index, tokenize
+from tools.limiter import HIGH_PRIORITY, FairLimiter
+from tools.locks import KeyedLock
+from tools.scheduler import Scheduler
+from tools.speculation import Speculation, speculated
+
+
+class KeyedLockTests(SimpleTestCase):
+    def setUp(self):
+        self.locks = KeyedLock("test")
+
+    async def test_holders_of_a_key_run_one_at_a_time(self):
+        events = []
+
+        async def turn(name):
+            async with self.locks.hold("conversation"):
+                events.append(f"{name} start")
+                await asyncio.sleep(0)
+                events.append(f"{name} end")
+
+        await asyncio.gather(turn("first"), turn("second"))
+        self.assertEqual(
+            events, ["first start", "first end", "second start", "second end"]
+        )
+
+    async def test_keys_dont_block_each_other(self):
+        async with self.locks.hold("conversation"):
+            await asyncio.wait_for(self.hold_briefly("other conversation"), 1)
+
+    async def test_keys_are_case_insensitive(self):
+        async with self.locks.hold("0xABC"):
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.hold_briefly("0xabc"), 0.01)
+
+    async def test_entries_are_dropped_once_unused(self):
+        async with self.locks.hold("conversation"):
+            waiter = asyncio.create_task(self.hold_briefly("conversation"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        self.assertEqual(self.locks._entries, {})
+
+    async def hold_briefly(self, key):
+        async with self.locks.hold(key):
+            pass
+
+
+class SchedulerRunAllTests(SimpleTestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.events = []
+
+    def add_job(self, name, depends_on=(), fails=False):
+        async def fetch():
+            self.events.append(f"{name} fetch")
+            await asyncio.sleep(0)
+            if fails:
+                raise RuntimeError(name)
+            return name
+
+        self.scheduler.add_job(
+            name,
+            fetch,
+            lambda data: self.events.append(f"{data} apply"),
+            interval=60,
+            depends_on=depends_on,
+        )
+
+    async def test_jobs_run_after_their_dependencies(self):
+        # Registered before its dependency, run_all still orders them
+        self.add_job("vaults", depends_on=("markets",))
+        self.add_job("markets")
+        self.add_job("token_lists")
+
+        await self.scheduler.run_all()
+
+        self.assertLess(
+            self.events.index("markets apply"), self.events.index("vaults fetch")
+        )
+        # Independent jobs don't wait
+        self.assertLess(
+            self.events.index("token_lists fetch"), self.events.index("markets apply")
+        )
+        self.assertEqual(self.events.count("markets fetch"), 1)
+
+    async def test_failed_dependencies_dont_block_dependents(self):
+        self.add_job("markets", fails=True)
+        self.add_job("vaults", depends_on=("markets",))
+
+        await self.scheduler.run_all()
+
+        self.assertEqual(self.events, ["markets fetch", "vaults fetch", "vaults apply"])
+        self.assertEqual(self.scheduler.status()["jobs"]["markets"]["failures"], 1)
+
+
+class BM25Tests(SimpleTestCase):
+    documents = [
+        "Gems are distributed to apps based on their activity",
+        "Points are calculated from the value of your liquidity on the network",
+        "The airdrop is claimable over 270 days, with a burn for early claims",
+        "Points points points, everyone earns points",
+    ]
+
+    def test_tokenize_drops_stopwords_and_folds_suffixes(self):
+        self.assertEqual(tokenize("How are the Gems calculated?"), ["gem", "calcul"])
+        self.assertEqual(
+            tokenize("Bridge USDC.e to Sonic"), ["bridge", "usdc.e", "sonic"]
+        )
+
+    def test_search_ranks_rare_terms_first(self):
+        index = BM25Index(self.documents)
+        # "points" is in two documents, "gems" in one
+        results = index.search("gems points", k=3)
+        self.assertEqual([document for document, _ in results], [0, 3, 1])
+
+    def test_repeated_terms_saturate(self):
+        index = BM25Index(self.documents)
+        scores = index.score("points")
+        self.assertGreater(scores[3], scores[1])
+        self.assertLess(scores[3], 4 * scores[1])
+
+    def test_search_leaves_out_non_matching_documents(self):
+        index = BM25Index(self.documents)
+        self.assertEqual(index.search("staking rewards", k=3), [])
+        self.assertEqual(len(index.search("points airdrop gems", k=2)), 2)
+        self.assertEqual(BM25Index([]).search("points", k=3), [])
+
+
+class FairLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.limiter = FairLimiter("test", limit=1)
+        self.served = []
+
+    async def request(self, key, name, **kwargs):
+        async with self.limiter.hold(key, **kwargs):
+            self.served.append(name)
+            await asyncio.sleep(0)
+
+    async def queue(self, *requests):
+        """Starts the requests in order while a holder keeps the only slot"""
+        release = asyncio.Event()
+
+        async def holder():
+            async with self.limiter.hold("holder"):
+                await release.wait()
+
+        tasks = [asyncio.create_task(holder())]
+        await asyncio.sleep(0)
+        for key, name, kwargs in requests:
+            tasks.append(asyncio.create_task(self.request(key, name, **kwargs)))
+            await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    async def test_keys_take_turns(self):
+        await self.queue(
+            ("busy", "busy 1", {}),
+            ("busy", "busy 2", {}),
+            ("busy", "busy 3", {}),
+            ("quiet", "quiet 1", {}),
+        )
+        self.assertEqual(self.served, ["busy 1", "quiet 1", "busy 2", "busy 3"])
+
+    async def test_high_priority_goes_first(self):
+        await self.queue(
+            ("a", "normal", {}),
+            ("b", "high", {"priority": HIGH_PRIORITY}),
+        )
+        self.assertEqual(self.served, ["high", "normal"])
+
+    async def test_pause_holds_new_slots_until_it_passes(self):
+        self.limiter.pause(0.05)
+        task = asyncio.create_task(self.request("a", "first"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.served, [])
+        self.assertEqual(self.limiter.queue_depth(), 1)
+
+        await asyncio.wait_for(task, 1)
+        self.assertEqual(self.served, ["first"])
+
+    async def test_cancelled_waiters_leave_the_queue(self):
+        release = asyncio.Event()
+
+        async def holder():
+            async with self.limiter.hold("holder"):
+                await release.wait()
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(self.request("a", "cancelled"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        self.assertEqual(self.limiter.queue_depth(), 0)
+
+        release.set()
+        await holding
+        await self.request("b", "next")
+        self.assertEqual(self.served, ["next"])
+        self.assertEqual(self.limiter.active, 0)
+
+
+class SpeculationTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+        self.speculation = Speculation()
+        self.addCleanup(self.speculation.discard)
+
+    async def check(self, passes):
+        await asyncio.sleep(0)
+        return passes
+
+    async def quote(self, amount):
+        self.calls.append(amount)
+        return amount * 2
+
+    async def test_calls_start_after_a_passing_check(self):
+        check = self.speculation.start(self.check, True)
+        self.speculation.start_after(check, self.quote, 10)
+        self.assertTrue(await speculated(self.check, True))
+        await asyncio.sleep(0)
+
+        self.assertEqual(await speculated(self.quote, 10), 20)
+        self.assertEqual(self.calls, [10])
+
+    async def test_failing_checks_skip_the_call(self):
+        check = self.speculation.start(self.check, None)
+        self.speculation.start_after(
+            check, self.quote, 10, when=lambda result: result is not None
+        )
+        await check
+        await asyncio.sleep(0)
+        self.assertEqual(self.calls, [])
+
+    async def test_nothing_starts_after_a_discard(self):
+        check = self.speculation.start(self.check, True)
+        self.speculation.start_after(check, self.quote, 10)
+        self.speculation.discard()
+        await asyncio.gather(check, return_exceptions=True)
+        await asyncio.sleep(0)
+        self.assertEqual(self.calls, [])
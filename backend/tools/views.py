@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from tools.db import get_db_pool_stats
+from tools.metrics import get_counters
+from tools.scheduler import scheduler
+from tools.startup import startup_state
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def metrics() -> dict:
+    """In-process counters of this worker"""
+    return {**get_counters(), **get_db_pool_stats()}
+
+
+@router.get("/scheduler")
+async def scheduler_status() -> dict:
+    """Background refresh jobs of this worker"""
+    return scheduler.status()
+
+
+@router.get("/ready")
+async def ready():
+    """Readiness probe, 503 until the startup warm up finished"""
+    status = startup_state.status()
+    if not startup_state.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status